@@ -7,15 +7,15 @@ from ..core.config import settings
 from ..core.db.database import async_get_db
 from ..core.exceptions.http_exceptions import ForbiddenException, RateLimitException, UnauthorizedException
 from ..core.logger import logging
+from ..core.schemas import TokenData
 from ..core.security import TokenType, oauth2_scheme, verify_token
+from ..core.utils.client_identity import get_client_identity
+from ..core.utils.principal_cache import principal_cache
 from ..core.utils.rate_limit import rate_limiter
-from ..crud.crud_rate_limits import crud_rate_limits
-from ..crud.crud_tiers import crud_tiers
+from ..core.utils.rate_limit_policies import rate_limit_policies
 from ..crud.crud_users import crud_users
 from ..models.user import User
-from ..schemas.rate_limit import sanitize_path, RateLimitReadInternal
 from ..schemas.user import UserReadInternal
-from ..schemas.tier import TierReadInternal
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +23,38 @@ DEFAULT_LIMIT = settings.DEFAULT_RATE_LIMIT_LIMIT
 DEFAULT_PERIOD = settings.DEFAULT_RATE_LIMIT_PERIOD
 
 
+async def _verify_access_token(request: Request, token: str, db: AsyncSession) -> TokenData | None:
+    """Verify an access token once per request, even when several dependencies need it."""
+    verified = getattr(request.state, "verified_access_token", None)
+    if verified is not None and verified[0] == token:
+        return verified[1]
+
+    token_data = await verify_token(token, TokenType.ACCESS, db)
+    request.state.verified_access_token = (token, token_data)
+    return token_data
+
+
+async def _get_principal(username_or_email: str, db: AsyncSession) -> UserReadInternal | None:
+    """Load the user a token subject refers to, from the principal cache when possible."""
+    user = await principal_cache.get(username_or_email)
+    if user is not None:
+        return user
+
+    if "@" in username_or_email:
+        db_user = await crud_users.get(db=db, email=username_or_email, is_deleted=False)
+    else:
+        db_user = await crud_users.get(db=db, username=username_or_email, is_deleted=False)
+
+    if not db_user:
+        return None
+
+    user = UserReadInternal.model_validate(db_user)
+    await principal_cache.set(username_or_email, user)
+    return user
+
+
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], db: Annotated[AsyncSession, Depends(async_get_db)]
+    request: Request, token: Annotated[str, Depends(oauth2_scheme)], db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> UserReadInternal | None:
     """Get the current authenticated user from the token.
     
@@ -35,20 +65,14 @@ async def get_current_user(
             - If user is deleted
             - If user is not activated
     """
-    token_data = await verify_token(token, TokenType.ACCESS, db)
+    token_data = await _verify_access_token(request, token, db)
     if token_data is None:
         raise UnauthorizedException("User not authenticated.")
 
-    if "@" in token_data.username_or_email:
-        db_user = await crud_users.get(db=db, email=token_data.username_or_email, is_deleted=False)
-    else:
-        db_user = await crud_users.get(db=db, username=token_data.username_or_email, is_deleted=False)
-
-    if not db_user:
+    user = await _get_principal(token_data.username_or_email, db)
+    if user is None:
         raise UnauthorizedException("User not found or has been deleted.")
-    
-    user = UserReadInternal.model_validate(db_user)
-        
+
     if not user.is_active:
         raise UnauthorizedException("Account is not activated. Please verify your email first.")
 
@@ -74,20 +98,14 @@ async def get_optional_user(request: Request, db: AsyncSession = Depends(async_g
 
         # We don't use get_current_user here to avoid exception handling
         # and to return None instead of raising exceptions
-        token_data = await verify_token(token_value, TokenType.ACCESS, db)
+        token_data = await _verify_access_token(request, token_value, db)
         if token_data is None:
             return None
 
-        if "@" in token_data.username_or_email:
-            db_user = await crud_users.get(db=db, email=token_data.username_or_email, is_deleted=False)
-        else:
-            db_user = await crud_users.get(db=db, username=token_data.username_or_email, is_deleted=False)
-
-        if not db_user:
+        user = await _get_principal(token_data.username_or_email, db)
+        if user is None:
             return None
 
-        user = UserReadInternal.model_validate(db_user)
-        
         if not user.is_active:
             return None
 
@@ -112,34 +130,33 @@ async def get_current_superuser(current_user: Annotated[UserReadInternal, Depend
 
 
 async def rate_limiter_dependency(
-    request: Request, db: Annotated[AsyncSession, Depends(async_get_db)], user: UserReadInternal | None = Depends(get_optional_user)
+    request: Request,
+    db: Annotated[AsyncSession, Depends(async_get_db)],
+    user: UserReadInternal | None = Depends(get_optional_user),
 ) -> None:
-    """Check rate limits for user or IP address."""
+    """Check rate limits for user or IP address and report the quota in `X-RateLimit-*` headers.
+
+    The headers are left in `request.state.rate_limit_headers` and added by `RateLimitHeadersMiddleware`,
+    so they also reach responses the endpoint builds itself.
+    """
     if hasattr(request.app.state, "initialization_complete"):
         await request.app.state.initialization_complete.wait()
 
-    path = sanitize_path(request.url.path)
+    # Key and resolve limits by the matched route template, not the concrete URL, so
+    # /documents/<uuid> shares one counter and one policy across all documents
+    route = request.scope.get("route")
+    path = getattr(route, "path", None) or request.url.path
     if user:
         user_id = user.id
         if user.tier_id:
-            db_tier = await crud_tiers.get(db=db, id=user.tier_id, return_as_model=True, schema_to_select=TierReadInternal)
-            if db_tier:
-                tier = TierReadInternal.model_validate(db_tier)
-                # Get rate limit for this tier and path
-                rate_limit_data = await crud_rate_limits.get(
-                    db=db, 
-                    tier_id=tier.id, 
-                    path=path,
-                    is_deleted=False,
-                    return_as_model=True,
-                    schema_to_select=RateLimitReadInternal
-                )
-                if rate_limit_data:
-                    rate_limit = RateLimitReadInternal.model_validate(rate_limit_data)
-                    limit, period = rate_limit.limit, rate_limit.period
+            tier_name = await rate_limit_policies.get_tier_name(user.tier_id)
+            if tier_name is not None:
+                policy = await rate_limit_policies.get_policy(user.tier_id, path)
+                if policy:
+                    limit, period = policy
                 else:
                     logger.warning(
-                        f"User {user_id} with tier '{tier.name}' has no specific rate limit for path '{path}'. \
+                        f"User {user_id} with tier '{tier_name}' has no specific rate limit for path '{path}'. \
                             Applying default rate limit."
                     )
                     limit, period = DEFAULT_LIMIT, DEFAULT_PERIOD
@@ -150,17 +167,17 @@ async def rate_limiter_dependency(
             logger.warning(f"User {user_id} has no assigned tier. Applying default rate limit.")
             limit, period = DEFAULT_LIMIT, DEFAULT_PERIOD
     else:
-        user_id = request.client.host if request.client else "unknown"
+        # Same key on every worker and node for the same client (IPv6 counted per prefix)
+        user_id = get_client_identity(request)
         limit, period = DEFAULT_LIMIT, DEFAULT_PERIOD
 
-    # Convert user_id to int for rate limiter if it's a user ID, otherwise use string for IP
-    if isinstance(user_id, int):
-        rate_limit_user_id = user_id
-    else:
-        # For IP addresses, we'll use a hash or some other method to convert to int
-        # For now, we'll use a simple hash
-        rate_limit_user_id = hash(user_id) % (2**31)  # Ensure it fits in int32
+    result = await rate_limiter.hit(user_id=user_id, path=path, limit=limit, period=period)
+    if result is None:
+        return
+
+    if result.limited:
+        exc = RateLimitException("Rate limit exceeded.")
+        exc.headers = result.headers
+        raise exc
 
-    is_limited = await rate_limiter.is_rate_limited(db=db, user_id=rate_limit_user_id, path=path, limit=limit, period=period)
-    if is_limited:
-        raise RateLimitException("Rate limit exceeded.")
+    request.state.rate_limit_headers = result.headers
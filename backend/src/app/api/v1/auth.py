@@ -1,4 +1,3 @@
-from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Cookie, Depends, Request, Response, status
@@ -6,6 +5,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...api.dependencies import get_current_user
 from ...core.config import settings
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import BadRequestException, NotFoundException, UnauthorizedException
@@ -15,12 +15,16 @@ from ...core.security import (
     create_access_token,
     create_refresh_token,
     create_verification_token,
-    get_password_hash,
+    decode_token,
+    hash_password,
     verify_token,
     verify_token_from_redis,
     oauth2_scheme,
     TokenType
 )
+from ...core.utils.principal_cache import principal_cache
+from ...core.utils.session_registry import session_registry
+from ...core.utils.user_touch import user_touch_buffer
 from ...crud.crud_users import crud_users
 from ...schemas.auth import (
     Token,
@@ -67,11 +71,7 @@ async def login_for_access_token(
     #     max_age=max_age
     # )
 
-    await crud_users.update(
-        db=db,
-        object={"last_login": datetime.utcnow()},
-        id=user.id
-    )
+    await user_touch_buffer.touch_last_login(db, user.id)
     
     token_data = Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
     return APIResponse(message="Login successful", data=token_data)
@@ -95,11 +95,7 @@ async def login_for_access_token_oauth2(
     access_token = await create_access_token(data={"sub": user.username})
     refresh_token = await create_refresh_token(data={"sub": user.username})
 
-    await crud_users.update(
-        db=db,
-        object={"last_login": datetime.utcnow()},
-        id=user.id
-    )
+    await user_touch_buffer.touch_last_login(db, user.id)
     
     return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer")
 
@@ -118,6 +114,16 @@ async def refresh_access_token(
     if not user_data:
         raise UnauthorizedException("Invalid refresh token.")
 
+    claims = decode_token(refresh_token) or {}
+    family_id = claims.get("fid")
+    refresh_claims = {}
+    if family_id is not None:
+        # Rotation: the presented token stops working, a replayed one revokes the whole family
+        token_id = await session_registry.rotate_refresh_token(family_id, claims.get("jti"))
+        if token_id is None:
+            raise UnauthorizedException("Invalid refresh token.")
+        refresh_claims = {"fid": family_id, "jti": token_id}
+
     db_user = await crud_users.get(
         db=db, 
         username=user_data.username_or_email,
@@ -131,7 +137,7 @@ async def refresh_access_token(
         raise UnauthorizedException("User is not active.")
 
     new_access_token = await create_access_token(data={"sub": user.username})
-    new_refresh_token = await create_refresh_token(data={"sub": user.username})
+    new_refresh_token = await create_refresh_token(data={"sub": user.username, **refresh_claims})
     
     token_data = Token(access_token=new_access_token, refresh_token=new_refresh_token, token_type="bearer")
     return APIResponse(message="Token refreshed successfully", data=token_data)
@@ -155,6 +161,8 @@ async def logout(
             refresh_token=refresh_token,
             db=db
         )
+        claims = decode_token(refresh_token) or {}
+        await session_registry.end_refresh_family(claims.get("fid"))
 
         return APIResponse(message="Logged out successfully")
 
@@ -162,6 +170,16 @@ async def logout(
         raise UnauthorizedException("Invalid token.")
 
 
+@router.post("/logout-all", response_model=APIResponse)
+async def logout_all(
+    current_user: Annotated[UserReadInternal, Depends(get_current_user)],
+) -> APIResponse:
+    """Đăng xuất khỏi mọi thiết bị: vô hiệu hóa toàn bộ access và refresh token của user."""
+    await session_registry.revoke_all(current_user.username)
+    await principal_cache.invalidate_user(current_user)
+    return APIResponse(message="Logged out from all sessions successfully")
+
+
 @router.post("/register", response_model=APIResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_in: AuthUserCreate,
@@ -174,7 +192,7 @@ async def register_user(
         raise BadRequestException("Email already exists")
     
     user_data = user_in.model_dump()
-    user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+    user_data["hashed_password"] = await hash_password(user_data.pop("password"))
     user_data["tier_id"] = 1
     
     user_internal = UserCreateInternal(**user_data)
@@ -252,12 +270,15 @@ async def reset_password(
         raise NotFoundException("User not found")
     
     user = UserReadInternal.model_validate(db_user)
-    hashed_password = get_password_hash(reset_data.new_password)
+    hashed_password = await hash_password(reset_data.new_password)
+    # A password reset ends every existing session; refuse the reset if that cannot be recorded
+    await session_registry.revoke_all(user.username)
     await crud_users.update(
         db=db, 
         object={"hashed_password": hashed_password}, 
         id=user.id
     )
+    await principal_cache.invalidate_user(user)
     
     return APIResponse(message="Password reset successfully")
 
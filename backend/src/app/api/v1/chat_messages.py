@@ -1,61 +1,65 @@
 from typing import Annotated, cast
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
-from fastcrud.paginated import compute_offset, paginated_response
+from fastapi import APIRouter, Depends, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException, ForbiddenException
-from ...crud.crud_chat_message import crud_chatMessages
-from ...crud.crud_chat_session import crud_chatSessions
+from ...crud.crud_chat_message import acl_chatMessages, crud_chatMessages
+from ...crud.acl_scoped import WRITE_PERMISSIONS
+from ...crud.crud_chat_session import acl_chatSessions
 from ...crud.access_controls import crud_access_controls
-from ...schemas.access_control import AccessControlCreateInternal, AccessControlID, AccessControlReadInternal, AccessControlUpdateInternal, AdminAccessControlRead, ResourceType, PermissionType
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.chat_message import ChatMessage
+from ...schemas.access_control import AccessControlCreateInternal, ResourceType, PermissionType
 from ...schemas.chat_message import ChatMessageRead, ChatMessageCreate, ChatMessageUpdate, AdminChatMessageRead, AdminChatMessageCreate, AdminChatMessageUpdate, ChatMessageCreateInternal, ChatMessageReadInternal
 from ...schemas.chat_session import ChatSessionReadInternal
 from ...schemas.user import UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse, OnlyID
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse, OnlyID
 
 router = APIRouter(tags=["chat_messages"])
 
 # User endpoints
-@router.get("/chat-messages/", response_model=PaginatedAPIResponse[ChatMessageRead])
+@router.get("/chat-messages/", response_model=CursorPaginatedAPIResponse[ChatMessageRead])
 async def read_chat_messages(
     request: Request,
     chat_session_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[ChatMessageRead]:
-    """Get messages in a chat session (with access control)"""
-    # Lấy access control chat session
-    acl_chat_session = await crud_access_controls.get(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[ChatMessageRead]:
+    """Get messages in a chat session in order (with access control), paginated by `next_cursor`"""
+    # Lấy chat session kèm kiểm tra quyền
+    chat_session = await acl_chatSessions.get(
         db=db,
         resource_uuid=chat_session_uuid,
-        resource_type=ResourceType.CHAT_SESSION,
         user_id=current_user.id,
-        schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
-        return_as_model=False
+        schema_to_select=OnlyID,
     )
-    if not acl_chat_session:
+    if not chat_session:
         raise NotFoundException("Chat session not found or access denied")
-    chat_session_id = cast(dict, acl_chat_session)["resource_id"]
+    chat_session_id = chat_session["id"]
 
-    messages_data = await crud_chatMessages.get_multi(
+    messages_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
+        model=ChatMessage,
+        keys=("chat_session_id", "sequence_number", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=ChatMessageRead,
+        include_total=include_total,
         is_deleted=False,
         chat_session_id=chat_session_id,
-        schema_to_select=cast(type[ChatMessageReadInternal], ChatMessageRead),
-        return_total_count=True
     )
     if not messages_data["data"]:
         raise NotFoundException("Messages not found")
-    paginated_messages_data = paginated_response(crud_data=messages_data, page=page, items_per_page=items_per_page)
-    return PaginatedAPIResponse(message="Messages retrieved successfully", **paginated_messages_data)
+    return CursorPaginatedAPIResponse(
+        message="Messages retrieved successfully", items_per_page=items_per_page, **messages_data
+    )
 
 
 @router.get("/chat-messages/{message_uuid}", response_model=APIResponse[ChatMessageRead])
@@ -63,26 +67,17 @@ async def read_chat_message(
     request: Request,
     message_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[ChatMessageRead]:
     """Get a specific message by uuid (with access control)"""
-    # Lấy access control message
-    acl_exists = await crud_access_controls.exists(
+    message_data = await acl_chatMessages.get(
         db=db,
         resource_uuid=message_uuid,
-        resource_type=ResourceType.CHAT_MESSAGE,
         user_id=current_user.id,
-    )
-    if not acl_exists:
-        raise NotFoundException("Message not found or access denied")
-    message_data = await crud_chatMessages.get(
-        db=db,
-        uuid=message_uuid,
-        is_deleted=False,
-        schema_to_select=cast(type[ChatMessageReadInternal], ChatMessageRead),
+        schema_to_select=ChatMessageRead,
     )
     if not message_data:
-        raise NotFoundException("Message not found")
+        raise NotFoundException("Message not found or access denied")
     return APIResponse(message="Message retrieved successfully", data=message_data)
 
 
@@ -95,18 +90,16 @@ async def create_chat_message(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse[ChatMessageRead]:
     """Create a new message in a chat session (with access control)"""
-    # Lấy access control chat session
-    acl_chat_session = await crud_access_controls.get(
+    # Lấy chat session kèm kiểm tra quyền
+    chat_session = await acl_chatSessions.get(
         db=db,
         resource_uuid=chat_session_uuid,
-        resource_type=ResourceType.CHAT_SESSION,
         user_id=current_user.id,
-        schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
-        return_as_model=False
+        schema_to_select=OnlyID,
     )
-    if not acl_chat_session:
+    if not chat_session:
         raise NotFoundException("Chat session not found or access denied")
-    chat_session_id = cast(dict, acl_chat_session)["resource_id"]
+    chat_session_id = chat_session["id"]
 
     result = await db.execute(
         text("SELECT MAX(sequence_number) FROM chat_message WHERE chat_session_id = :chat_session_id"),
@@ -146,25 +139,17 @@ async def update_chat_message(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse[ChatMessageRead]:
     """Update a message (with access control)"""
-    acl_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=message_uuid,
-        resource_type=ResourceType.CHAT_MESSAGE,
-        user_id=current_user.id,
-    )
-    if not acl_exists:
-        raise NotFoundException("Message not found or access denied")
-
     update_dict = message_update.model_dump(exclude_unset=True)
-    message_data = await crud_chatMessages.update(
+    message_data = await acl_chatMessages.update(
         db=db,
         object=update_dict,
-        uuid=message_uuid,
-        return_as_model=True,
-        schema_to_select=cast(type[ChatMessageReadInternal], ChatMessageRead)
+        resource_uuid=message_uuid,
+        user_id=current_user.id,
+        schema_to_select=ChatMessageRead,
+        permissions=WRITE_PERMISSIONS,
     )
     if not message_data:
-        raise CustomException(status_code=500, detail="Failed to update message. Please try again later.")
+        raise NotFoundException("Message not found or access denied")
     return APIResponse(message="Message updated successfully", data=message_data)
 
 
@@ -176,44 +161,48 @@ async def delete_chat_message(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse:
     """Delete a message (with access control)"""
-    acl_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=message_uuid,
-        resource_type=ResourceType.CHAT_MESSAGE,
-        user_id=current_user.id,
+    message_deleted = await acl_chatMessages.delete(
+        db=db, resource_uuid=message_uuid, user_id=current_user.id, permissions=WRITE_PERMISSIONS
     )
-    if not acl_exists:
+    if not message_deleted:
         raise NotFoundException("Message not found or access denied")
-    await crud_chatMessages.delete(db=db, uuid=message_uuid)
     await crud_access_controls.delete(db=db, resource_uuid=message_uuid, resource_type=ResourceType.CHAT_MESSAGE)
     return APIResponse(message="Message deleted successfully")
 
 
 # Admin endpoints
-@router.get("/admin/chat-messages", response_model=PaginatedAPIResponse[AdminChatMessageRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/chat-messages",
+    response_model=CursorPaginatedAPIResponse[AdminChatMessageRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_chat_messages(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminChatMessageRead]:
-    """Get all messages with pagination (Superuser only)."""
-    messages_data = await crud_chatMessages.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminChatMessageRead]:
+    """Get all messages with cursor pagination (Superuser only)."""
+    messages_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True,
-        schema_to_select=cast(type[ChatMessageReadInternal], AdminChatMessageRead)
+        model=ChatMessage,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminChatMessageRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Messages retrieved successfully", items_per_page=items_per_page, **messages_data
     )
-    paginated_messages_data = paginated_response(crud_data=messages_data, page=page, items_per_page=items_per_page)
-    return PaginatedAPIResponse(message="Messages retrieved successfully", **paginated_messages_data)
 
 
 @router.get("/admin/chat-messages/{message_id}", response_model=APIResponse[AdminChatMessageRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_chat_message(
     request: Request,
     message_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminChatMessageRead]:
     """Get a specific message by ID (Superuser only)."""
     message_data = await crud_chatMessages.get(
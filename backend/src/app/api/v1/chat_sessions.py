@@ -1,20 +1,30 @@
 from typing import Annotated, cast
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, status, Query
 from fastcrud.paginated import compute_offset, paginated_response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException, ForbiddenException, UnauthorizedException
-from ...crud.crud_chat_session import crud_chatSessions
-from ...crud.crud_projects import crud_projects
+from ...crud.crud_chat_session import acl_chatSessions, crud_chatSessions
+from ...crud.acl_scoped import WRITE_PERMISSIONS
+from ...crud.crud_projects import acl_projects, crud_projects
 from ...crud.access_controls import crud_access_controls
-from ...schemas.access_control import AccessControlCreateInternal, AccessControlID, AccessControlReadInternal, AccessControlUpdateInternal, AdminAccessControlRead, ResourceType, PermissionType
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.chat_session import ChatSession
+from ...schemas.access_control import (
+    AccessControlCreateInternal,
+    AccessControlReadInternal,
+    AccessControlUpdateInternal,
+    AdminAccessControlRead,
+    ResourceType,
+    PermissionType,
+)
 from ...schemas.chat_session import ChatSessionRead, ChatSessionCreate, ChatSessionUpdate, AdminChatSessionRead, AdminChatSessionCreate, AdminChatSessionUpdate, ChatSessionCreateInternal, ChatSessionReadInternal
 from ...schemas.project import ProjectRead, ProjectReadInternal
 from ...schemas.user import UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse, OnlyID
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse, PaginatedAPIResponse, OnlyID
 
 router = APIRouter(tags=["chat_sessions"])
 
@@ -24,25 +34,22 @@ async def read_chat_sessions(
     request: Request,
     project_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
     page: int = 1,
     items_per_page: int = 10
 ) -> PaginatedAPIResponse[ChatSessionRead]:
     """Get current user's chat sessions in a project with pagination"""
 
     # Lấy access control của user với project này
-    acl_project_id = await crud_access_controls.get(
+    project = await acl_projects.get(
         db=db,
         resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
         user_id=current_user.id,
-        schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
-        return_as_model=False
+        schema_to_select=OnlyID,
     )
-    if not acl_project_id:
+    if not project:
         raise NotFoundException("Project not found or access denied")
-    acl_project_id_dict = cast(dict, acl_project_id)
-    project_id = acl_project_id_dict["resource_id"] 
+    project_id = project["id"]
 
     # Lọc chat session theo project_id và access control
     chat_sessions_data = await crud_chatSessions.get_multi(
@@ -67,26 +74,17 @@ async def read_chat_session(
     request: Request,
     chat_session_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[ChatSessionRead]:
     """Get a specific chat session by UUID."""
-    acl_exists = await crud_access_controls.exists(
+    chat_session_data = await acl_chatSessions.get(
         db=db,
         resource_uuid=chat_session_uuid,
-        resource_type=ResourceType.CHAT_SESSION,
         user_id=current_user.id,
-    )
-    if not acl_exists:
-        raise NotFoundException("Chat session not found or access denied")
-    
-    chat_session_data = await crud_chatSessions.get(
-        db=db,
-        uuid=chat_session_uuid,
-        is_deleted=False,
-        schema_to_select=cast(type[ChatSessionReadInternal], ChatSessionRead),
+        schema_to_select=ChatSessionRead,
     )
     if not chat_session_data:
-        raise NotFoundException("Chat session not found")
+        raise NotFoundException("Chat session not found or access denied")
 
     return APIResponse(message="Chat session retrieved successfully", data=chat_session_data)
 
@@ -101,18 +99,15 @@ async def create_chat_session(
 ) -> APIResponse[ChatSessionRead]:
     """Create a new chat session for the current user in a specific project."""
     # Check quyền và lấy luôn project_id từ access control
-    acl_project_id = await crud_access_controls.get(
+    project = await acl_projects.get(
         db=db,
         resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
         user_id=current_user.id,
-        schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
-        return_as_model=False
+        schema_to_select=OnlyID,
     )
-    if not acl_project_id:
+    if not project:
         raise NotFoundException("Project not found or access denied")
-    acl_project_id_dict = cast(dict, acl_project_id)
-    project_id = acl_project_id_dict["resource_id"]
+    project_id = project["id"]
 
     # Check trùng lặp title trong project
     chat_session_exists = await crud_chatSessions.exists(
@@ -156,48 +151,36 @@ async def update_chat_session(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse[ChatSessionRead]:
     """Update a chat session for the current user."""
-    # Kiểm tra quyền với chat session
-    chat_session_acl_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=chat_session_uuid,
-        resource_type=ResourceType.CHAT_SESSION,
-        user_id=current_user.id,
-    )
-    if not chat_session_acl_exists:
-        raise NotFoundException("Chat session not found or access denied")
-    
-    # Lấy thông tin chat session hiện tại để lấy project_id
-    current_chat_session = await crud_chatSessions.get(
-        db=db,
-        uuid=chat_session_uuid,
-        is_deleted=False,
-        schema_to_select=cast(type[ChatSessionReadInternal], OnlyID),
-   
-    )
-    if not current_chat_session:
-        raise NotFoundException("Chat session not found")
-
-    project_id = cast(dict,current_chat_session)["id"]
     if chat_session_update.title:
+        # Lấy project_id của chat session (kèm kiểm tra quyền) để check trùng title
+        current_chat_session = await acl_chatSessions.get(
+            db=db,
+            resource_uuid=chat_session_uuid,
+            user_id=current_user.id,
+            schema_to_select=ChatSessionRead,
+        )
+        if not current_chat_session:
+            raise NotFoundException("Chat session not found or access denied")
+
         chat_session_exists = await crud_chatSessions.exists(
             db=db, 
             title=chat_session_update.title, 
-            project_id=project_id
+            project_id=current_chat_session["project_id"]
         )
         if chat_session_exists:
             raise DuplicateValueException("A chat session with this title already exists in this project.")
             
     update_dict = chat_session_update.model_dump(exclude_unset=True)
-    chat_session_data = await crud_chatSessions.update(
+    chat_session_data = await acl_chatSessions.update(
         db=db, 
         object=update_dict, 
-        uuid=chat_session_uuid, 
-        return_as_model=True,
-        schema_to_select=cast(type[ChatSessionReadInternal], ChatSessionRead)
+        resource_uuid=chat_session_uuid,
+        user_id=current_user.id,
+        schema_to_select=ChatSessionRead,
+        permissions=WRITE_PERMISSIONS,
     )
-    
     if not chat_session_data:
-        raise CustomException(status_code=500, detail="Failed to update chat session. Please try again later.")
+        raise NotFoundException("Chat session not found or access denied")
     
     return APIResponse(message="Chat session updated successfully", data=chat_session_data)
 
@@ -210,47 +193,49 @@ async def delete_chat_session(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse:
     """Delete a chat session for the current user."""
-    chat_session_acl_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=chat_session_uuid,
-        resource_type=ResourceType.CHAT_SESSION,
-        user_id=current_user.id,
+    chat_session_deleted = await acl_chatSessions.delete(
+        db=db, resource_uuid=chat_session_uuid, user_id=current_user.id, permissions=WRITE_PERMISSIONS
     )
-    if not chat_session_acl_exists:
+    if not chat_session_deleted:
         raise NotFoundException("Chat session not found or access denied")
-        
-    await crud_chatSessions.delete(db=db, uuid=chat_session_uuid)
+
     await crud_access_controls.delete(db=db, resource_uuid=chat_session_uuid, resource_type=ResourceType.CHAT_SESSION)
     return APIResponse(message="Chat session deleted successfully")
 
 
 # Superuser endpoints
-@router.get("/admin/chat-sessions", response_model=PaginatedAPIResponse[AdminChatSessionRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/chat-sessions",
+    response_model=CursorPaginatedAPIResponse[AdminChatSessionRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_chat_sessions(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminChatSessionRead]:
-    """Get all chat sessions with pagination (Superuser only)."""
-    chat_sessions_data = await crud_chatSessions.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminChatSessionRead]:
+    """Get all chat sessions with cursor pagination (Superuser only)."""
+    chat_sessions_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True,
-        schema_to_select=cast(type[ChatSessionReadInternal], AdminChatSessionRead)
+        model=ChatSession,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminChatSessionRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Chat sessions retrieved successfully", items_per_page=items_per_page, **chat_sessions_data
     )
-
-    paginated_chat_sessions_data = paginated_response(crud_data=chat_sessions_data, page=page, items_per_page=items_per_page)
-
-    return PaginatedAPIResponse(message="Chat sessions retrieved successfully", **paginated_chat_sessions_data)
 
 
 @router.get("/admin/chat-sessions/{chat_session_id}", response_model=APIResponse[AdminChatSessionRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_chat_session(
     request: Request,
     chat_session_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminChatSessionRead]:
     """Get a specific chat session by ID (Superuser only)."""
     chat_session_data = await crud_chatSessions.get(
@@ -1,64 +1,83 @@
 from typing import Annotated, cast
+from urllib.parse import quote
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status, UploadFile, File, Form
-from fastcrud.paginated import compute_offset, paginated_response
+from fastapi import APIRouter, Depends, Request, Response, status, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException, ForbiddenException
-from ...core.db.minio import minio
-from ...crud.crud_documents import crud_documents
-from ...crud.crud_projects import crud_projects
+from ...core.db.minio import async_minio
+from ...core.utils.http_range import etag_matches, parse_range_header
+from ...core.utils.presigned_url import presigned_url_cache
+from ...crud.crud_documents import acl_documents, crud_documents
+from ...crud.acl_scoped import WRITE_PERMISSIONS
+from ...crud.crud_projects import acl_projects, crud_projects
 from ...crud.access_controls import crud_access_controls
-from ...schemas.access_control import AccessControlCreateInternal, AccessControlID, AccessControlReadInternal, AccessControlUpdateInternal, AdminAccessControlRead, ResourceType, PermissionType
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.document import Document
+from ...schemas.access_control import (
+    AccessControlCreateInternal,
+    AccessControlReadInternal,
+    AccessControlUpdateInternal,
+    AdminAccessControlRead,
+    ResourceType,
+    PermissionType,
+)
 from ...schemas.document import DocumentRead, DocumentCreate, DocumentUpdate, AdminDocumentRead, AdminDocumentCreate, AdminDocumentUpdate, DocumentCreateInternal, DocumentReadInternal, DocumentType, DOCUMENT_MIME_TYPES
 
 
 from ...schemas.user import UserReadInternal
 from ...schemas.project import ProjectReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse, OnlyID
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse, OnlyID
 
 router = APIRouter(tags=["documents"])
 
 # User endpoints
-@router.get("/documents/", response_model=PaginatedAPIResponse[DocumentRead])
+@router.get("/documents/", response_model=CursorPaginatedAPIResponse[DocumentRead])
 async def read_documents(
     request: Request,
     project_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[DocumentRead]:
-    """Get documents in a project (with access control)"""
-    # Lấy access control project và project_id
-    acl_project = await crud_access_controls.get(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[DocumentRead]:
+    """Get documents in a project (with access control), paginated by `next_cursor`"""
+    # Lấy project_id kèm kiểm tra quyền
+    project = await acl_projects.get(
         db=db,
         resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
         user_id=current_user.id,
-        schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
-        return_as_model=False
+        schema_to_select=OnlyID,
     )
-    if not acl_project:
+    if not project:
         raise NotFoundException("Project not found or access denied")
-    project_id = cast(dict, acl_project)["resource_id"]
+    project_id = project["id"]
 
     # Lấy danh sách document mà user có quyền truy cập
-    documents_data = await crud_documents.get_multi(
+    documents_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
+        model=Document,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=DocumentRead,
+        include_total=include_total,
         is_deleted=False,
         project_id=project_id,
-        schema_to_select=cast(type[DocumentReadInternal], DocumentRead),
-        return_total_count=True
     )
     if not documents_data["data"]:
         raise NotFoundException("Documents not found")
-    paginated_docs_data = paginated_response(crud_data=documents_data, page=page, items_per_page=items_per_page)
-    return PaginatedAPIResponse(message="Documents retrieved successfully", **paginated_docs_data)
+    # Ký URL cho cả trang trong một lần thay vì từng document
+    urls = await presigned_url_cache.get_urls(doc["file_path"] for doc in documents_data["data"])
+    for doc in documents_data["data"]:
+        doc["download_url"] = urls.get(doc["file_path"])
+    return CursorPaginatedAPIResponse(
+        message="Documents retrieved successfully", items_per_page=items_per_page, **documents_data
+    )
 
 
 @router.get("/documents/{document_uuid}", response_model=APIResponse[DocumentRead])
@@ -66,44 +85,88 @@ async def read_document(
     request: Request,
     document_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[DocumentRead]:
     """Get a specific document by uuid (with access control)"""
-    acl_exists = await crud_access_controls.exists(
+    document_data = await acl_documents.get(
         db=db,
         resource_uuid=document_uuid,
-        resource_type=ResourceType.DOCUMENT,
         user_id=current_user.id,
+        schema_to_select=DocumentRead,
     )
-    if not acl_exists:
+    if not document_data:
         raise NotFoundException("Document not found or access denied")
-    document_data = await crud_documents.get(
+    document_read = DocumentRead.model_validate(document_data)
+    presigned_url = await presigned_url_cache.get_url(document_read.file_path)
+    if not presigned_url:
+        raise CustomException(status_code=500, detail="Cannot generate presigned url for this document.")
+    document_read.download_url = presigned_url
+    return APIResponse(message="Document retrieved successfully", data=document_read)
+
+
+@router.get("/documents/{document_uuid}/content", response_class=StreamingResponse)
+async def download_document(
+    request: Request,
+    document_uuid: UUID,
+    current_user: Annotated[UserReadInternal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
+) -> Response:
+    """Stream a document's content (with access control).
+
+    Supports single byte ranges (`Range`, `If-Range`) so viewers can seek inside large PDFs,
+    and conditional requests (`If-None-Match`) against the storage ETag. The object is proxied
+    chunk by chunk, so memory use does not depend on the file size.
+    """
+    document_data = await acl_documents.get(
         db=db,
-        uuid=document_uuid,
-        is_deleted=False,
-        schema_to_select=cast(type[DocumentReadInternal], DocumentRead),
+        resource_uuid=document_uuid,
+        user_id=current_user.id,
+        schema_to_select=DocumentRead,
     )
     if not document_data:
-        raise NotFoundException("Document not found")
-    document_data = DocumentRead.model_validate(document_data)
-    presigned_url = minio.get_presigned_url(document_data.file_path)
-    if not presigned_url:
-        raise CustomException(status_code=500, detail="Cannot generate presigned url for this document.")
-    document_read = DocumentRead(
-        uuid=document_data.uuid,
-        title=document_data.title,
-        file_path=presigned_url,
-        file_type=document_data.file_type,
-        description=document_data.description,
-        project_id=document_data.project_id,
-        file_size=document_data.file_size,
-        page_count=document_data.page_count,
-        meta_info=document_data.meta_info
+        raise NotFoundException("Document not found or access denied")
+    document = DocumentRead.model_validate(document_data)
+
+    stat = await async_minio.stat_file(document.file_path)
+    if stat is None:
+        raise NotFoundException("Document content not found in storage")
+    size = stat.size or 0
+    etag = f'"{stat.etag}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(document.title)}",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    media_type = stat.content_type or "application/octet-stream"
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(async_minio.stream_file(document.file_path), media_type=media_type, headers=headers)
+
+    headers["Content-Length"] = str(byte_range.length)
+    headers["Content-Range"] = byte_range.content_range(size)
+    return StreamingResponse(
+        async_minio.stream_file(document.file_path, offset=byte_range.start, length=byte_range.length),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
     )
-    return APIResponse(message="Document retrieved successfully", data=document_read)
 
 
-@router.post("/documents", response_model=APIResponse[DocumentRead], status_code=status.HTTP_201_CREATED)
+@router.post("/documents",response_model=APIResponse[DocumentRead], status_code=status.HTTP_201_CREATED)
 async def create_document(
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(async_get_db)] ,
@@ -113,10 +176,12 @@ async def create_document(
 ) -> APIResponse[DocumentRead]:
     """Upload a new document to a project (with access control)"""
     # Lấy project_id
-    acl_project = await crud_access_controls.get(db=db, resource_uuid=project_uuid, resource_type=ResourceType.PROJECT, user_id=current_user.id)
-    if not acl_project:
+    project = await acl_projects.get(
+        db=db, resource_uuid=project_uuid, user_id=current_user.id, schema_to_select=OnlyID
+    )
+    if not project:
         raise NotFoundException("Project not found or access denied")
-    project_id = cast(dict, acl_project)["resource_id"]
+    project_id = project["id"]
     filename = file.filename or "uploaded_file"
     # Kiểm tra file type được phép - dựa vào MIME type
     content_type = file.content_type if file.content_type else "application/octet-stream"
@@ -132,10 +197,9 @@ async def create_document(
     
     object_name = f"{project_uuid}/{filename}"
     
-    try:
-        minio.upload_file(file.file, object_name, content_type, file.size)
-    except Exception as e:
-        raise CustomException(status_code=500, detail=f"Failed to upload file to storage: {e}")
+    uploaded = await async_minio.upload_file(file.file, object_name, content_type, file.size)
+    if not uploaded:
+        raise CustomException(status_code=500, detail="Failed to upload file to storage.")
     # Tạo record trong DB
     document_create = DocumentCreateInternal(
         title=title,
@@ -147,7 +211,7 @@ async def create_document(
     )
     document_data = await crud_documents.create(db=db, object=document_create)
     if not document_data:
-        minio.delete_file(object_name) 
+        await async_minio.delete_file(object_name)
         raise CustomException(status_code=500, detail="Failed to create document record.")
 
     acl_create = AccessControlCreateInternal(
@@ -170,47 +234,56 @@ async def delete_document(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse:
     """Delete a document (with access control)"""
-    # Lấy document và kiểm tra quyền
-    document_data = await crud_documents.get(db=db, uuid=document_uuid, is_deleted=False)
+    # Xóa trong DB (kèm kiểm tra quyền), lấy luôn file_path của document
+    document_data = await acl_documents.delete(
+        db=db,
+        resource_uuid=document_uuid,
+        user_id=current_user.id,
+        schema_to_select=DocumentRead,
+        permissions=WRITE_PERMISSIONS,
+    )
     if not document_data:
-        raise NotFoundException("Document not found")
-    acl_exists = await crud_access_controls.exists(db=db, resource_uuid=document_uuid, resource_type=ResourceType.DOCUMENT, user_id=current_user.id)
-    if not acl_exists:
-        raise ForbiddenException("You are not authorized to delete this document")
-    document_data = DocumentReadInternal.model_validate(document_data)
+        raise NotFoundException("Document not found or access denied")
     # Xóa file trên MinIO
-    minio.delete_file(document_data.file_path)
+    await async_minio.delete_file(document_data["file_path"])
+    await presigned_url_cache.invalidate(document_data["file_path"])
 
-    # Xóa trong DB
-    await crud_documents.delete(db=db, uuid=document_uuid)
     await crud_access_controls.delete(db=db, resource_uuid=document_uuid, resource_type=ResourceType.DOCUMENT)
     return APIResponse(message="Document deleted successfully")
 
 # Admin endpoints
-@router.get("/admin/documents", response_model=PaginatedAPIResponse[AdminDocumentRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/documents",
+    response_model=CursorPaginatedAPIResponse[AdminDocumentRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_documents(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminDocumentRead]:
-    """Get all documents with pagination (Superuser only)."""
-    documents_data = await crud_documents.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminDocumentRead]:
+    """Get all documents with cursor pagination (Superuser only)."""
+    documents_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True,
-        schema_to_select=cast(type[DocumentReadInternal], AdminDocumentRead)
+        model=Document,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminDocumentRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Documents retrieved successfully", items_per_page=items_per_page, **documents_data
     )
-    paginated_data = paginated_response(crud_data=documents_data, page=page, items_per_page=items_per_page)
-    return PaginatedAPIResponse(message="Documents retrieved successfully", **paginated_data)
 
 
 @router.get("/admin/documents/{document_id}", response_model=APIResponse[AdminDocumentRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_document(
     request: Request,
     document_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminDocumentRead]:
     """Get a specific document by ID (Superuser only)."""
     document_data = await crud_documents.get(
@@ -367,7 +440,8 @@ async def admin_delete_document(
     document_data = await crud_documents.get(db=db, id=document_id)
     if document_data:
         document_data = DocumentReadInternal.model_validate(document_data)
-        minio.delete_file(document_data.file_path)
+        await async_minio.delete_file(document_data.file_path)
+        await presigned_url_cache.invalidate(document_data.file_path)
 
     await crud_documents.delete(db=db, id=document_id)
     await crud_access_controls.delete(db=db, resource_id=document_id, resource_type=ResourceType.DOCUMENT)
@@ -385,7 +459,8 @@ async def admin_delete_db_document(
         raise NotFoundException("Document not found")
     document_data = DocumentReadInternal.model_validate(document_data)
     # Xóa file trên MinIO
-    minio.delete_file(document_data.file_path)
+    await async_minio.delete_file(document_data.file_path)
+    await presigned_url_cache.invalidate(document_data.file_path)
     # Xóa khỏi DB
     await crud_documents.db_delete(db=db, id=document_id)
     await crud_access_controls.db_delete(db=db, resource_id=document_id, resource_type=ResourceType.DOCUMENT)
@@ -1,20 +1,23 @@
 from typing import Annotated, cast
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, status, Query
 from fastcrud.paginated import compute_offset, paginated_response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException, ForbiddenException, UnauthorizedException
-from ...crud.crud_projects import crud_projects
+from ...crud.crud_projects import acl_projects, crud_projects
+from ...crud.acl_scoped import WRITE_PERMISSIONS
 from ...crud.crud_users import crud_users
 from ...crud.access_controls import crud_access_controls
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.project import Project
 from ...schemas.access_control import  AccessControlCreateInternal, AccessControlID, AccessControlReadInternal, AccessControlUpdateInternal, AdminAccessControlRead, ResourceType, PermissionType
 from ...schemas.project import ProjectRead, ProjectCreate, ProjectUpdate, AdminProjectRead, AdminProjectCreate, AdminProjectUpdate, ProjectCreateInternal, ProjectReadInternal
 from ...schemas.user import UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse, PaginatedAPIResponse
 
 router = APIRouter(tags=["projects"])
 
@@ -23,7 +26,7 @@ router = APIRouter(tags=["projects"])
 async def read_projects(
     request: Request,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
     page: int = 1,
     items_per_page: int = 10
 ) -> PaginatedAPIResponse[ProjectRead]:
@@ -33,6 +36,7 @@ async def read_projects(
     db=db,
     user_id=current_user.id,
     resource_type=ResourceType.PROJECT,
+    is_deleted=False,
     return_as_model=False,
     schema_to_select=cast(type[AccessControlReadInternal], AccessControlID),
     return_total_count=True,
@@ -64,26 +68,17 @@ async def read_project(
     request: Request,
     project_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[ProjectRead]:
     """Get a specific project by UUID."""
-    acl_exists = await crud_access_controls.exists(
+    projects_data = await acl_projects.get(
         db=db,
         resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
         user_id=current_user.id,
-    )
-    if not acl_exists:
-        raise NotFoundException("Project not found or access denied")
-    
-    projects_data = await crud_projects.get(
-        db=db,
-        uuid=project_uuid,
-        is_deleted=False,
-        schema_to_select=cast(type[ProjectReadInternal], ProjectRead),
+        schema_to_select=ProjectRead,
     )
     if not projects_data:
-        raise NotFoundException("Project not found")
+        raise NotFoundException("Project not found or access denied")
 
     return APIResponse(message="Project retrieved successfully", data=projects_data)
 
@@ -132,25 +127,22 @@ async def update_project(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse[ProjectRead]:
     """Update a project for the current user."""
-    project_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
-        user_id=current_user.id,
-    )
-    if not project_exists:
-        raise NotFoundException("Project not found or access denied")
-    
     if project_update.name:
         project_exists = await crud_projects.exists(db=db, name=project_update.name, user_id=current_user.id)
         if project_exists:
             raise DuplicateValueException("A project with this name already exists.")
             
     update_dict = project_update.model_dump(exclude_unset=True)
-    project_data = await crud_projects.update(db=db, object=update_dict, uuid=project_uuid, return_as_model=True,schema_to_select=cast(type[ProjectReadInternal], ProjectRead))
-    
+    project_data = await acl_projects.update(
+        db=db,
+        object=update_dict,
+        resource_uuid=project_uuid,
+        user_id=current_user.id,
+        schema_to_select=ProjectRead,
+        permissions=WRITE_PERMISSIONS,
+    )
     if not project_data:
-        raise CustomException(status_code=500 ,detail="Failed to update project. Please try again later.")
+        raise NotFoundException("Project not found or access denied")
     
     return APIResponse(message="Project updated successfully", data=project_data )
 
@@ -163,47 +155,49 @@ async def delete_project(
     db: Annotated[AsyncSession, Depends(async_get_db)]
 ) -> APIResponse:
     """Delete a project for the current user."""
-    project_exists = await crud_access_controls.exists(
-        db=db,
-        resource_uuid=project_uuid,
-        resource_type=ResourceType.PROJECT,
-        user_id=current_user.id,
+    project_deleted = await acl_projects.delete(
+        db=db, resource_uuid=project_uuid, user_id=current_user.id, permissions=WRITE_PERMISSIONS
     )
-    if not project_exists:
+    if not project_deleted:
         raise NotFoundException("Project not found or access denied")
-        
-    await crud_projects.delete(db=db, uuid=project_uuid)
+
     await crud_access_controls.delete(db=db, resource_uuid=project_uuid, resource_type=ResourceType.PROJECT)
     return APIResponse(message="Project deleted successfully")
 
 
 # Superuser endpoints
-@router.get("/admin/projects", response_model=PaginatedAPIResponse[AdminProjectRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/projects",
+    response_model=CursorPaginatedAPIResponse[AdminProjectRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_projects(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminProjectRead]:
-    """Get all projects with pagination (Superuser only)."""
-    projects_data = await crud_projects.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminProjectRead]:
+    """Get all projects with cursor pagination (Superuser only)."""
+    projects_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True,
-        schema_to_select=cast(type[ProjectReadInternal], AdminProjectRead)
+        model=Project,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminProjectRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Projects retrieved successfully", items_per_page=items_per_page, **projects_data
     )
-
-    paginated_projects_data = paginated_response(crud_data=projects_data, page=page, items_per_page=items_per_page)
-
-    return PaginatedAPIResponse(message="Projects retrieved successfully", **paginated_projects_data)
 
 
 @router.get("/admin/projects/{project_id}", response_model=APIResponse[AdminProjectRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_project(
     request: Request,
     project_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminProjectRead]:
     """Get a specific project by ID (Superuser only)."""
     projects_data = await crud_projects.get(
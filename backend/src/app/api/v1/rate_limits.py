@@ -1,17 +1,20 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, Query
 from fastcrud.paginated import compute_offset, paginated_response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException
+from ...core.utils.rate_limit_policies import rate_limit_policies
 from ...crud.crud_rate_limits import crud_rate_limits
 from ...crud.crud_tiers import crud_tiers
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.rate_limit import RateLimit
 from ...schemas.rate_limit import RateLimitRead, RateLimitCreate, RateLimitUpdate, AdminRateLimitRead, AdminRateLimitCreate, AdminRateLimitUpdate, RateLimitCreateInternal, RateLimitReadInternal
 from ...schemas.user import UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse, PaginatedAPIResponse
 
 router = APIRouter(tags=["rate_limits"])
 
@@ -20,7 +23,7 @@ router = APIRouter(tags=["rate_limits"])
 async def read_rate_limits(
     request: Request,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
     page: int = 1,
     items_per_page: int = 10
 ) -> PaginatedAPIResponse[RateLimitRead]:
@@ -48,7 +51,7 @@ async def read_rate_limit(
     request: Request,
     rate_limit_uuid: UUID,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[RateLimitRead]:
     """Get a specific rate limit by UUID (only if it belongs to user's tier)."""
     if not current_user.tier_id:
@@ -93,34 +96,40 @@ async def admin_create_rate_limit(
     if not rate_limit_data:
         raise CustomException(status_code=500, detail="Failed to create rate limit. Please try again later.")
 
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Rate limit created successfully", data=rate_limit_data)
 
-@router.get("/admin/rate-limits", response_model=PaginatedAPIResponse[AdminRateLimitRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/rate-limits",
+    response_model=CursorPaginatedAPIResponse[AdminRateLimitRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_rate_limits(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminRateLimitRead]:
-    """Get a paginated list of rate limits (Superuser only)."""
-    rate_limits_data = await crud_rate_limits.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminRateLimitRead]:
+    """Get a cursor paginated list of rate limits (Superuser only)."""
+    rate_limits_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True
+        model=RateLimit,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminRateLimitRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Rate limits retrieved successfully", items_per_page=items_per_page, **rate_limits_data
     )
-    if not rate_limits_data:
-        raise NotFoundException("Rate limits not found")
-    
-    paginated_result = paginated_response(crud_data=rate_limits_data, page=page, items_per_page=items_per_page)
-
-    return PaginatedAPIResponse(message="Rate limits retrieved successfully", **paginated_result)
 
 @router.get("/admin/rate-limits/{rate_limit_id}", response_model=APIResponse[AdminRateLimitRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_rate_limit(
     request: Request,
     rate_limit_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminRateLimitRead]:
     """Get rate limit information by ID (Superuser only)."""
     rate_limit_data = await crud_rate_limits.get(
@@ -173,6 +182,7 @@ async def admin_update_rate_limit(
     if not rate_limit_data:
         raise CustomException(status_code=500, detail="Failed to update rate limit. Please try again later.")
     
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Rate limit updated successfully", data=rate_limit_data)
 
 @router.delete("/admin/rate-limits/{rate_limit_id}", response_model=APIResponse, dependencies=[Depends(get_current_superuser)])
@@ -187,6 +197,7 @@ async def admin_delete_rate_limit(
         raise NotFoundException("Rate limit not found or already deleted")
     
     await crud_rate_limits.delete(db=db, id=rate_limit_id)
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Rate limit deleted successfully")
 
 @router.delete("/admin/rate-limits/{rate_limit_id}/force", response_model=APIResponse, dependencies=[Depends(get_current_superuser)])
@@ -201,4 +212,5 @@ async def admin_force_delete_rate_limit(
         raise NotFoundException("Rate limit not found")
     
     await crud_rate_limits.db_delete(db=db, id=rate_limit_id)
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Rate limit permanently deleted from the database")
\ No newline at end of file
@@ -1,17 +1,19 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
-from fastcrud.paginated import compute_offset, paginated_response
+from fastapi import APIRouter, Depends, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import CustomException, NotFoundException, DuplicateValueException
+from ...core.utils.rate_limit_policies import rate_limit_policies
 from ...crud.crud_tiers import crud_tiers
 from ...crud.crud_users import crud_users
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.tier import Tier
 from ...schemas.tier import TierRead, TierCreate, TierUpdate, AdminTierRead, AdminTierCreate, AdminTierUpdate, TierCreateInternal, TierReadInternal
 from ...schemas.user import UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse
 
 router = APIRouter(tags=["tiers"])
 
@@ -20,7 +22,7 @@ router = APIRouter(tags=["tiers"])
 async def read_tier(
     request: Request,
     current_user: Annotated[UserReadInternal, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[TierRead]:
     """Get current user's tier information."""
     if not current_user.tier_id:
@@ -54,34 +56,40 @@ async def admin_create_tier(
     if not tier_data:
         raise CustomException(status_code=500, detail="Failed to create tier. Please try again later.")
 
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Tier created successfully", data=tier_data)
 
-@router.get("/admin/tiers", response_model=PaginatedAPIResponse[AdminTierRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/tiers",
+    response_model=CursorPaginatedAPIResponse[AdminTierRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_tiers(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminTierRead]:
-    """Get a paginated list of tiers (Superuser only)."""
-    tiers_data = await crud_tiers.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminTierRead]:
+    """Get a cursor paginated list of tiers (Superuser only)."""
+    tiers_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True
+        model=Tier,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminTierRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Tiers retrieved successfully", items_per_page=items_per_page, **tiers_data
     )
-    if not tiers_data:
-        raise NotFoundException("Tiers not found")
-    
-    paginated_result = paginated_response(crud_data=tiers_data, page=page, items_per_page=items_per_page)
-
-    return PaginatedAPIResponse(message="Tiers retrieved successfully", **paginated_result)
 
 @router.get("/admin/tiers/{tier_id}", response_model=APIResponse[AdminTierRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_tier(
     request: Request,
     tier_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminTierRead]:
     """Get tier information by ID (Superuser only)."""
     tier_data = await crud_tiers.get(
@@ -114,6 +122,7 @@ async def admin_update_tier(
     if not tier_data:
         raise CustomException(status_code=500, detail="Failed to update tier. Please try again later.")
     
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Tier updated successfully", data=tier_data)
 
 @router.delete("/admin/tiers/{tier_id}", response_model=APIResponse, dependencies=[Depends(get_current_superuser)])
@@ -133,6 +142,7 @@ async def admin_delete_tier(
         raise CustomException(status_code=400, detail="Cannot delete tier that has active users")
     
     await crud_tiers.delete(db=db, id=tier_id)
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Tier deleted successfully")
 
 @router.delete("/admin/tiers/{tier_id}/force", response_model=APIResponse, dependencies=[Depends(get_current_superuser)])
@@ -152,4 +162,5 @@ async def admin_force_delete_tier(
         raise CustomException(status_code=400, detail="Cannot delete tier that has users")
     
     await crud_tiers.db_delete(db=db, id=tier_id)
+    await rate_limit_policies.publish_change()
     return APIResponse(message="Tier permanently deleted from the database")
\ No newline at end of file
@@ -1,17 +1,20 @@
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, Request, status
-from fastcrud.paginated import compute_offset, paginated_response
+from fastapi import APIRouter, Depends, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_read_db
 from ...core.exceptions.http_exceptions import DuplicateValueException, CustomException, NotFoundException
-from ...core.security import blacklist_token, get_password_hash, oauth2_scheme
+from ...core.security import blacklist_token, hash_password, oauth2_scheme
+from ...core.utils.principal_cache import principal_cache
+from ...core.utils.session_registry import session_registry
 from ...crud.crud_users import crud_users
+from ...crud.keyset import MAX_ITEMS_PER_PAGE, get_keyset_page
+from ...models.user import User
 
 from ...schemas.user import UserRead, UserCreate, UserUpdate, AdminUserRead, AdminUserCreate, AdminUserUpdate, UserTierUpdate, UserCreateInternal, UserReadInternal
-from ...schemas.utils import APIResponse, PaginatedAPIResponse
+from ...schemas.utils import APIResponse, CursorPaginatedAPIResponse
 
 router = APIRouter(tags=["users"])
 
@@ -46,7 +49,8 @@ async def update_current_user(
     user_data = await crud_users.update(db=db, object=update_dict, uuid=current_user.uuid,return_as_model=True,schema_to_select=UserReadInternal)
     if  not user_data:
          raise CustomException(status_code=500 ,detail="Failed to update user. Please try again later.")
-    
+    await principal_cache.invalidate_user(current_user)
+
     return APIResponse(message="User updated successfully", data=user_data)
 
 @router.delete("/users/me", response_model=APIResponse, status_code=status.HTTP_200_OK)
@@ -57,8 +61,11 @@ async def delete_current_user(
     token: str = Depends(oauth2_scheme),
 ) -> APIResponse:
     """Delete current user."""
+    # Revoke first: if Redis cannot record it, the user is not deleted with live sessions
+    await session_registry.revoke_all(current_user.username)
     await crud_users.delete(db=db, id=current_user.id)
     await blacklist_token(token=token, db=db)
+    await principal_cache.invalidate_user(current_user)
     return APIResponse(message="User deleted successfully")
 
 # Superuser endpoints
@@ -78,7 +85,7 @@ async def admin_create_user(
         raise DuplicateValueException("Username not available")
 
     create_dict = user_create.model_dump()
-    create_dict["hashed_password"] = get_password_hash(password=create_dict.pop("password"))
+    create_dict["hashed_password"] = await hash_password(create_dict.pop("password"))
 
     create_internal = UserCreateInternal(**create_dict)
     user_data = await crud_users.create(db=db, object=create_internal)
@@ -89,32 +96,37 @@ async def admin_create_user(
 
     return APIResponse(message="User created successfully", data=user_data)
 
-@router.get("/admin/users", response_model=PaginatedAPIResponse[AdminUserRead], dependencies=[Depends(get_current_superuser)])
+@router.get(
+    "/admin/users",
+    response_model=CursorPaginatedAPIResponse[AdminUserRead],
+    dependencies=[Depends(get_current_superuser)],
+)
 async def admin_read_users(
     request: Request, 
-    db: Annotated[AsyncSession, Depends(async_get_db)], 
-    page: int = 1, 
-    items_per_page: int = 10
-) -> PaginatedAPIResponse[AdminUserRead]:
-    """Get a paginated list of users (Superuser only)."""
-    users_data = await crud_users.get_multi(
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    cursor: str | None = None,
+    include_total: bool = False
+) -> CursorPaginatedAPIResponse[AdminUserRead]:
+    """Get a cursor paginated list of users (Superuser only)."""
+    users_data = await get_keyset_page(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
-        return_total_count=True
+        model=User,
+        keys=("created_at", "id"),
+        items_per_page=items_per_page,
+        cursor=cursor,
+        schema_to_select=AdminUserRead,
+        include_total=include_total,
+    )
+    return CursorPaginatedAPIResponse(
+        message="Users retrieved successfully", items_per_page=items_per_page, **users_data
     )
-    if not users_data:
-        raise NotFoundException("Users not found")
-    
-    paginated_result = paginated_response(crud_data=users_data, page=page, items_per_page=items_per_page)
-
-    return PaginatedAPIResponse(message="Users retrieved successfully", **paginated_result)
 
 @router.get("/admin/users/{user_id}", response_model=APIResponse[AdminUserRead], dependencies=[Depends(get_current_superuser)])
 async def admin_read_user(
     request: Request, 
     user_id: int, 
-    db: Annotated[AsyncSession, Depends(async_get_db)]
+    db: Annotated[AsyncSession, Depends(async_get_read_db)]
 ) -> APIResponse[AdminUserRead]:
     """Get user information by ID (Superuser only)."""
     user_data = await crud_users.get(
@@ -133,8 +145,8 @@ async def admin_update_user(
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> APIResponse[AdminUserRead]:
     """Update a user by ID (Superuser only)."""
-    user_exists = await crud_users.exists(db=db, id=user_id)
-    if not user_exists:
+    db_user = await crud_users.get(db=db, id=user_id)
+    if not db_user:
         raise NotFoundException("User not found")
 
     if user_update.username:
@@ -149,12 +161,14 @@ async def admin_update_user(
 
     update_dict = user_update.model_dump(exclude_unset=True)
     if "password" in update_dict:
-        update_dict["hashed_password"] = get_password_hash(update_dict.pop("password"))
+        update_dict["hashed_password"] = await hash_password(update_dict.pop("password"))
         
     user_data = await crud_users.update(db=db, object=update_dict, id=user_id)
     if not user_data:
         raise CustomException(status_code=500 ,detail="Failed to update user. Please try again later.")
-    
+    # Covers tier changes too: the principal carries tier_id
+    await principal_cache.invalidate_user(db_user)
+
     return APIResponse(message="User updated successfully", data=user_data)
 
 
@@ -165,10 +179,12 @@ async def admin_delete_user(
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> APIResponse:
     """Delete a user by ID (mark as deleted) (Superuser only)."""
-    user_exists = await crud_users.exists(db=db, id=user_id, is_deleted=False)
-    if not user_exists:
+    db_user = await crud_users.get(db=db, id=user_id, is_deleted=False)
+    if not db_user:
         raise NotFoundException("User not found or already delete")
+    await session_registry.revoke_all(db_user["username"])
     await crud_users.delete(db=db, id=user_id)
+    await principal_cache.invalidate_user(db_user)
     return APIResponse(message="User deleted successfully")
 
 @router.delete("/admin/users/{user_id}/force", response_model=APIResponse, dependencies=[Depends(get_current_superuser)])
@@ -178,8 +194,10 @@ async def admin_force_delete_user(
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> APIResponse:
     """Permanently delete a user from the database (Superuser only)."""
-    user_exists = await crud_users.exists(db=db, id=user_id)
-    if not user_exists:
+    db_user = await crud_users.get(db=db, id=user_id)
+    if not db_user:
         raise NotFoundException("User not found")
+    await session_registry.revoke_all(db_user["username"])
     await crud_users.db_delete(db=db, id=user_id)
+    await principal_cache.invalidate_user(db_user)
     return APIResponse(message="User permanently deleted from the database")
\ No newline at end of file
@@ -30,6 +30,17 @@ class CryptSettings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = config("REFRESH_TOKEN_EXPIRE_DAYS", default=7)
     RESET_PASSWORD_EXPIRE_MINUTES: int = config("RESET_PASSWORD_EXPIRE_MINUTES", default=8)
     VERIFY_ACCOUNT_EXPIRE_MINUTES: int = config("VERIFY_ACCOUNT_EXPIRE_MINUTES", default=8)
+    BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=12)
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=4)
+    PASSWORD_HASH_QUEUE_SIZE: int = config("PASSWORD_HASH_QUEUE_SIZE", default=32)
+    PASSWORD_HASH_STATS_INTERVAL: float = config("PASSWORD_HASH_STATS_INTERVAL", default=300.0)
+    TOKEN_CLAIMS_CACHE_SIZE: int = config("TOKEN_CLAIMS_CACHE_SIZE", default=10_000)
+    SESSION_GENERATION_LOCAL_EXPIRE: int = config("SESSION_GENERATION_LOCAL_EXPIRE", default=30)
+    PRINCIPAL_CACHE_EXPIRE: int = config("PRINCIPAL_CACHE_EXPIRE", default=300)
+    PRINCIPAL_CACHE_LOCAL_EXPIRE: int = config("PRINCIPAL_CACHE_LOCAL_EXPIRE", default=30)
+    TOKEN_REVOCATION_CHANNEL: str = config("TOKEN_REVOCATION_CHANNEL", default="auth:revoked")
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = config("TOKEN_REVOCATION_BLOOM_CAPACITY", default=100_000)
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = config("TOKEN_REVOCATION_BLOOM_ERROR_RATE", default=0.001)
 
 class DatabaseSettings(BaseSettings):
     pass
@@ -63,6 +74,17 @@ class PostgresSettings(DatabaseSettings):
     POSTGRES_ASYNC_PREFIX: str = config("POSTGRES_ASYNC_PREFIX", default="postgresql+asyncpg://")
     POSTGRES_URI: str = f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
     POSTGRES_URL: str | None = config("POSTGRES_URL", default=None)
+    POSTGRES_POOL_SIZE: int = config("POSTGRES_POOL_SIZE", default=20)
+    POSTGRES_MAX_OVERFLOW: int = config("POSTGRES_MAX_OVERFLOW", default=10)
+    POSTGRES_POOL_TIMEOUT: float = config("POSTGRES_POOL_TIMEOUT", default=30.0)
+    POSTGRES_POOL_RECYCLE: int = config("POSTGRES_POOL_RECYCLE", default=1800)
+    POSTGRES_POOL_PRE_PING: bool = config("POSTGRES_POOL_PRE_PING", default=True)
+    POSTGRES_POOL_STATS_INTERVAL: float = config("POSTGRES_POOL_STATS_INTERVAL", default=300.0)
+    POSTGRES_PGBOUNCER: bool = config("POSTGRES_PGBOUNCER", default=False)
+    POSTGRES_REPLICA_SERVERS: str = config("POSTGRES_REPLICA_SERVERS", default="")
+    POSTGRES_REPLICA_MAX_LAG: float = config("POSTGRES_REPLICA_MAX_LAG", default=5.0)
+    POSTGRES_REPLICA_CHECK_INTERVAL: float = config("POSTGRES_REPLICA_CHECK_INTERVAL", default=5.0)
+    POSTGRES_READ_YOUR_WRITES_WINDOW: float = config("POSTGRES_READ_YOUR_WRITES_WINDOW", default=5.0)
 
 
 class FirstUserSettings(BaseSettings):
@@ -80,6 +102,16 @@ class RedisCacheSettings(BaseSettings):
     REDIS_CACHE_HOST: str = config("REDIS_CACHE_HOST", default="localhost")
     REDIS_CACHE_PORT: int = config("REDIS_CACHE_PORT", default=6379)
     REDIS_CACHE_URL: str = f"redis://{REDIS_CACHE_HOST}:{REDIS_CACHE_PORT}"
+    REDIS_CACHE_MAX_CONNECTIONS: int = config("REDIS_CACHE_MAX_CONNECTIONS", default=50)
+    REDIS_CACHE_SOCKET_TIMEOUT: float = config("REDIS_CACHE_SOCKET_TIMEOUT", default=5.0)
+    REDIS_CACHE_SOCKET_CONNECT_TIMEOUT: float = config("REDIS_CACHE_SOCKET_CONNECT_TIMEOUT", default=2.0)
+    REDIS_CACHE_HEALTH_CHECK_INTERVAL: int = config("REDIS_CACHE_HEALTH_CHECK_INTERVAL", default=30)
+    REDIS_CACHE_LOCAL_MAX_SIZE: int = config("REDIS_CACHE_LOCAL_MAX_SIZE", default=1024)
+    REDIS_CACHE_INVALIDATION_CHANNEL: str = config("REDIS_CACHE_INVALIDATION_CHANNEL", default="cache:invalidate")
+    REDIS_CACHE_CODEC: str = config("REDIS_CACHE_CODEC", default="json")
+    REDIS_CACHE_COMPRESS_MIN_SIZE: int = config("REDIS_CACHE_COMPRESS_MIN_SIZE", default=1024)
+    REDIS_CACHE_COMPRESS_LEVEL: int = config("REDIS_CACHE_COMPRESS_LEVEL", default=1)
+    REDIS_CACHE_STATS_INTERVAL: float = config("REDIS_CACHE_STATS_INTERVAL", default=300.0)
 
 
 class ClientSideCacheSettings(BaseSettings):
@@ -89,17 +121,53 @@ class ClientSideCacheSettings(BaseSettings):
 class RedisQueueSettings(BaseSettings):
     REDIS_QUEUE_HOST: str = config("REDIS_QUEUE_HOST", default="localhost")
     REDIS_QUEUE_PORT: int = config("REDIS_QUEUE_PORT", default=6379)
+    REDIS_QUEUE_URL: str = f"redis://{REDIS_QUEUE_HOST}:{REDIS_QUEUE_PORT}"
+    REDIS_QUEUE_MAX_CONNECTIONS: int = config("REDIS_QUEUE_MAX_CONNECTIONS", default=10)
+    REDIS_QUEUE_SOCKET_TIMEOUT: float = config("REDIS_QUEUE_SOCKET_TIMEOUT", default=5.0)
+    REDIS_QUEUE_SOCKET_CONNECT_TIMEOUT: float = config("REDIS_QUEUE_SOCKET_CONNECT_TIMEOUT", default=2.0)
+    REDIS_QUEUE_HEALTH_CHECK_INTERVAL: int = config("REDIS_QUEUE_HEALTH_CHECK_INTERVAL", default=30)
+
+
+class RedisSessionSettings(BaseSettings):
+    REDIS_SESSION_HOST: str = config("REDIS_SESSION_HOST", default="localhost")
+    REDIS_SESSION_PORT: int = config("REDIS_SESSION_PORT", default=6379)
+    REDIS_SESSION_URL: str = f"redis://{REDIS_SESSION_HOST}:{REDIS_SESSION_PORT}"
+    REDIS_SESSION_MAX_CONNECTIONS: int = config("REDIS_SESSION_MAX_CONNECTIONS", default=20)
+    REDIS_SESSION_SOCKET_TIMEOUT: float = config("REDIS_SESSION_SOCKET_TIMEOUT", default=2.0)
+    REDIS_SESSION_SOCKET_CONNECT_TIMEOUT: float = config("REDIS_SESSION_SOCKET_CONNECT_TIMEOUT", default=2.0)
+    REDIS_SESSION_HEALTH_CHECK_INTERVAL: int = config("REDIS_SESSION_HEALTH_CHECK_INTERVAL", default=30)
 
 
 class RedisRateLimiterSettings(BaseSettings):
     REDIS_RATE_LIMIT_HOST: str = config("REDIS_RATE_LIMIT_HOST", default="localhost")
     REDIS_RATE_LIMIT_PORT: int = config("REDIS_RATE_LIMIT_PORT", default=6379)
     REDIS_RATE_LIMIT_URL: str = f"redis://{REDIS_RATE_LIMIT_HOST}:{REDIS_RATE_LIMIT_PORT}"
+    REDIS_RATE_LIMIT_MAX_CONNECTIONS: int = config("REDIS_RATE_LIMIT_MAX_CONNECTIONS", default=50)
+    REDIS_RATE_LIMIT_SOCKET_TIMEOUT: float = config("REDIS_RATE_LIMIT_SOCKET_TIMEOUT", default=0.5)
+    REDIS_RATE_LIMIT_SOCKET_CONNECT_TIMEOUT: float = config("REDIS_RATE_LIMIT_SOCKET_CONNECT_TIMEOUT", default=2.0)
+    REDIS_RATE_LIMIT_HEALTH_CHECK_INTERVAL: int = config("REDIS_RATE_LIMIT_HEALTH_CHECK_INTERVAL", default=30)
 
 
 class DefaultRateLimitSettings(BaseSettings):
     DEFAULT_RATE_LIMIT_LIMIT: int = config("DEFAULT_RATE_LIMIT_LIMIT", default=10)
     DEFAULT_RATE_LIMIT_PERIOD: int = config("DEFAULT_RATE_LIMIT_PERIOD", default=3600)
+    RATE_LIMIT_POLICY_CHANNEL: str = config("RATE_LIMIT_POLICY_CHANNEL", default="ratelimit:policies")
+    RATE_LIMIT_POLICY_REFRESH_INTERVAL: float = config("RATE_LIMIT_POLICY_REFRESH_INTERVAL", default=300.0)
+    RATE_LIMIT_LEASE_FRACTION: float = config("RATE_LIMIT_LEASE_FRACTION", default=0.05)
+    RATE_LIMIT_LEASE_MAX: int = config("RATE_LIMIT_LEASE_MAX", default=50)
+    RATE_LIMIT_LEASE_TTL: float = config("RATE_LIMIT_LEASE_TTL", default=1.0)
+    RATE_LIMIT_LEASE_CACHE_SIZE: int = config("RATE_LIMIT_LEASE_CACHE_SIZE", default=10000)
+    RATE_LIMIT_TRUSTED_PROXIES: str = config("RATE_LIMIT_TRUSTED_PROXIES", default="127.0.0.1,::1")
+    RATE_LIMIT_IPV4_PREFIX: int = config("RATE_LIMIT_IPV4_PREFIX", default=32)
+    RATE_LIMIT_IPV6_PREFIX: int = config("RATE_LIMIT_IPV6_PREFIX", default=64)
+
+
+class BackgroundTaskSettings(BaseSettings):
+    USER_TOUCH_FLUSH_INTERVAL: float = config("USER_TOUCH_FLUSH_INTERVAL", default=30.0)
+    TOKEN_BLACKLIST_PURGE_INTERVAL: float = config("TOKEN_BLACKLIST_PURGE_INTERVAL", default=3600.0)
+    TOKEN_BLACKLIST_PURGE_BATCH_SIZE: int = config("TOKEN_BLACKLIST_PURGE_BATCH_SIZE", default=5000)
+    TOKEN_BLACKLIST_PURGE_PAUSE: float = config("TOKEN_BLACKLIST_PURGE_PAUSE", default=0.1)
+    TOKEN_BLACKLIST_PURGE_MAX_DURATION: float = config("TOKEN_BLACKLIST_PURGE_MAX_DURATION", default=600.0)
 
 
 class EmailSettings(BaseSettings):
@@ -155,6 +223,15 @@ class MinioSettings(BaseSettings):
     MINIO_SECRET_KEY: str = config("MINIO_SECRET_KEY", default="minioadmin")
     MINIO_BUCKET_NAME: str = config("MINIO_BUCKET_NAME", default="papery-files")
     MINIO_SECURE: bool = config("MINIO_SECURE", cast=bool, default=False)
+    MINIO_MAX_POOL_CONNECTIONS: int = config("MINIO_MAX_POOL_CONNECTIONS", default=10)
+    MINIO_IO_WORKERS: int = config("MINIO_IO_WORKERS", default=8)
+    MINIO_CONNECT_TIMEOUT: float = config("MINIO_CONNECT_TIMEOUT", default=5.0)
+    MINIO_READ_TIMEOUT: float = config("MINIO_READ_TIMEOUT", default=60.0)
+    MINIO_OPERATION_TIMEOUT: float = config("MINIO_OPERATION_TIMEOUT", default=300.0)
+    MINIO_STREAM_CHUNK_SIZE: int = config("MINIO_STREAM_CHUNK_SIZE", default=256 * 1024)
+    MINIO_PRESIGNED_URL_EXPIRE: int = config("MINIO_PRESIGNED_URL_EXPIRE", default=3600)
+    MINIO_PRESIGNED_URL_CACHE_MARGIN: int = config("MINIO_PRESIGNED_URL_CACHE_MARGIN", default=600)
+    MINIO_PRESIGNED_URL_CACHE_SIZE: int = config("MINIO_PRESIGNED_URL_CACHE_SIZE", default=10000)
 
 
 class Settings(
@@ -166,8 +243,10 @@ class Settings(
     RedisCacheSettings,
     ClientSideCacheSettings,
     RedisQueueSettings,
+    RedisSessionSettings,
     RedisRateLimiterSettings,
     DefaultRateLimitSettings,
+    BackgroundTaskSettings,
     EmailSettings,
     EnvironmentSettings,
     CorsSettings,
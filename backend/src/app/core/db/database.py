@@ -1,9 +1,19 @@
+import asyncio
+import logging
+
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
-from typing import AsyncGenerator
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, Session
+from typing import Any, AsyncGenerator
+from uuid import uuid4
 
 from ..config import settings
+from .pool import InstrumentedQueuePool
+from .replicas import ReplicaRouter
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase, MappedAsDataclass):
@@ -14,12 +24,132 @@ DATABASE_URI = settings.POSTGRES_URI
 DATABASE_PREFIX = settings.POSTGRES_ASYNC_PREFIX
 DATABASE_URL = f"{DATABASE_PREFIX}{DATABASE_URI}"
 
-async_engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+
+def get_replica_urls() -> list[str]:
+    """URLs of the read replicas in `POSTGRES_REPLICA_SERVERS` ("host[:port],..."), same credentials."""
+    urls = []
+    for server in settings.POSTGRES_REPLICA_SERVERS.split(","):
+        server = server.strip()
+        if not server:
+            continue
+        if ":" not in server:
+            server = f"{server}:{settings.POSTGRES_PORT}"
+        urls.append(
+            f"{DATABASE_PREFIX}{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{server}/{settings.POSTGRES_DB}"
+        )
+    return urls
+
+
+def get_engine_options() -> dict[str, Any]:
+    """Pool options of the async engine, from settings."""
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+    if settings.POSTGRES_PGBOUNCER:
+        # pgbouncer in transaction mode hands each transaction to any server connection, so a
+        # statement prepared on one is missing (or clashes by name) on the next: disable asyncpg's
+        # statement caches and give every prepared statement a unique name.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return options
+
+
+async_engine = create_async_engine(DATABASE_URL, echo=False, future=True, **get_engine_options())
 
 local_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
 
+replica_engines = [
+    create_async_engine(url, echo=False, future=True, **get_engine_options()) for url in get_replica_urls()
+]
+replica_router = ReplicaRouter(local_session, replica_engines)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session: Session) -> None:
+    session.info["committed"] = True
+
+
+def _request_subject(request: Request) -> str | None:
+    """Token subject of the request, if a dependency already verified its access token."""
+    verified = getattr(request.state, "verified_access_token", None)
+    token_data = verified[1] if verified else None
+    return token_data.username_or_email if token_data else None
+
+
+_pool_stats_logger: asyncio.Task | None = None
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Connection pool telemetry of this worker (checkouts, wait time, timeouts, overflow), per engine."""
+    stats = {"primary": async_engine.pool.get_stats()}
+    for index, engine in enumerate(replica_engines):
+        stats[f"replica_{index}"] = engine.pool.get_stats()
+    return stats
 
-async def async_get_db() -> AsyncGenerator[AsyncSession, None]:
+
+async def _log_pool_stats(interval: float) -> None:
+    timeouts: dict[str, int] = {}
+    while True:
+        await asyncio.sleep(interval)
+        for name, stats in get_pool_stats().items():
+            # New timeouts mean requests failed waiting for a connection: the pool is too small
+            log = logger.warning if stats["timeouts"] > timeouts.get(name, 0) else logger.info
+            timeouts[name] = stats["timeouts"]
+            log(f"Database pool {name}: {stats}")
+
+
+def start_pool_stats_logger() -> None:
+    """Log `get_pool_stats()` every `POSTGRES_POOL_STATS_INTERVAL` seconds (0 disables it)."""
+    global _pool_stats_logger
+    if settings.POSTGRES_POOL_STATS_INTERVAL <= 0:
+        return
+    if _pool_stats_logger is None or _pool_stats_logger.done():
+        _pool_stats_logger = asyncio.create_task(_log_pool_stats(settings.POSTGRES_POOL_STATS_INTERVAL))
+
+
+async def stop_pool_stats_logger() -> None:
+    global _pool_stats_logger
+    if _pool_stats_logger is not None:
+        _pool_stats_logger.cancel()
+        try:
+            await _pool_stats_logger
+        except asyncio.CancelledError:
+            pass
+        _pool_stats_logger = None
+
+
+async def async_get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async_session = local_session
     async with async_session() as db:
         yield db
+
+        if replica_router.has_replicas and db.sync_session.info.get("committed"):
+            subject = _request_subject(request)
+            if subject is not None:
+                await replica_router.mark_write(subject)
+
+
+async def async_get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints: a fresh replica, or the primary after the user's own write.
+
+    The user is only known here if the access token was verified before this dependency runs.
+    FastAPI resolves decorator `dependencies=[...]` first and then the parameters in order, so
+    declare `get_current_user` (or `get_current_superuser`) before the `db` parameter; otherwise
+    the request is treated as anonymous and may read from a replica right after its own write.
+    """
+    async_session = local_session
+    if replica_router.has_replicas:
+        subject = _request_subject(request)
+        if subject is None or not await replica_router.is_sticky(subject):
+            async_session = replica_router.choose()
+
+    async with async_session() as db:
+        yield db
@@ -1,14 +1,35 @@
+import asyncio
+import functools
 import logging
 import time
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from minio import Minio
 from minio.error import S3Error
 from urllib3.util.retry import Retry
+from urllib3.util.timeout import Timeout
 from urllib3 import PoolManager
 from ..config import settings
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+_STREAM_END = object()
+
+
+def _create_http_client() -> PoolManager:
+    """Create the urllib3 pool used by the MinIO SDK (sized and timed out from settings)."""
+    # Disable urllib3 retry to avoid duplicate retry messages
+    retry_strategy = Retry(total=0)
+    return PoolManager(
+        maxsize=settings.MINIO_MAX_POOL_CONNECTIONS,
+        block=False,
+        timeout=Timeout(connect=settings.MINIO_CONNECT_TIMEOUT, read=settings.MINIO_READ_TIMEOUT),
+        retries=retry_strategy,
+    )
+
+
 class MinioClient:
     _instance = None
     _client = None
@@ -23,15 +44,10 @@ class MinioClient:
 
     def retry_init_minio(self, attempt=1, max_retries=5):
         """Retry kết nối MinIO tối đa max_retries lần, chạy background."""
-        import time
-        from minio.error import S3Error
-        from urllib3.util.retry import Retry
-        from urllib3 import PoolManager
         last_error = None
         for i in range(attempt, max_retries+1):
             try:
-                retry_strategy = Retry(total=0)
-                http_client = PoolManager(retries=retry_strategy)
+                http_client = _create_http_client()
                 client = Minio(
                     settings.MINIO_ENDPOINT,
                     access_key=settings.MINIO_ACCESS_KEY,
@@ -58,9 +74,7 @@ class MinioClient:
         if self._client:
             return
         try:
-            # Disable urllib3 retry to avoid duplicate retry messages
-            retry_strategy = Retry(total=0)  # No retry
-            http_client = PoolManager(retries=retry_strategy)
+            http_client = _create_http_client()
             self._client = Minio(
                 settings.MINIO_ENDPOINT,
                 access_key=settings.MINIO_ACCESS_KEY,
@@ -170,6 +184,46 @@ class MinioClient:
             logger.error(f"Error downloading file {file_name}: {e}")
             return None
 
+    def stat_file(self, file_name):
+        """Get object metadata (size, etag, content type), or None if the object is missing."""
+        if not self._ensure_connection():
+            return None
+
+        try:
+            if self._client:
+                return self._client.stat_object(settings.MINIO_BUCKET_NAME, file_name)
+            return None
+        except S3Error as e:
+            if e.code != 'NoSuchKey':
+                logger.error(f"S3Error reading metadata of file {file_name}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error reading metadata of file {file_name}: {e}")
+            return None
+
+    def open_file(self, file_name, offset=0, length=0):
+        """Start reading a file (or the byte range offset..offset+length) and return the HTTP response.
+
+        length=0 means "until the end of the object". The caller must `close()` and `release_conn()`
+        the response; closing it also aborts a read blocked in another thread.
+        """
+        if not self._ensure_connection() or not self._client:
+            raise ConnectionError("MinIO is not available")
+        return self._client.get_object(settings.MINIO_BUCKET_NAME, file_name, offset=offset, length=length)
+
+    def stream_file(self, file_name, offset=0, length=0, chunk_size=None):
+        """Yield a file (or the byte range offset..offset+length) chunk by chunk.
+
+        Only one chunk is held in memory at a time. length=0 means "until the end of the object".
+        The HTTP connection is released back to the pool when the generator is exhausted or closed.
+        """
+        response = self.open_file(file_name, offset, length)
+        try:
+            yield from response.stream(chunk_size or settings.MINIO_STREAM_CHUNK_SIZE)
+        finally:
+            response.close()
+            response.release_conn()
+
     def delete_file(self, file_name):
         """Delete file from MinIO bucket."""
         if not self._ensure_connection():
@@ -208,6 +262,28 @@ class MinioClient:
             logger.error(f"Error generating presigned url for {file_name}: {e}")
             return None
 
+    def get_presigned_urls(self, file_names, expires=3600):
+        """Sign several objects in one pass (one log line for the batch instead of one per file).
+
+        Returns a dict file_name -> url; files that could not be signed are left out.
+        """
+        if not self._ensure_connection() or not self._client:
+            return {}
+
+        urls = {}
+        expires_delta = timedelta(seconds=expires)
+        for file_name in file_names:
+            try:
+                urls[file_name] = self._client.presigned_get_object(
+                    settings.MINIO_BUCKET_NAME,
+                    file_name,
+                    expires=expires_delta
+                )
+            except Exception as e:
+                logger.error(f"Error generating presigned url for {file_name}: {e}")
+        logger.debug(f"Generated {len(urls)}/{len(file_names)} presigned urls")
+        return urls
+
     def file_exists(self, file_name):
         """Check if a file exists in MinIO bucket."""
         if not self._ensure_connection():
@@ -243,5 +319,189 @@ class MinioClient:
             logger.error(f"Error listing files: {e}")
             return []
 
-# Singleton instance
+
+class AsyncMinioClient:
+    """Non-blocking facade over MinioClient for use inside async handlers.
+
+    Every blocking SDK call runs on a bounded I/O thread pool (``MINIO_IO_WORKERS``) so
+    uploads and downloads never stall the event loop. At most ``MINIO_IO_WORKERS`` calls are
+    in flight at once; further callers wait for a free slot, and that wait counts against the
+    per-call timeout. Uploads have no per-call deadline (see `upload_file`). Return values follow
+    MinioClient (False / None / [] on failure or timeout).
+    """
+
+    _instance = None
+    _executor: ThreadPoolExecutor | None = None
+    _slots: asyncio.Semaphore | None = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            AsyncMinioClient._executor = ThreadPoolExecutor(
+                max_workers=settings.MINIO_IO_WORKERS,
+                thread_name_prefix="minio-io"
+            )
+            AsyncMinioClient._slots = asyncio.Semaphore(settings.MINIO_IO_WORKERS)
+        return self._executor  # type: ignore[return-value]
+
+    @staticmethod
+    def _release_slot(slots: asyncio.Semaphore, future: asyncio.Future) -> None:
+        slots.release()
+        # Retrieve the error of a call the caller stopped waiting for (e.g. a read aborted by
+        # closing its response), so it is not reported as never retrieved
+        if not future.cancelled():
+            future.exception()
+
+    async def _run(
+        self,
+        func: Callable,
+        *args: Any,
+        timeout: float | None = None,
+        default: Any = None,
+        bounded: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a blocking MinioClient method on the I/O pool with a deadline.
+
+        With ``bounded=False`` the deadline only applies to the wait for an I/O slot and the call
+        itself is awaited until it finishes, stalls being left to the HTTP client's socket timeouts.
+        """
+        executor = self._get_executor()
+        slots = self._slots
+        assert slots is not None
+        timeout = timeout if timeout is not None else settings.MINIO_OPERATION_TIMEOUT
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"MinIO call {func.__name__} timed out after {timeout}s waiting for an I/O slot")
+            return default
+
+        future = loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        # The slot is held until the thread really finishes, even if the caller gives up earlier,
+        # so a timed out transfer can never push the pool above MINIO_IO_WORKERS.
+        future.add_done_callback(functools.partial(self._release_slot, slots))
+        if not bounded:
+            return await asyncio.shield(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            logger.error(f"MinIO call {func.__name__} timed out after {timeout}s")
+            return default
+
+    async def init(self) -> None:
+        """Initialize the underlying MinIO client without blocking the event loop."""
+        await self._run(minio.init, default=None)
+
+    async def close(self) -> None:
+        """Shut down the I/O pool (running transfers are allowed to finish)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            AsyncMinioClient._executor = None
+            AsyncMinioClient._slots = None
+
+    def is_available(self) -> bool:
+        """Check if MinIO is available."""
+        return minio.is_available()
+
+    async def health_check(self, timeout: float | None = None) -> bool:
+        """Check MinIO connection health."""
+        return bool(await self._run(minio.health_check, timeout=timeout, default=False))
+
+    async def upload_file(
+        self, file_data, file_name, content_type="application/octet-stream", length=None, timeout: float | None = None
+    ) -> bool:
+        """Upload file to MinIO.
+
+        `timeout` only bounds the wait for an I/O slot. The upload itself has no deadline: giving up
+        on it would report a failure while the thread keeps reading `file_data` and may still
+        create the object, so it runs to completion or until a socket read/write times out.
+        """
+        uploaded = await self._run(
+            minio.upload_file, file_data, file_name, content_type, length, timeout=timeout, default=False, bounded=False
+        )
+        return bool(uploaded)
+
+    async def update_file(
+        self, file_data, file_name, content_type="application/octet-stream", length=None, timeout: float | None = None
+    ) -> bool:
+        """Update file (overwrite old file)."""
+        return await self.upload_file(file_data, file_name, content_type, length, timeout=timeout)
+
+    async def download_file(self, file_name, file_path=None, timeout: float | None = None):
+        """Download file from MinIO to local (if file_path=None, return bytes)."""
+        return await self._run(minio.download_file, file_name, file_path, timeout=timeout, default=None)
+
+    async def stat_file(self, file_name, timeout: float | None = None):
+        """Get object metadata (size, etag, content type), or None if the object is missing."""
+        return await self._run(minio.stat_file, file_name, timeout=timeout, default=None)
+
+    async def stream_file(self, file_name, offset=0, length=0, chunk_size=None) -> AsyncIterator[bytes]:
+        """Async generator over the chunks of MinioClient.open_file.
+
+        Each chunk is pulled on the I/O pool with MINIO_READ_TIMEOUT as deadline. If the transfer
+        fails or stalls mid-way the generator stops early; the response is then shorter than
+        announced and the client sees a truncated body rather than a hung connection.
+
+        The response is closed from the event loop rather than through its chunk generator, which
+        cannot be closed while a timed out `next` is still running on the pool: closing the socket
+        makes that read fail, so the thread and its I/O slot are freed and the connection is not leaked.
+        """
+        try:
+            # Not bounded: a response opened after the deadline could not be closed
+            response = await self._run(minio.open_file, file_name, offset, length, bounded=False)
+        except Exception as e:
+            logger.error(f"Error streaming file {file_name}: {e}")
+            return
+        if response is None:
+            return
+
+        chunks = response.stream(chunk_size or settings.MINIO_STREAM_CHUNK_SIZE)
+        try:
+            while True:
+                try:
+                    chunk = await self._run(
+                        next, chunks, _STREAM_END, timeout=settings.MINIO_READ_TIMEOUT, default=_STREAM_END
+                    )
+                except Exception as e:
+                    logger.error(f"Error streaming file {file_name}: {e}")
+                    return
+                if chunk is _STREAM_END:
+                    return
+                yield chunk
+        finally:
+            try:
+                response.close()
+                response.release_conn()
+            except Exception as e:
+                logger.warning(f"Error closing stream of file {file_name}: {e}")
+
+    async def delete_file(self, file_name, timeout: float | None = None) -> bool:
+        """Delete file from MinIO bucket."""
+        return bool(await self._run(minio.delete_file, file_name, timeout=timeout, default=False))
+
+    async def get_presigned_urls(self, file_names, expires=3600, timeout: float | None = None) -> dict[str, str]:
+        """Sign several objects in one pool call."""
+        return await self._run(minio.get_presigned_urls, list(file_names), expires, timeout=timeout, default={})
+
+    async def file_exists(self, file_name, timeout: float | None = None) -> bool:
+        """Check if a file exists in MinIO bucket."""
+        return bool(await self._run(minio.file_exists, file_name, timeout=timeout, default=False))
+
+    async def list_files(self, prefix="", timeout: float | None = None) -> list[str]:
+        """List files in the bucket with optional prefix."""
+        return await self._run(minio.list_files, prefix, timeout=timeout, default=[])
+
+    async def get_presigned_url(self, file_name, expires=3600, timeout: float | None = None) -> str | None:
+        """Get a presigned temporary access URL for a file."""
+        return await self._run(minio.get_presigned_url, file_name, expires, timeout=timeout, default=None)
+
+
+# Singleton instances
 minio = MinioClient()
+async_minio = AsyncMinioClient()
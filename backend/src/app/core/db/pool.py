@@ -0,0 +1,77 @@
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Counters and wait times (seconds) of connection checkouts in this worker."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    overflow_connections: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` that records how long checkouts wait for a connection.
+
+    Also counts timeouts (`QueuePool limit ... reached`) and connections opened beyond
+    `pool_size` (overflow), which are the signals for resizing the pool.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _inc_overflow(self) -> bool:
+        opened = super()._inc_overflow()
+        if opened and self._overflow > 0:
+            self.stats.overflow_connections += 1
+        return opened
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            logger.warning(
+                f"Database pool exhausted after {time.perf_counter() - started_at:.2f}s "
+                f"(size {self.size()}, overflow {self.overflow()}, checked out {self.checkedout()})"
+            )
+            raise
+
+        waited = time.perf_counter() - started_at
+        self.stats.checkouts += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        return entry
+
+    def get_stats(self) -> dict[str, Any]:
+        """Checkout counters plus the current size, overflow and checked out connections."""
+        return {
+            **asdict(self.stats),
+            "avg_wait": self.stats.avg_wait,
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+        }
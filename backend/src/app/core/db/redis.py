@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional, Any
 import logging
 import redis.asyncio as redis_async
@@ -7,45 +8,119 @@ from ..logger import logging as app_logging
 
 logger = logging.getLogger(__name__)
 
+
+class RedisRole(str, Enum):
+    """Workloads that get their own Redis endpoint and connection pool."""
+
+    CACHE = "cache"
+    RATE_LIMIT = "rate_limit"
+    QUEUE = "queue"
+    SESSION = "session"
+
+
+def get_role_url(role: RedisRole) -> str:
+    return {
+        RedisRole.CACHE: settings.REDIS_CACHE_URL,
+        RedisRole.RATE_LIMIT: settings.REDIS_RATE_LIMIT_URL,
+        RedisRole.QUEUE: settings.REDIS_QUEUE_URL,
+        RedisRole.SESSION: settings.REDIS_SESSION_URL,
+    }[role]
+
+
+def get_pool_options(role: RedisRole) -> dict[str, Any]:
+    """Connection pool options of a role (see the REDIS_<ROLE>_* settings)."""
+    prefix = {
+        RedisRole.CACHE: "REDIS_CACHE",
+        RedisRole.RATE_LIMIT: "REDIS_RATE_LIMIT",
+        RedisRole.QUEUE: "REDIS_QUEUE",
+        RedisRole.SESSION: "REDIS_SESSION",
+    }[role]
+    socket_timeout = getattr(settings, f"{prefix}_SOCKET_TIMEOUT")
+    return {
+        "max_connections": getattr(settings, f"{prefix}_MAX_CONNECTIONS"),
+        # Wait this long for a free connection when the pool is exhausted instead of failing at once
+        "timeout": socket_timeout,
+        "socket_timeout": socket_timeout,
+        "socket_connect_timeout": getattr(settings, f"{prefix}_SOCKET_CONNECT_TIMEOUT"),
+        "health_check_interval": getattr(settings, f"{prefix}_HEALTH_CHECK_INTERVAL"),
+    }
+
+
+def create_pool(role: RedisRole, **kwargs: Any) -> redis_async.BlockingConnectionPool:
+    """Create a bounded connection pool for a role; extra kwargs are passed to the connections."""
+    return redis_async.BlockingConnectionPool.from_url(get_role_url(role), **get_pool_options(role), **kwargs)
+
+
+def create_pubsub_pool(role: RedisRole, **kwargs: Any) -> redis_async.ConnectionPool:
+    """Create a pool for long-lived pub/sub subscriptions of a role.
+
+    A subscriber waits on its socket until a message arrives, which may take longer than any
+    command timeout, so these connections have no `socket_timeout` (TCP keepalive detects dead
+    peers instead) and are kept apart from the role's command pool.
+    """
+    options = get_pool_options(role)
+    return redis_async.ConnectionPool.from_url(
+        get_role_url(role),
+        max_connections=options["max_connections"],
+        socket_timeout=None,
+        socket_connect_timeout=options["socket_connect_timeout"],
+        socket_keepalive=True,
+        health_check_interval=options["health_check_interval"],
+        **kwargs,
+    )
+
+
 class Redis:
-    """Centralized Redis management class for the entire application."""
-    
-    _instance: Optional["Redis"] = None
-    _client: Optional[redis_async.Redis] = None
-    _pool: Optional[redis_async.ConnectionPool] = None
-    _is_available: bool = False
+    """Redis client of one role (cache, rate limit, queue or session), with its own connection pool.
+
+    There is one instance per role, obtained with `Redis(role)` or `redis_manager.get(role)`.
+    """
+
+    _instances: dict[RedisRole, "Redis"] = {}
+    role: RedisRole
+    _client: Optional[redis_async.Redis]
+    _pool: Optional[redis_async.ConnectionPool]
+    _pubsub_client: Optional[redis_async.Redis]
+    _is_available: bool
     _max_retries: int = 5
     _retry_delay: float = 1.0
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-    
+
+    def __new__(cls, role: RedisRole = RedisRole.CACHE):
+        if role not in cls._instances:
+            instance = super().__new__(cls)
+            instance.role = role
+            instance._client = None
+            instance._pool = None
+            instance._pubsub_client = None
+            instance._is_available = False
+            cls._instances[role] = instance
+        return cls._instances[role]
+
+    def _create_pool(self) -> redis_async.ConnectionPool:
+        return create_pool(self.role, encoding="utf-8", decode_responses=True)
+
     async def retry_init_redis(self, attempt=1, max_retries=5):
         """Retry kết nối Redis tối đa max_retries lần, chạy background."""
         import asyncio
         last_error = None
         for i in range(attempt, max_retries+1):
             try:
-                pool = redis_async.ConnectionPool.from_url(
-                    settings.REDIS_CACHE_URL,
-                    encoding="utf-8",
-                    decode_responses=True
-                )
+                pool = self._create_pool()
                 client = redis_async.Redis(connection_pool=pool)
                 await client.ping()
-                Redis._client = client
-                Redis._pool = pool
-                Redis._is_available = True
-                logger.info("Redis connection initialized successfully (background retry)")
+                self._client = client
+                self._pool = pool
+                self._is_available = True
+                logger.info(f"Redis ({self.role.value}) connection initialized successfully (background retry)")
                 return True
             except Exception as err:
                 last_error = err
                 logger.warning(f"[Redis Retry Task] Attempt {i}/{max_retries}: {err}")
                 await asyncio.sleep(1)
-        Redis._is_available = False
-        logger.error(f"[Redis Retry Task] Redis connection failed after {max_retries} attempts: {last_error}")
+        self._is_available = False
+        logger.error(
+            f"[Redis Retry Task] Redis ({self.role.value}) connection failed after {max_retries} attempts: {last_error}"
+        )
         return False
 
     async def init(self) -> None:
@@ -53,25 +128,22 @@ class Redis:
         if self._client:
             return
         try:
-            self._pool = redis_async.ConnectionPool.from_url(
-                settings.REDIS_CACHE_URL,
-                encoding="utf-8",
-                decode_responses=True
-            )
+            self._pool = self._create_pool()
             self._client = redis_async.Redis(connection_pool=self._pool)
             await self._client.ping()
             self._is_available = True
-            logger.info("Redis connection initialized successfully")
+            logger.info(f"Redis ({self.role.value}) connection initialized successfully")
             return
         except Exception as e:
             self._is_available = False
-            logger.error(f"Redis initial connection failed: {e}")
+            logger.error(f"Redis ({self.role.value}) initial connection failed: {e}")
             # Enqueue background retry task (non-blocking)
             from ..utils.queue import redis_queue
-            redis_queue.register_function(self.retry_init_redis, name="redis_retry_task")
+            task_name = f"redis_retry_task_{self.role.value}"
+            redis_queue.register_function(self.retry_init_redis, name=task_name)
             import threading
             import asyncio
-            threading.Thread(target=lambda: asyncio.run(redis_queue.enqueue("redis_retry_task", 1, 5)), daemon=True).start()
+            threading.Thread(target=lambda: asyncio.run(redis_queue.enqueue(task_name, 1, 5)), daemon=True).start()
     
     async def close(self) -> None:
         """Close Redis connection."""
@@ -79,11 +151,14 @@ class Redis:
             try:
                 await self._client.close()
                 self._client = None
+                if self._pubsub_client:
+                    await self._pubsub_client.aclose(close_connection_pool=True)
+                    self._pubsub_client = None
                 if self._pool:
                     await self._pool.disconnect()
                     self._pool = None
                 self._is_available = False
-                logger.info("Redis connection closed successfully")
+                logger.info(f"Redis ({self.role.value}) connection closed successfully")
             except Exception as e:
                 logger.error(f"Error closing Redis connection: {e}")
     
@@ -100,7 +175,7 @@ class Redis:
             return True
         except Exception as e:
             self._is_available = False
-            logger.error(f"Redis health check failed: {e}")
+            logger.error(f"Redis ({self.role.value}) health check failed: {e}")
             return False
     
     def is_available(self) -> bool:
@@ -110,6 +185,19 @@ class Redis:
     def get_client(self) -> Optional[redis_async.Redis]:
         """Get Redis client instance."""
         return self._client if self._is_available else None
+
+    def get_pubsub_client(self) -> Optional[redis_async.Redis]:
+        """Client for `pubsub()` subscriptions.
+
+        Uses a pool without socket timeout (see `create_pubsub_pool`).
+        """
+        if not self._is_available:
+            return None
+        if self._pubsub_client is None:
+            self._pubsub_client = redis_async.Redis(
+                connection_pool=create_pubsub_pool(self.role, encoding="utf-8", decode_responses=True)
+            )
+        return self._pubsub_client
     
     async def _ensure_connection(self) -> bool:
         """Ensure Redis connection is available."""
@@ -175,5 +263,41 @@ class Redis:
             logger.error(f"Error checking existence of key {key}: {e}")
             return False
 
-# Singleton instance
-redis = Redis()
+
+class RedisManager:
+    """Holds one independently sized connection pool per Redis role.
+
+    Each role reads its endpoint and pool settings from `REDIS_<ROLE>_*`, so rate limiting can run
+    on its own Redis instance and never wait behind cache traffic (large values, evictions).
+    Roles pointing at the same URL still get separate pools.
+    """
+
+    _instance: Optional["RedisManager"] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def get(self, role: RedisRole) -> Redis:
+        return Redis(role)
+
+    async def init(self, *roles: RedisRole) -> None:
+        """Initialize the given roles (all of them by default)."""
+        await asyncio.gather(*(Redis(role).init() for role in roles or tuple(RedisRole)))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(instance.close() for instance in Redis._instances.values()))
+
+    async def health_check(self) -> dict[str, bool]:
+        roles = list(Redis._instances)
+        results = await asyncio.gather(*(Redis(role).health_check() for role in roles))
+        return {role.value: result for role, result in zip(roles, results)}
+
+
+# Singleton instances
+redis_manager = RedisManager()
+redis = redis_manager.get(RedisRole.CACHE)
+redis_rate_limit = redis_manager.get(RedisRole.RATE_LIMIT)
+redis_queue_client = redis_manager.get(RedisRole.QUEUE)
+redis_session = redis_manager.get(RedisRole.SESSION)
@@ -0,0 +1,132 @@
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..utils.local_cache import LocalCache
+from .redis import redis
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "db:primary"
+
+# Seconds the replica is behind its primary; 0 when it has replayed everything it received
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaRouter:
+    """Chooses the session factory of read-only requests: a replica when one is fresh enough.
+
+    - Each worker measures every replica's replication lag every `POSTGRES_REPLICA_CHECK_INTERVAL`
+      seconds. Reads are spread round robin over the replicas whose lag is at most
+      `POSTGRES_REPLICA_MAX_LAG`; a replica that lags further or cannot be reached is skipped until
+      a later check says otherwise, and with none left reads go to the primary.
+    - Read-your-writes: after a request of a user commits on the primary, that user's reads stay
+      on the primary for `POSTGRES_READ_YOUR_WRITES_WINDOW` seconds, so they see their own change
+      whatever the lag. The mark lives in this worker's memory and in Redis for the other workers.
+    """
+
+    def __init__(self, primary: async_sessionmaker[AsyncSession], replica_engines: list[AsyncEngine]) -> None:
+        self.primary = primary
+        self.replica_engines = replica_engines
+        self.replicas = [async_sessionmaker(bind=engine, expire_on_commit=False) for engine in replica_engines]
+        self._lag: list[float | None] = [None] * len(replica_engines)
+        self._round_robin = itertools.count()
+        self._sticky = LocalCache(max_size=10_000)
+        self._monitor: asyncio.Task | None = None
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.replicas)
+
+    def get_lag(self) -> list[float | None]:
+        """Last measured lag of each replica in seconds (None: unreachable or not measured yet)."""
+        return list(self._lag)
+
+    async def _measure(self, engine: AsyncEngine) -> float | None:
+        try:
+            async with engine.connect() as conn:
+                return float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.host} is unavailable: {e}")
+            return None
+
+    async def check_lag(self) -> None:
+        timeout = settings.POSTGRES_REPLICA_CHECK_INTERVAL
+        lags = await asyncio.gather(
+            *(asyncio.wait_for(self._measure(engine), timeout) for engine in self.replica_engines),
+            return_exceptions=True,
+        )
+        for index, lag in enumerate(lags):
+            lag = lag if isinstance(lag, float) else None
+            if lag is not None and lag > settings.POSTGRES_REPLICA_MAX_LAG:
+                logger.warning(f"Replica {self.replica_engines[index].url.host} lags {lag:.1f}s, reading from others")
+            self._lag[index] = lag
+
+    async def _run_monitor(self) -> None:
+        while True:
+            await self.check_lag()
+            await asyncio.sleep(settings.POSTGRES_REPLICA_CHECK_INTERVAL)
+
+    def start(self) -> None:
+        """Start the per-worker task that measures replication lag (no-op without replicas)."""
+        if self.has_replicas and (self._monitor is None or self._monitor.done()):
+            self._monitor = asyncio.create_task(self._run_monitor())
+
+    async def stop(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+
+    def choose(self) -> async_sessionmaker[AsyncSession]:
+        """Session factory of a replica within the lag budget, or of the primary if there is none."""
+        fresh = [
+            index
+            for index, lag in enumerate(self._lag)
+            if lag is not None and lag <= settings.POSTGRES_REPLICA_MAX_LAG
+        ]
+        if not fresh:
+            return self.primary
+        return self.replicas[fresh[next(self._round_robin) % len(fresh)]]
+
+    @staticmethod
+    def _sticky_key(subject: str) -> str:
+        return f"{STICKY_KEY_PREFIX}:{subject}"
+
+    async def mark_write(self, subject: str) -> None:
+        """Send the subject's reads to the primary for the read-your-writes window."""
+        window = settings.POSTGRES_READ_YOUR_WRITES_WINDOW
+        key = self._sticky_key(subject)
+        self._sticky.set(key, True, ttl=window)
+        client = redis.get_client()
+        if client is None:
+            return
+        try:
+            await client.set(key, 1, px=int(window * 1000))
+        except Exception as e:
+            logger.warning(f"Error marking recent write of {subject}: {e}")
+
+    async def is_sticky(self, subject: str) -> bool:
+        key = self._sticky_key(subject)
+        if self._sticky.get(key):
+            return True
+        client = redis.get_client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.exists(key))
+        except Exception as e:
+            logger.warning(f"Error checking recent write of {subject}: {e}")
+            # Unknown: the primary is always consistent
+            return True
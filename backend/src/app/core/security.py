@@ -1,9 +1,9 @@
 from enum import Enum
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
+import time
 import uuid
 
-import bcrypt
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,10 +13,19 @@ from .config import settings
 from .db.crud_token_blacklist import crud_token_blacklist
 from .schemas import TokenBlacklistCreate, TokenData
 from .db.redis import redis
+from .utils.password_hasher import hash_password_sync, password_hasher
+from .utils.principal_cache import principal_cache
+from .utils.session_registry import session_registry
+from .utils.local_cache import LocalCache
+from .utils.token_revocation import token_digest, token_revocation
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
+# Verified claims by token digest, each expiring at the token's `exp`, so a token is decoded
+# and its signature checked once per worker rather than on every request
+_verified_claims = LocalCache(max_size=settings.TOKEN_CLAIMS_CACHE_SIZE)
+
 
 class TokenType(str, Enum):
     ACCESS = "access"
@@ -26,12 +35,20 @@ class TokenType(str, Enum):
 
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    correct_password: bool = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    """Check a password on the hashing pool (raises RateLimitException when it is saturated)."""
+    correct_password: bool = await password_hasher.verify(plain_password, hashed_password)
     return correct_password
 
 
+async def hash_password(password: str) -> str:
+    """Hash a password on the hashing pool; use this from request handlers."""
+    hashed_password: str = await password_hasher.hash(password)
+    return hashed_password
+
+
 def get_password_hash(password: str) -> str:
-    hashed_password: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    """Hash a password on the calling thread (scripts, migrations, tests)."""
+    hashed_password: str = hash_password_sync(password)
     return hashed_password
 
 
@@ -74,9 +91,23 @@ async def authenticate_user(username_or_email: str, password: str, db: AsyncSess
     elif not await verify_password(password, db_user["hashed_password"]):
         return False
 
+    if password_hasher.needs_rehash(db_user["hashed_password"]):
+        # BCRYPT_ROUNDS changed: upgrade the stored hash while we have the plain password
+        hashed_password = await hash_password(password)
+        await crud_users.update(db=db, object={"hashed_password": hashed_password}, id=db_user["id"])
+        await principal_cache.invalidate_user(db_user)
+        db_user["hashed_password"] = hashed_password
+
     return db_user
 
 
+async def _add_session_generation(claims: dict[str, Any]) -> None:
+    """Embed the subject's current session generation (`gen`) so "log out everywhere" can revoke the token."""
+    generation = await session_registry.get_generation(claims["sub"])
+    if generation:
+        claims["gen"] = generation
+
+
 async def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -84,17 +115,22 @@ async def create_access_token(data: dict[str, Any], expires_delta: timedelta | N
     else:
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire, "token_type": TokenType.ACCESS})
+    await _add_session_generation(to_encode)
     encoded_jwt: str = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 async def create_refresh_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
+    """Create a refresh token; without `fid`/`jti` in `data` it starts a new token family (login)."""
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(UTC).replace(tzinfo=None) + expires_delta
     else:
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "token_type": TokenType.REFRESH})
+    await _add_session_generation(to_encode)
+    if "fid" not in to_encode:
+        to_encode["fid"], to_encode["jti"] = await session_registry.start_refresh_family()
     encoded_jwt: str = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -116,23 +152,47 @@ async def verify_token(token: str, expected_token_type: TokenType, db: AsyncSess
     TokenData | None
         TokenData instance if the token is valid, None otherwise.
     """
-    is_blacklisted = await crud_token_blacklist.exists(db, token=token)
+    digest = token_digest(token)
+    is_blacklisted = await token_revocation.is_revoked(token, db, digest=digest)
     if is_blacklisted:
         return None
 
+    payload = decode_token(token, digest)
+    if payload is None:
+        return None
+
+    username_or_email: str | None = payload.get("sub")
+    token_type: str | None = payload.get("token_type")
+
+    if username_or_email is None or token_type != expected_token_type:
+        return None
+
+    if not await session_registry.is_current(username_or_email, payload.get("gen")):
+        return None
+
+    return TokenData(username_or_email=username_or_email)
+
+
+def decode_token(token: str, digest: str | None = None) -> dict[str, Any] | None:
+    """Decode and verify a JWT, reusing the verified claims of a token seen before.
+
+    Returns None if the token is invalid or expired. Revocation is not checked here.
+    """
+    digest = digest or token_digest(token)
+    payload = _verified_claims.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username_or_email: str | None = payload.get("sub")
-        token_type: str | None = payload.get("token_type")
-        
-        if username_or_email is None or token_type != expected_token_type:
-            return None
-            
-        return TokenData(username_or_email=username_or_email)
-
     except JWTError:
         return None
 
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        _verified_claims.set(digest, payload, ttl=expires_at - time.time())
+    return payload
+
 
 async def blacklist_tokens(access_token: str, refresh_token: str, db: AsyncSession) -> None:
     """Blacklist both access and refresh tokens.
@@ -148,6 +208,7 @@ async def blacklist_tokens(access_token: str, refresh_token: str, db: AsyncSessi
     """
     for token in [access_token, refresh_token]:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        await principal_cache.invalidate(payload.get("sub"))
         expires_at_ts = payload.get("exp")
         if not expires_at_ts:
             continue
@@ -159,9 +220,11 @@ async def blacklist_tokens(access_token: str, refresh_token: str, db: AsyncSessi
                 expires_at=expires_at
             )
         )
+        await token_revocation.revoke(token, expires_at)
 
 async def blacklist_token(token: str, db: AsyncSession) -> None:
     payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    await principal_cache.invalidate(payload.get("sub"))
     expires_at_ts = payload.get("exp")
     if not expires_at_ts:
         return
@@ -173,3 +236,4 @@ async def blacklist_token(token: str, db: AsyncSession) -> None:
             expires_at=expires_at
         )
     )
+    await token_revocation.revoke(token, expires_at)
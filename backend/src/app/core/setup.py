@@ -4,6 +4,7 @@ from typing import Any
 
 import anyio
 import fastapi
+from redis.asyncio import Redis
 from fastapi import APIRouter, Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
@@ -12,6 +13,7 @@ from fastapi.openapi.utils import get_openapi
 from ..api.dependencies import get_current_superuser
 from ..api import router as api_router
 from ..middleware.client_cache_middleware import ClientCacheMiddleware
+from ..middleware.rate_limit_headers_middleware import RateLimitHeadersMiddleware
 from ..models import *
 from .config import (
     AppSettings,
@@ -22,15 +24,20 @@ from .config import (
     RedisCacheSettings,
     RedisQueueSettings,
     RedisRateLimiterSettings,
+    RedisSessionSettings,
     MinioSettings,
     settings,
 )
 
-from .db.database import Base,async_engine as engine
+from .db.database import Base,async_engine as engine, replica_router, start_pool_stats_logger, stop_pool_stats_logger
 
-from .db.redis import redis
-from .db.minio import minio
+from .db.redis import RedisRole, create_pool, redis_manager
+from .db.minio import async_minio
 from .logger import logging
+from .utils import cache
+from .utils.password_hasher import password_hasher
+from .utils.rate_limit_policies import rate_limit_policies
+from .utils.token_revocation import token_revocation
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +46,23 @@ async def create_tables() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+# -------------- cache --------------
+async def create_redis_cache_pool() -> None:
+    """Create the binary Redis pool used by the `cache` decorator and start L1 invalidation and stats logging."""
+    cache.pool = create_pool(RedisRole.CACHE)
+    cache.client = Redis.from_pool(cache.pool)
+    cache.start_invalidation_listener()
+    cache.start_stats_logger()
+
+
+async def close_redis_cache_pool() -> None:
+    await cache.stop_stats_logger()
+    await cache.stop_invalidation_listener()
+    if cache.client is not None:
+        await cache.client.aclose()
+        cache.client = None
+        cache.pool = None
+
 # -------------- application --------------
 def lifespan_factory(
     settings: (
@@ -48,6 +72,7 @@ def lifespan_factory(
         | ClientSideCacheSettings
         | RedisQueueSettings
         | RedisRateLimiterSettings
+        | RedisSessionSettings
         | EnvironmentSettings
         | MinioSettings
     ),
@@ -63,21 +88,63 @@ def lifespan_factory(
         app.state.initialization_complete = initialization_complete
 
         try:
-            # Initialize Redis if needed
-            if isinstance(settings, (RedisCacheSettings, RedisQueueSettings, RedisRateLimiterSettings)):
-                await redis.init()
+            # Initialize one Redis pool per configured role
+            redis_roles = [
+                role
+                for role, settings_type in (
+                    (RedisRole.CACHE, RedisCacheSettings),
+                    (RedisRole.RATE_LIMIT, RedisRateLimiterSettings),
+                    (RedisRole.QUEUE, RedisQueueSettings),
+                    (RedisRole.SESSION, RedisSessionSettings),
+                )
+                if isinstance(settings, settings_type)
+            ]
+            if redis_roles:
+                await redis_manager.init(*redis_roles)
+
+            if isinstance(settings, RedisCacheSettings):
+                await create_redis_cache_pool()
+                token_revocation.start()
+
+            if isinstance(settings, RedisRateLimiterSettings):
+                rate_limit_policies.start()
+
+            if isinstance(settings, DatabaseSettings):
+                replica_router.start()
+                start_pool_stats_logger()
 
             # Initialize MinIO if needed
             if isinstance(settings, MinioSettings):
-                minio.init()
+                await async_minio.init()
+
+            password_hasher.start_stats_logger()
 
             initialization_complete.set()
             yield
 
         finally:
+            if isinstance(settings, DatabaseSettings):
+                await stop_pool_stats_logger()
+                await replica_router.stop()
+
             # Close Redis connection
-            if isinstance(settings, (RedisCacheSettings, RedisQueueSettings, RedisRateLimiterSettings)):
-                await redis.close()
+            if isinstance(settings, RedisRateLimiterSettings):
+                await rate_limit_policies.stop()
+
+            if isinstance(settings, RedisCacheSettings):
+                await token_revocation.stop()
+                await close_redis_cache_pool()
+
+            if isinstance(
+                settings, (RedisCacheSettings, RedisQueueSettings, RedisRateLimiterSettings, RedisSessionSettings)
+            ):
+                await redis_manager.close()
+
+            if isinstance(settings, MinioSettings):
+                await async_minio.close()
+
+            await password_hasher.stop_stats_logger()
+            password_hasher.close()
 
     return lifespan
 
@@ -91,6 +158,7 @@ def create_application(
         | ClientSideCacheSettings
         | RedisQueueSettings
         | RedisRateLimiterSettings
+        | RedisSessionSettings
         | EnvironmentSettings
         | MinioSettings
     ),
@@ -116,7 +184,9 @@ def create_application(
         - RedisCacheSettings: Sets up event handlers for creating and closing a Redis cache pool.
         - ClientSideCacheSettings: Integrates middleware for client-side caching.
         - RedisQueueSettings: Sets up event handlers for creating and closing a Redis queue pool.
-        - RedisRateLimiterSettings: Sets up event handlers for creating and closing a Redis rate limiter pool.
+        - RedisRateLimiterSettings: Sets up event handlers for creating and closing a Redis rate limiter pool,
+          and middleware adding the `X-RateLimit-*` headers to responses.
+        - RedisSessionSettings: Sets up event handlers for creating and closing the Redis pool of session state.
         - EnvironmentSettings: Conditionally sets documentation URLs and integrates custom routes for API documentation
           based on the environment type.
         - MinioSettings: Sets up event handlers for creating and closing MinIO connections.
@@ -179,6 +249,9 @@ def create_application(
     if isinstance(settings, ClientSideCacheSettings):
         application.add_middleware(ClientCacheMiddleware, max_age=settings.CLIENT_CACHE_MAX_AGE)
 
+    if isinstance(settings, RedisRateLimiterSettings):
+        application.add_middleware(RateLimitHeadersMiddleware)
+
     if isinstance(settings, EnvironmentSettings):
         if settings.ENVIRONMENT != EnvironmentOption.PRODUCTION:
             docs_router = APIRouter()
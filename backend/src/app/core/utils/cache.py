@@ -1,18 +1,171 @@
+import asyncio
 import functools
 import json
+import logging
 import re
-from collections.abc import Callable
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
 from typing import Any
 
 from fastapi import Request, Response
 from fastapi.encoders import jsonable_encoder
 from redis.asyncio import ConnectionPool, Redis
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
+from ..db.database import local_session
+from ..db.redis import redis
 from ..exceptions.cache_exceptions import CacheIdentificationInferenceError, InvalidRequestError, MissingClientError
+from .cache_codec import codec
+from .local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
 
 pool: ConnectionPool | None = None
 client: Redis | None = None
 
+TAG_KEY_PREFIX = "cache:tag"
+LOCK_KEY_PREFIX = "cache:lock"
+LOCK_POLL_INTERVAL = 0.05
+
+# Delete the recompute lock only if we still own it (it may have expired and been taken by another worker)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+local_cache = LocalCache(max_size=settings.REDIS_CACHE_LOCAL_MAX_SIZE)
+_invalidation_listener: asyncio.Task | None = None
+_stats_logger: asyncio.Task | None = None
+
+# Recomputations running in this worker, keyed by cache key, so concurrent misses share one call
+_inflight: dict[str, asyncio.Future] = {}
+# Returned by a non-waiting recompute when another worker holds the lock
+_LOCKED = object()
+# Strong references to stale-while-revalidate refresh tasks (the event loop only keeps weak ones)
+_background_refreshes: set[asyncio.Task] = set()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of one `key_prefix` in this worker."""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+_stats: dict[str, CacheStats] = {}
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Return the hit/miss counters of this worker, keyed by the decorator's `key_prefix` template."""
+    return {key_prefix: asdict(stats) for key_prefix, stats in _stats.items()}
+
+
+async def _log_stats(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        stats = get_cache_stats()
+        if stats:
+            logger.info(f"Cache stats: {stats}")
+
+
+def start_stats_logger() -> None:
+    """Log `get_cache_stats()` every `REDIS_CACHE_STATS_INTERVAL` seconds from this worker."""
+    global _stats_logger
+    if settings.REDIS_CACHE_STATS_INTERVAL <= 0:
+        return
+    if _stats_logger is None or _stats_logger.done():
+        _stats_logger = asyncio.create_task(_log_stats(settings.REDIS_CACHE_STATS_INTERVAL))
+
+
+async def stop_stats_logger() -> None:
+    global _stats_logger
+    if _stats_logger is not None:
+        _stats_logger.cancel()
+        try:
+            await _stats_logger
+        except asyncio.CancelledError:
+            pass
+        _stats_logger = None
+
+
+def _evict_local(keys: list[str], patterns: list[str]) -> None:
+    local_cache.delete(*keys)
+    for pattern in patterns:
+        local_cache.delete_pattern(pattern)
+
+
+async def _publish_invalidation(keys: list[str], patterns: list[str]) -> None:
+    """Evict keys from this worker's L1 and tell every other worker to do the same."""
+    _evict_local(keys, patterns)
+    if client is None:
+        return
+    try:
+        message = json.dumps({"keys": keys, "patterns": patterns})
+        await client.publish(settings.REDIS_CACHE_INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        logger.error(f"Error publishing cache invalidation: {e}")
+
+
+async def _listen_for_invalidations() -> None:
+    """Evict L1 entries announced on the invalidation channel, reconnecting on errors.
+
+    Messages published while the subscription is down are lost, so the whole L1 is cleared
+    every time the subscription is (re)established.
+    """
+    retry_delay = 1.0
+    while True:
+        # Not `client`: its connections time out while the subscription waits for messages
+        pubsub_client = redis.get_pubsub_client()
+        if pubsub_client is None:
+            await asyncio.sleep(retry_delay)
+            continue
+        try:
+            async with pubsub_client.pubsub() as pubsub:
+                await pubsub.subscribe(settings.REDIS_CACHE_INVALIDATION_CHANNEL)
+                local_cache.clear()
+                retry_delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    _evict_local(data.get("keys", []), data.get("patterns", []))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener disconnected: {e}")
+            local_cache.clear()
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30.0)
+
+
+def start_invalidation_listener() -> None:
+    """Start the per-worker task that keeps the L1 cache consistent across workers."""
+    global _invalidation_listener
+    if _invalidation_listener is None or _invalidation_listener.done():
+        _invalidation_listener = asyncio.create_task(_listen_for_invalidations())
+
+
+async def stop_invalidation_listener() -> None:
+    global _invalidation_listener
+    if _invalidation_listener is not None:
+        _invalidation_listener.cancel()
+        try:
+            await _invalidation_listener
+        except asyncio.CancelledError:
+            pass
+        _invalidation_listener = None
+
 
 def _infer_resource_id(kwargs: dict[str, Any], resource_id_type: type | tuple[type, ...]) -> int | str:
     """Infer the resource ID from a dictionary of keyword arguments.
@@ -181,6 +334,274 @@ async def _delete_keys_by_pattern(pattern: str) -> None:
             await client.delete(*keys)
 
 
+async def _get_entry(cache_key: str) -> tuple[Any, float] | None:
+    """Read a cached entry from Redis as `(data, fresh_until)`.
+
+    Entries written before stale-while-revalidate existed hold the bare data; they are treated
+    as fresh until Redis expires them (see `CacheCodec.decode_entry`).
+    """
+    if client is None:
+        raise MissingClientError
+    cached_data = await client.get(cache_key)
+    if not cached_data:
+        return None
+    return codec.decode_entry(cached_data)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+async def _store_entry(cache_key: str, payload: bytes, expiration: int, tags: list[str] | None) -> None:
+    """Write a cache entry and register it under its tags, in one pipelined round trip.
+
+    The value is written with `SET ... EX` so it can never be left without a TTL. A tag set lives
+    at least as long as its longest-lived member: `EXPIRE NX` gives a new set a TTL and
+    `EXPIRE GT` only ever extends it (both need Redis >= 7.0).
+    """
+    if client is None:
+        raise MissingClientError
+
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.set(cache_key, payload, ex=expiration)
+        for tag in tags or []:
+            tag_key = _tag_key(tag)
+            pipe.sadd(tag_key, cache_key)
+            pipe.expire(tag_key, expiration, nx=True)
+            pipe.expire(tag_key, expiration, gt=True)
+        await pipe.execute()
+
+
+async def _invalidate_tags(tags: list[str]) -> list[str]:
+    """Delete every cache key registered under the given tags.
+
+    Costs two pipelined round trips (SMEMBERS, then DEL + SREM) and work proportional to the number
+    of affected keys, independent of the keyspace size. Members are removed with SREM rather than
+    deleting the tag set, so a key registered concurrently is not orphaned.
+
+    Returns
+    -------
+    List[str]
+        The cache keys that were deleted.
+    """
+    if client is None:
+        raise MissingClientError
+
+    tag_keys = [_tag_key(tag) for tag in tags]
+    async with client.pipeline(transaction=False) as pipe:
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        members_per_tag = await pipe.execute()
+
+    deleted_keys: list[str] = []
+    async with client.pipeline(transaction=False) as pipe:
+        for tag_key, members in zip(tag_keys, members_per_tag):
+            if not members:
+                continue
+            members = list(members)
+            pipe.delete(*members)
+            pipe.srem(tag_key, *members)
+            deleted_keys.extend(member.decode() if isinstance(member, bytes) else member for member in members)
+        if deleted_keys:
+            await pipe.execute()
+    return deleted_keys
+
+
+@dataclass(frozen=True)
+class _CacheConfig:
+    """Read-path settings of one `cache` decorator."""
+
+    stats: CacheStats
+    expiration: int
+    local_ttl: int | None
+    stale_while_revalidate: int
+    lock_timeout: int
+
+
+def _set_local(config: _CacheConfig, cache_key: str, data: Any, fresh_until: float) -> None:
+    if config.local_ttl is not None:
+        local_cache.set(cache_key, data, ttl=min(config.local_ttl, fresh_until - time.time()))
+
+
+async def _compute_with_lock(
+    config: _CacheConfig, cache_key: str, compute: Callable[[], Awaitable[Any]], wait: bool
+) -> Any:
+    """Run `compute` while holding the key's recompute lock.
+
+    If another worker holds it, return `_LOCKED` when `wait` is False; otherwise poll for the value
+    it stores and compute it ourselves if nothing arrives within `lock_timeout` seconds.
+    """
+    if client is None:
+        raise MissingClientError
+
+    lock_key = f"{LOCK_KEY_PREFIX}:{cache_key}"
+    token = uuid.uuid4().hex
+    acquired = await client.set(lock_key, token, nx=True, px=config.lock_timeout * 1000)
+    if not acquired:
+        if not wait:
+            return _LOCKED
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config.lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            cached_entry = await _get_entry(cache_key)
+            if cached_entry is not None and cached_entry[1] > time.time():
+                config.stats.coalesced += 1
+                return cached_entry[0]
+            if not await client.exists(lock_key):
+                break
+        acquired = await client.set(lock_key, token, nx=True, px=config.lock_timeout * 1000)
+
+    try:
+        return await compute()
+    finally:
+        if acquired:
+            await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+
+async def _single_flight(config: _CacheConfig, cache_key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Run `compute` at most once per key across the cluster.
+
+    Concurrent callers in this worker share one future; other workers are kept out by a short
+    Redis lock and wait (polling) for the value the lock holder stores. If the holder does not
+    deliver within `lock_timeout` seconds, the waiter computes the value itself.
+    """
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        try:
+            result = await asyncio.shield(inflight)
+            config.stats.coalesced += 1
+            return result
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+            # The leading request was cancelled (client went away): compute it ourselves
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        result = await _compute_with_lock(config, cache_key, compute, wait=True)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # mark as retrieved when nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+async def _refresh_entry(
+    config: _CacheConfig,
+    cache_key: str,
+    compute: Callable[[dict[str, Any]], Awaitable[Any]],
+    kwargs: dict[str, Any],
+    future: asyncio.Future,
+) -> None:
+    try:
+        async with AsyncExitStack() as stack:
+            refresh_kwargs = {
+                name: await stack.enter_async_context(local_session()) if isinstance(value, AsyncSession) else value
+                for name, value in kwargs.items()
+            }
+            result = await _compute_with_lock(config, cache_key, lambda: compute(refresh_kwargs), wait=False)
+        if result is not _LOCKED:
+            future.set_result(result)
+    except Exception as e:
+        logger.error(f"Background refresh of cache key {cache_key} failed: {e}")
+    finally:
+        # Unless the refresh succeeded, requests that joined it see a cancelled future and compute on their own
+        future.cancel()
+        _inflight.pop(cache_key, None)
+
+
+def _schedule_refresh(
+    config: _CacheConfig,
+    cache_key: str,
+    compute: Callable[[dict[str, Any]], Awaitable[Any]],
+    kwargs: dict[str, Any],
+) -> None:
+    """Refresh a stale entry in the background, once per key across the cluster.
+
+    The request's own database sessions are closed once the response is sent, so the refresh
+    runs with fresh sessions in place of every `AsyncSession` argument.
+    """
+    if cache_key in _inflight:
+        return
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+
+    task = asyncio.create_task(_refresh_entry(config, cache_key, compute, kwargs, future))
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+
+async def _read_through(
+    config: _CacheConfig,
+    cache_key: str,
+    compute: Callable[[dict[str, Any]], Awaitable[Any]],
+    kwargs: dict[str, Any],
+) -> Any:
+    """GET path of `cache`: L1, then Redis (serving stale entries while they refresh), then `compute`."""
+    if config.local_ttl is not None:
+        local_data = local_cache.get(cache_key)
+        if local_data is not None:
+            config.stats.local_hits += 1
+            return local_data
+
+    cached_entry = await _get_entry(cache_key)
+    if cached_entry is not None:
+        data, fresh_until = cached_entry
+        if fresh_until > time.time():
+            config.stats.redis_hits += 1
+            _set_local(config, cache_key, data, fresh_until)
+            return data
+
+        # Stale but inside the stale-while-revalidate window (Redis TTL guarantees it)
+        config.stats.stale_hits += 1
+        _schedule_refresh(config, cache_key, compute, kwargs)
+        return data
+
+    config.stats.misses += 1
+    return await _single_flight(config, cache_key, lambda: compute(kwargs))
+
+
+async def _invalidate(
+    cache_key: str,
+    kwargs: dict[str, Any],
+    to_invalidate_extra: dict[str, Any] | None,
+    pattern_to_invalidate_extra: list[str] | None,
+    tags_to_invalidate: list[str] | None,
+) -> None:
+    """Non-GET path of `cache`: delete the key and the extra keys, patterns and tags, everywhere."""
+    if client is None:
+        raise MissingClientError
+
+    invalidated_keys = [cache_key]
+    invalidated_patterns = []
+    if to_invalidate_extra is not None:
+        formatted_extra = _format_extra_data(to_invalidate_extra, kwargs)
+        for prefix, id in formatted_extra.items():
+            invalidated_keys.append(f"{prefix}:{id}")
+    await client.delete(*invalidated_keys)
+
+    if pattern_to_invalidate_extra is not None:
+        for pattern in pattern_to_invalidate_extra:
+            formatted_pattern = _format_prefix(pattern, kwargs)
+            invalidated_patterns.append(formatted_pattern + "*")
+            await _delete_keys_by_pattern(formatted_pattern + "*")
+
+    if tags_to_invalidate is not None:
+        formatted_tags = [_format_prefix(tag, kwargs) for tag in tags_to_invalidate]
+        invalidated_keys.extend(await _invalidate_tags(formatted_tags))
+
+    await _publish_invalidation(invalidated_keys, invalidated_patterns)
+
+
 def cache(
     key_prefix: str,
     resource_id_name: Any = None,
@@ -188,6 +609,11 @@ def cache(
     resource_id_type: type | tuple[type, ...] = int,
     to_invalidate_extra: dict[str, Any] | None = None,
     pattern_to_invalidate_extra: list[str] | None = None,
+    local_expiration: int | None = None,
+    tags: list[str] | None = None,
+    tags_to_invalidate: list[str] | None = None,
+    stale_while_revalidate: int = 0,
+    lock_timeout: int = 10,
 ) -> Callable:
     """Cache decorator for FastAPI endpoints.
 
@@ -213,6 +639,28 @@ def cache(
     pattern_to_invalidate_extra: List[str] | None, optional
         A list of string patterns for cache keys that should be invalidated when the decorated function is called.
         This allows for bulk invalidation of cache keys based on a matching pattern.
+        Every pattern costs a full SCAN of the keyspace; prefer `tags` / `tags_to_invalidate`.
+    tags: List[str] | None, optional
+        Tag templates (e.g. "project:{project_uuid}") formatted with the endpoint's arguments. On GET the
+        cached key is registered in each tag's set so it can later be invalidated as a group.
+    tags_to_invalidate: List[str] | None, optional
+        Tag templates whose registered keys are deleted when the decorated function is called with a
+        method other than GET. The cost scales with the number of affected keys, not the keyspace size.
+    local_expiration: int | None, optional
+        Enables the per-worker in-process LRU (L1) in front of Redis and sets how long, in seconds,
+        an entry may be served from it (capped by `expiration`). Defaults to None (L1 disabled).
+        Invalidations from non-GET calls are broadcast over Redis pub/sub so every worker evicts
+        its L1 copy; staleness is bounded by the pub/sub delivery delay, or by `local_expiration`
+        if a message is lost.
+    stale_while_revalidate: int, optional
+        How long, in seconds, an entry may still be served after `expiration` while it is refreshed
+        in the background. The first request after expiry gets the stale value immediately and
+        schedules one refresh for the whole cluster. Defaults to 0 (expired entries are recomputed
+        synchronously).
+    lock_timeout: int, optional
+        Lifetime in seconds of the Redis lock that lets only one worker recompute a missing entry.
+        Requests that miss while another worker holds it wait for that value up to this long, then
+        compute it themselves. It should exceed the endpoint's normal response time. Defaults to 10.
 
     Returns
     -------
@@ -275,13 +723,45 @@ def cache(
       the cache for user-specific item lists, while `pattern_to_invalidate_extra` allows bulk invalidation of all keys
       matching the pattern 'user_*_items:*', covering all users.
 
+    Tag Based Invalidation
+    -------------
+    ```python
+    @app.get("/projects/{project_uuid}/documents")
+    @cache(key_prefix="project_documents", resource_id_name="project_uuid", tags=["project:{project_uuid}"])
+    async def read_project_documents(request: Request, project_uuid: str):
+        ...
+
+
+    @app.patch("/projects/{project_uuid}")
+    @cache(key_prefix="project", resource_id_name="project_uuid", tags_to_invalidate=["project:{project_uuid}"])
+    async def update_project(request: Request, project_uuid: str):
+        # Deletes every key cached with the tag "project:<uuid>", whatever its prefix
+        ...
+    ```
+
     Note
     ----
     - resource_id_type is used only if resource_id is not passed.
-    - `to_invalidate_extra` and `pattern_to_invalidate_extra` are used for cache invalidation on methods other than GET.
+    - `to_invalidate_extra`, `pattern_to_invalidate_extra` and `tags_to_invalidate` are used for cache invalidation
+      on methods other than GET.
     - Using `pattern_to_invalidate_extra` can be resource-intensive on large datasets. Use it judiciously and
       consider the potential impact on Redis performance.
+    - Hit/miss counters per `key_prefix` are available from `get_cache_stats()` and logged
+      every `REDIS_CACHE_STATS_INTERVAL` seconds.
+    - Values are stored in the compact binary format of `cache_codec` (orjson or msgpack, zlib above
+      `REDIS_CACHE_COMPRESS_MIN_SIZE`), written with one pipelined `SET ... EX` together with their tags.
+    - Misses are single-flight: concurrent misses on one key in a worker share one call of the endpoint,
+      and a short Redis lock keeps other workers from recomputing the same key at the same time.
+    - Background refreshes run after the response is sent, so `AsyncSession` arguments are replaced by new
+      sessions; other dependencies are reused as they are and must stay valid after the request.
     """
+    config = _CacheConfig(
+        stats=_stats.setdefault(key_prefix, CacheStats()),
+        expiration=expiration,
+        local_ttl=min(local_expiration, expiration) if local_expiration is not None else None,
+        stale_while_revalidate=stale_while_revalidate,
+        lock_timeout=lock_timeout,
+    )
 
     def wrapper(func: Callable) -> Callable:
         @functools.wraps(func)
@@ -296,39 +776,29 @@ def cache(
 
             formatted_key_prefix = _format_prefix(key_prefix, kwargs)
             cache_key = f"{formatted_key_prefix}:{resource_id}"
-            if request.method == "GET":
-                if to_invalidate_extra is not None or pattern_to_invalidate_extra is not None:
-                    raise InvalidRequestError
-
-                cached_data = await client.get(cache_key)
-                if cached_data:
-                    return json.loads(cached_data.decode())
-
-            result = await func(request, *args, **kwargs)
-
-            if request.method == "GET":
+            if request.method != "GET":
+                result = await func(request, *args, **kwargs)
+                config.stats.invalidations += 1
+                await _invalidate(
+                    cache_key, kwargs, to_invalidate_extra, pattern_to_invalidate_extra, tags_to_invalidate
+                )
+                return result
+
+            invalidates = (to_invalidate_extra, pattern_to_invalidate_extra, tags_to_invalidate)
+            if any(option is not None for option in invalidates):
+                raise InvalidRequestError
+
+            async def compute(call_kwargs: dict[str, Any]) -> Any:
+                result = await func(request, *args, **call_kwargs)
                 serializable_data = jsonable_encoder(result)
-                serialized_data = json.dumps(serializable_data)
-
-                await client.set(cache_key, serialized_data)
-                await client.expire(cache_key, expiration)
-
-                serialized_data = json.loads(serialized_data)
-
-            else:
-                await client.delete(cache_key)
-                if to_invalidate_extra is not None:
-                    formatted_extra = _format_extra_data(to_invalidate_extra, kwargs)
-                    for prefix, id in formatted_extra.items():
-                        extra_cache_key = f"{prefix}:{id}"
-                        await client.delete(extra_cache_key)
-
-                if pattern_to_invalidate_extra is not None:
-                    for pattern in pattern_to_invalidate_extra:
-                        formatted_pattern = _format_prefix(pattern, kwargs)
-                        await _delete_keys_by_pattern(formatted_pattern + "*")
-
-            return result
+                fresh_until = time.time() + expiration
+                payload = codec.encode_entry(serializable_data, fresh_until)
+                formatted_tags = [_format_prefix(tag, kwargs) for tag in tags] if tags is not None else None
+                await _store_entry(cache_key, payload, expiration + stale_while_revalidate, formatted_tags)
+                _set_local(config, cache_key, serializable_data, fresh_until)
+                return result
+
+            return await _read_through(config, cache_key, compute, kwargs)
 
         return inner
 
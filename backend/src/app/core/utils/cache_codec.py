@@ -0,0 +1,97 @@
+import json
+import zlib
+from typing import Any
+
+import msgpack
+import orjson
+
+from ..config import settings
+
+# Header byte layout: low bits select the codec, COMPRESSED_FLAG marks a zlib-compressed body and
+# ENTRY_FLAG a `[data, fresh_until]` cache entry. Every header is below 0x20, so it can never be
+# mistaken for the first byte of a plain JSON document written by older versions of the cache decorator.
+JSON_CODEC = 0x01
+MSGPACK_CODEC = 0x02
+COMPRESSED_FLAG = 0x08
+ENTRY_FLAG = 0x10
+CODEC_MASK = 0x07
+
+_CODECS = {"json": JSON_CODEC, "msgpack": MSGPACK_CODEC}
+
+
+class CacheCodec:
+    """Serialize cache payloads to compact bytes and back.
+
+    Values must already be JSON compatible (the output of `jsonable_encoder`). They are encoded
+    with orjson or msgpack and, when the encoded body reaches `compress_min_size` bytes,
+    compressed with zlib. A one byte header records how the body was produced, so entries written
+    with another codec or compression setting stay readable after a configuration change.
+
+    Parameters
+    ----------
+    codec: str
+        "json" (orjson) or "msgpack".
+    compress_min_size: int
+        Bodies of at least this many bytes are compressed. 0 disables compression.
+    compress_level: int
+        zlib compression level (1 is fastest, 9 smallest).
+    """
+
+    def __init__(self, codec: str = "json", compress_min_size: int = 1024, compress_level: int = 1) -> None:
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown cache codec {codec!r}, expected one of {sorted(_CODECS)}")
+        self.codec_id = _CODECS[codec]
+        self.compress_min_size = compress_min_size
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> bytes:
+        return self._encode(value, self.codec_id)
+
+    def encode_entry(self, data: Any, fresh_until: float) -> bytes:
+        """Encode a cache entry: the data and the time until which it is fresh."""
+        return self._encode([data, fresh_until], self.codec_id | ENTRY_FLAG)
+
+    def _encode(self, value: Any, header: int) -> bytes:
+        if self.codec_id == MSGPACK_CODEC:
+            body = msgpack.packb(value)
+        else:
+            body = orjson.dumps(value)
+
+        if self.compress_min_size and len(body) >= self.compress_min_size:
+            header |= COMPRESSED_FLAG
+            body = zlib.compress(body, self.compress_level)
+        return bytes((header,)) + body
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        header = payload[0]
+        if header >= 0x20:
+            # Plain JSON written before the codec layer existed
+            return json.loads(payload)
+
+        body = payload[1:]
+        if header & COMPRESSED_FLAG:
+            body = zlib.decompress(body)
+        if header & CODEC_MASK == MSGPACK_CODEC:
+            return msgpack.unpackb(body)
+        return orjson.loads(body)
+
+    @classmethod
+    def decode_entry(cls, payload: bytes) -> tuple[Any, float]:
+        """Decode a payload as `(data, fresh_until)`.
+
+        Payloads not written by `encode_entry` hold the bare data and are fresh until Redis
+        expires them.
+        """
+        value = cls.decode(payload)
+        if payload[0] < 0x20 and payload[0] & ENTRY_FLAG:
+            data, fresh_until = value
+            return data, fresh_until
+        return value, float("inf")
+
+
+codec = CacheCodec(
+    codec=settings.REDIS_CACHE_CODEC,
+    compress_min_size=settings.REDIS_CACHE_COMPRESS_MIN_SIZE,
+    compress_level=settings.REDIS_CACHE_COMPRESS_LEVEL,
+)
@@ -0,0 +1,93 @@
+import hashlib
+import hmac
+import ipaddress
+import logging
+
+from starlette.requests import Request
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+def parse_networks(value: str) -> list[IPNetwork]:
+    """Parse a comma separated list of addresses or CIDR blocks, skipping invalid entries."""
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trusted proxy entry '{entry}'")
+    return networks
+
+
+def _parse_ip(value: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    try:
+        ip = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        return ip.ipv4_mapped
+    return ip
+
+
+def resolve_client_ip(
+    remote_addr: str | None, forwarded_for: str | None, trusted_proxies: list[IPNetwork]
+) -> str | None:
+    """Address of the client that reached the first trusted proxy.
+
+    `X-Forwarded-For` is only honoured when the direct peer is a trusted proxy. It is then read
+    from right to left, skipping the trusted proxies that appended to it, so a client cannot spoof
+    its address by sending the header itself (nginx's `$proxy_add_x_forwarded_for` appends the
+    real peer after whatever the client sent).
+    """
+    ip = _parse_ip(remote_addr) if remote_addr else None
+    if ip is None:
+        return None
+
+    if forwarded_for and any(ip in network for network in trusted_proxies):
+        for hop in reversed(forwarded_for.split(",")):
+            hop_ip = _parse_ip(hop)
+            if hop_ip is None:
+                break
+            ip = hop_ip
+            if not any(hop_ip in network for network in trusted_proxies):
+                break
+    return str(ip)
+
+
+def client_network(client_ip: str, ipv4_prefix: int = 32, ipv6_prefix: int = 64) -> str:
+    """The block a client address is counted under, e.g. its /64 for IPv6.
+
+    An IPv6 user typically controls a whole /64 (often a /56 or /48), so limiting single addresses
+    would let them rotate through billions of keys.
+    """
+    ip = ipaddress.ip_address(client_ip)
+    prefix = ipv4_prefix if ip.version == 4 else ipv6_prefix
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+def client_key(network: str, secret: str) -> str:
+    """Keyed digest of a client block: the same on every worker and node, and no raw IP in Redis."""
+    return hmac.new(secret.encode(), network.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+_trusted_proxies = parse_networks(settings.RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def get_client_identity(request: Request) -> str:
+    """Stable identity of an anonymous caller, used as its rate limit key."""
+    client_ip = resolve_client_ip(
+        request.client.host if request.client else None,
+        request.headers.get("X-Forwarded-For"),
+        _trusted_proxies,
+    )
+    if client_ip is None:
+        return "anon:unknown"
+    network = client_network(client_ip, settings.RATE_LIMIT_IPV4_PREFIX, settings.RATE_LIMIT_IPV6_PREFIX)
+    return f"anon:{client_key(network, settings.SECRET_KEY)}"
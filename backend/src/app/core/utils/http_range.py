@@ -0,0 +1,89 @@
+from typing import NamedTuple
+
+
+class ByteRange(NamedTuple):
+    """An inclusive byte range inside an object of known size."""
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+def parse_range_header(range_header: str | None, size: int) -> ByteRange | None:
+    """Parse an HTTP ``Range`` header for a single byte range.
+
+    Parameters
+    ----------
+    range_header: str | None
+        Raw value of the ``Range`` request header.
+    size: int
+        Total size of the object in bytes.
+
+    Returns
+    -------
+    ByteRange | None
+        The requested range, clamped to the object size, or None when the header is absent,
+        malformed, not in bytes or asks for several ranges. RFC 9110 allows a server to ignore
+        the header in those cases and send the full representation.
+
+    Raises
+    ------
+    ValueError
+        If the range is syntactically valid but cannot be satisfied (the caller answers 416).
+
+    Example
+    -------
+    >>> parse_range_header("bytes=0-99", 1000)
+    ByteRange(start=0, end=99)
+    >>> parse_range_header("bytes=-100", 1000)
+    ByteRange(start=900, end=999)
+    """
+    if not range_header:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not ranges or "," in ranges:
+        return None
+
+    first, sep, last = ranges.strip().partition("-")
+    if not sep:
+        return None
+    first, last = first.strip(), last.strip()
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        if not last:
+            return None
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return ByteRange(max(size - suffix, 0), size - 1)
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    return ByteRange(start, min(end, size - 1))
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Check an ``If-None-Match`` header against an ETag (weak comparison, RFC 9110 13.1.2)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare_etag = etag.removeprefix("W/").strip('"')
+    for candidate in header.split(","):
+        if candidate.strip().removeprefix("W/").strip('"') == bare_etag:
+            return True
+    return False
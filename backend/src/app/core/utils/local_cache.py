@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any
+
+
+class LocalCache:
+    """In-process LRU cache with a size bound and per-entry expiry.
+
+    Used as a per-worker L1 in front of Redis. It is not shared between worker processes and
+    is not thread safe; it is meant to be touched from the event loop only.
+
+    Parameters
+    ----------
+    max_size: int
+        Maximum number of entries; the least recently used entry is evicted beyond it.
+    ttl: float
+        Default time to live in seconds for entries set without an explicit ttl.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or `default` if the key is missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value; a non-positive ttl means the value is not cached at all."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        """Delete keys matching a glob pattern (same syntax as Redis `MATCH`)."""
+        for key in [key for key in self._data if fnmatchcase(key, pattern)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import bcrypt
+
+from ..config import settings
+from ..exceptions.http_exceptions import RateLimitException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HashStats:
+    """Counters and latencies (seconds) of one bcrypt operation in this worker."""
+
+    count: int = 0
+    rejected: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    total_wait: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+
+def hash_password_sync(password: str, rounds: int | None = None) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)).decode()
+
+
+def get_hash_rounds(hashed_password: str) -> int | None:
+    """Cost factor of a bcrypt hash (`$2b$12$...` -> 12), or None if it is not a bcrypt hash."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so `PASSWORD_HASH_WORKERS` threads hash in parallel while the loop keeps
+    serving other requests. At most `PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE` calls may be in
+    flight per worker process; beyond that the call is rejected with a 429 instead of queueing
+    without bound (a login burst would otherwise grow latency for everyone).
+
+    `start_stats_logger` logs `get_stats()` every `PASSWORD_HASH_STATS_INTERVAL` seconds.
+    """
+
+    _instance: "PasswordHasher | None" = None
+    _executor: ThreadPoolExecutor | None = None
+    _stats_logger: asyncio.Task | None = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._stats = {"hash": HashStats(), "verify": HashStats()}
+            cls._instance._in_flight = 0
+        return cls._instance
+
+    @property
+    def capacity(self) -> int:
+        return settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        stats = self._stats[operation]
+        if self._in_flight >= self.capacity:
+            stats.rejected += 1
+            logger.warning(f"Password {operation} rejected: hashing pool saturated")
+            raise RateLimitException("Too many authentication requests. Please try again later.")
+
+        def timed() -> tuple[Any, float]:
+            started_at = time.perf_counter()
+            return func(*args), started_at
+
+        self._in_flight += 1
+        queued_at = time.perf_counter()
+        try:
+            result, started_at = await asyncio.get_running_loop().run_in_executor(self._get_executor(), timed)
+        finally:
+            self._in_flight -= 1
+
+        elapsed = time.perf_counter() - started_at
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        stats.total_wait += started_at - queued_at
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password_sync, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", bcrypt.checkpw, password.encode(), hashed_password.encode())
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """True when a hash was made with a different cost factor than `BCRYPT_ROUNDS`."""
+        return get_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Counters and latencies of this worker, including the current number of calls in flight."""
+        return {
+            operation: {**asdict(stats), "avg_time": stats.avg_time, "in_flight": self._in_flight}
+            for operation, stats in self._stats.items()
+        }
+
+    async def _log_stats(self, interval: float) -> None:
+        rejected = 0
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.get_stats()
+            total_rejected = sum(operation["rejected"] for operation in stats.values())
+            # New rejections mean logins were refused with a 429: the pool is too small for the load
+            log = logger.warning if total_rejected > rejected else logger.info
+            rejected = total_rejected
+            log(f"Password hashing: {stats}")
+
+    def start_stats_logger(self) -> None:
+        if settings.PASSWORD_HASH_STATS_INTERVAL <= 0:
+            return
+        if self._stats_logger is None or self._stats_logger.done():
+            self._stats_logger = asyncio.create_task(self._log_stats(settings.PASSWORD_HASH_STATS_INTERVAL))
+
+    async def stop_stats_logger(self) -> None:
+        if self._stats_logger is not None:
+            self._stats_logger.cancel()
+            try:
+                await self._stats_logger
+            except asyncio.CancelledError:
+                pass
+            self._stats_logger = None
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,63 @@
+from typing import Any
+
+WILDCARD = "*"
+
+
+class _Node:
+    __slots__ = ("children", "value", "wildcard")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_Node"] = {}
+        self.value: Any = None
+        self.wildcard: Any = None
+
+
+def split_path(path: str) -> list[str]:
+    return [segment for segment in path.strip("/").split("/") if segment]
+
+
+class PathTrie:
+    """Prefix trie over URL path segments with trailing wildcards.
+
+    `/api/v1/items/{item_id}` matches that path exactly (route templates are matched literally),
+    while `/api/v1/admin/*` matches every path with at least one more segment below
+    `/api/v1/admin`. An exact entry wins over wildcards and a deeper wildcard wins over a shallower
+    one. A lookup costs one dict access per path segment, whatever the number of entries.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self.count = 0
+
+    def insert(self, path: str, value: Any) -> None:
+        segments = split_path(path)
+        is_wildcard = bool(segments) and segments[-1] == WILDCARD
+        if is_wildcard:
+            segments = segments[:-1]
+
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _Node())
+
+        if is_wildcard:
+            node.wildcard = value
+        else:
+            node.value = value
+        self.count += 1
+
+    def match(self, path: str) -> tuple[Any, bool] | None:
+        """Return `(value, is_exact)` of the best entry for a path, or None if nothing matches."""
+        segments = split_path(path)
+        best = None
+        node = self._root
+        for segment in segments:
+            if node.wildcard is not None:
+                best = node.wildcard
+            node = node.children.get(segment)
+            if node is None:
+                break
+        else:
+            if node.value is not None:
+                return node.value, True
+
+        return (best, False) if best is not None else None
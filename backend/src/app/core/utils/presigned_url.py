@@ -0,0 +1,112 @@
+import logging
+import time
+from collections.abc import Iterable
+
+from ..config import settings
+from ..db.minio import async_minio
+from ..db.redis import redis
+from .local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "presigned_url"
+
+
+class PresignedUrlCache:
+    """Two level cache (per-worker memory + Redis) for presigned download URLs.
+
+    URLs are keyed by object name and signed for ``MINIO_PRESIGNED_URL_EXPIRE`` seconds.
+    Both levels drop an entry ``MINIO_PRESIGNED_URL_CACHE_MARGIN`` seconds before the signature
+    expires, so a URL handed to a client always has at least that long left to be used.
+    Redis stores ``"<signature expiry epoch>|<url>"`` so an entry copied into memory from Redis
+    keeps its real remaining lifetime.
+    """
+
+    _instance: "PresignedUrlCache | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._local = LocalCache(max_size=settings.MINIO_PRESIGNED_URL_CACHE_SIZE)
+        return cls._instance
+
+    @staticmethod
+    def _key(object_name: str) -> str:
+        return f"{KEY_PREFIX}:{object_name}"
+
+    @staticmethod
+    def _usable_for(expires_at: float) -> float:
+        """Seconds an URL expiring at `expires_at` may still be served from cache."""
+        return expires_at - settings.MINIO_PRESIGNED_URL_CACHE_MARGIN - time.time()
+
+    async def get_url(self, object_name: str) -> str | None:
+        """Get a presigned URL for one object (cached)."""
+        urls = await self.get_urls([object_name])
+        return urls.get(object_name)
+
+    async def get_urls(self, object_names: Iterable[str]) -> dict[str, str]:
+        """Get presigned URLs for a batch of objects.
+
+        Memory hits are served directly, the remaining names are looked up with a single
+        Redis MGET, and whatever is still missing is signed in one pool call and written back
+        with one pipeline. Objects that cannot be signed are left out of the result.
+        """
+        names = list(dict.fromkeys(object_names))
+        urls: dict[str, str] = {}
+        missing: list[str] = []
+        for name in names:
+            url = self._local.get(name)
+            if url is None:
+                missing.append(name)
+            else:
+                urls[name] = url
+        if not missing:
+            return urls
+
+        client = redis.get_client()
+        if client is not None:
+            try:
+                values = await client.mget([self._key(name) for name in missing])
+            except Exception as e:
+                logger.warning(f"Error reading presigned urls from Redis: {e}")
+                values = [None] * len(missing)
+            still_missing = []
+            for name, value in zip(missing, values):
+                if value:
+                    expires_at, _, url = value.partition("|")
+                    ttl = self._usable_for(float(expires_at))
+                    if ttl > 0:
+                        urls[name] = url
+                        self._local.set(name, url, ttl=ttl)
+                        continue
+                still_missing.append(name)
+            missing = still_missing
+        if not missing:
+            return urls
+
+        expire = settings.MINIO_PRESIGNED_URL_EXPIRE
+        expires_at = time.time() + expire
+        signed = await async_minio.get_presigned_urls(missing, expires=expire)
+        ttl = self._usable_for(expires_at)
+        for name, url in signed.items():
+            urls[name] = url
+            self._local.set(name, url, ttl=ttl)
+
+        if client is not None and signed and ttl >= 1:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    for name, url in signed.items():
+                        pipe.set(self._key(name), f"{expires_at}|{url}", ex=int(ttl))
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Error caching presigned urls in Redis: {e}")
+        return urls
+
+    async def invalidate(self, object_name: str) -> None:
+        """Forget the URL of an object (call after the object is deleted or replaced)."""
+        self._local.delete(object_name)
+        await redis.delete(self._key(object_name))
+
+
+# Singleton instance
+presigned_url_cache = PresignedUrlCache()
@@ -0,0 +1,94 @@
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from ...schemas.user import UserReadInternal
+from ..config import settings
+from . import cache
+from .cache_codec import codec
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "principal"
+
+
+class PrincipalCache:
+    """Cache of authenticated users (`UserReadInternal`) keyed by token subject.
+
+    Entries live in the per-worker L1 of the cache decorator (`cache.local_cache`) for
+    `PRINCIPAL_CACHE_LOCAL_EXPIRE` seconds and in Redis for `PRINCIPAL_CACHE_EXPIRE` seconds.
+    Invalidations go through the decorator's pub/sub channel, so every worker drops its copy.
+    A read that races with an update may re-cache the old row; such an entry lives at most
+    `PRINCIPAL_CACHE_EXPIRE` seconds. Only active, non-deleted users are cached; without a Redis
+    connection nothing is cached, since other workers could not be told to evict.
+    """
+
+    _instance: "PrincipalCache | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @staticmethod
+    def _key(subject: str) -> str:
+        return f"{KEY_PREFIX}:{subject}"
+
+    async def get(self, subject: str) -> UserReadInternal | None:
+        """Return the cached user of a token subject (username or email), or None."""
+        key = self._key(subject)
+        user = cache.local_cache.get(key)
+        if user is not None:
+            return user
+        if cache.client is None:
+            return None
+
+        try:
+            cached_data = await cache.client.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading principal {subject} from Redis: {e}")
+            return None
+        if not cached_data:
+            return None
+
+        user = UserReadInternal.model_validate(codec.decode(cached_data))
+        cache.local_cache.set(key, user, ttl=settings.PRINCIPAL_CACHE_LOCAL_EXPIRE)
+        return user
+
+    async def set(self, subject: str, user: UserReadInternal) -> None:
+        if cache.client is None or not user.is_active or user.is_deleted:
+            return
+
+        key = self._key(subject)
+        try:
+            await cache.client.set(key, codec.encode(user.model_dump(mode="json")), ex=settings.PRINCIPAL_CACHE_EXPIRE)
+        except Exception as e:
+            logger.warning(f"Error caching principal {subject} in Redis: {e}")
+            return
+        cache.local_cache.set(key, user, ttl=settings.PRINCIPAL_CACHE_LOCAL_EXPIRE)
+
+    async def invalidate(self, *subjects: str | None) -> None:
+        """Drop the cached users of the given subjects on every worker and in Redis."""
+        keys = [self._key(subject) for subject in subjects if subject]
+        if not keys:
+            return
+        cache.local_cache.delete(*keys)
+        if cache.client is None:
+            return
+        try:
+            await cache.client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Error deleting principals {keys} from Redis: {e}")
+        await cache._publish_invalidation(keys, [])
+
+    async def invalidate_user(self, user: Mapping[str, Any] | UserReadInternal | None) -> None:
+        """Drop a user's cached principal under every subject a token can carry (username and email)."""
+        if user is None:
+            return
+        if isinstance(user, UserReadInternal):
+            user = user.model_dump()
+        await self.invalidate(user.get("username"), user.get("email"))
+
+
+# Singleton instance
+principal_cache = PrincipalCache()
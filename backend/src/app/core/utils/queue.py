@@ -5,7 +5,7 @@ from celery import Celery
 from celery.result import AsyncResult
 
 from ..config import settings
-from ..db.redis import redis
+from ..db.redis import redis_queue_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +26,14 @@ class RedisQueue:
         """Khởi tạo Celery app."""
         if not self._celery:
             try:
-                if not redis.is_available():
+                if not redis_queue_client.is_available():
                     logger.warning("Redis is not available, queue initialization skipped")
                     return
 
                 self._celery = Celery(
                     'tasks',
-                    broker=f'redis://{settings.REDIS_QUEUE_HOST}:{settings.REDIS_QUEUE_PORT}/0',
-                    backend=f'redis://{settings.REDIS_QUEUE_HOST}:{settings.REDIS_QUEUE_PORT}/1'
+                    broker=f'{settings.REDIS_QUEUE_URL}/0',
+                    backend=f'{settings.REDIS_QUEUE_URL}/1'
                 )
                 self._is_available = True
                 logger.info("Celery app initialized successfully")
@@ -57,7 +57,7 @@ class RedisQueue:
     
     def is_available(self) -> bool:
         """Kiểm tra xem queue có khả dụng không."""
-        return self._is_available and redis.is_available()
+        return self._is_available and redis_queue_client.is_available()
     
     def register_function(self, func: Callable, name: str | None = None) -> None:
         """
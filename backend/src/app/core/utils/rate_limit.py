@@ -1,60 +1,213 @@
-from datetime import UTC, datetime
+import asyncio
+import math
+import time
+from dataclasses import dataclass
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.logger import logging
 from ...schemas.rate_limit import sanitize_path
-from ..db.redis  import redis
+from ..config import settings
+from ..db.redis import redis_rate_limit
+from .local_cache import LocalCache
 
 logger = logging.getLogger(__name__)
 
+# GCRA (generic cell rate algorithm). The key holds the "theoretical arrival time" (TAT, in
+# microseconds of Redis server time) at which the client's quota is fully restored. Each request
+# moves it forward by period / limit; a request is rejected when that would put the TAT more than
+# one period ahead of now. This allows `limit` requests per any sliding `period` with no 2x burst at
+# window edges, in one atomic round trip, and the key always expires when the quota is full again.
+#
+# ARGV: limit, period (seconds), cells wanted. Grants as many of the wanted cells as the quota
+# allows. Returns {granted, remaining, reset_after_us, retry_after_us}.
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2]) * 1000000
+local wanted = tonumber(ARGV[3])
+local interval = period / limit
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+
+local tat = tonumber(redis.call("GET", KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+-- the epsilon keeps float error from turning 2.0 into 1.999...
+local available = math.floor((now + period - tat) / interval + 1e-6)
+if available < 1 then
+    return {0, 0, math.ceil(tat - now), math.ceil(tat + interval - period - now)}
+end
+
+local granted = math.min(wanted, available)
+local new_tat = tat + granted * interval
+local reset_after = new_tat - now
+redis.call("SET", KEYS[1], string.format("%.0f", new_tat), "PX", math.max(math.ceil(reset_after / 1000), 1))
+return {granted, available - granted, math.ceil(reset_after), 0}
+"""
+
+
+@dataclass
+class _Lease:
+    """Cells taken from Redis in one chunk and spent locally by this worker."""
+
+    tokens: int
+    remaining: int
+    reset_at: float
+    limited: bool = False
+    retry_after: int = 0
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check, as exposed in the `X-RateLimit-*` headers.
+
+    `reset` is the number of seconds until the full quota is available again and `retry_after`
+    the number of seconds until the next request would be allowed (0 when this one was).
+    """
+
+    limited: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int = 0
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset),
+        }
+        if self.limited:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
 
 class RateLimiter:
+    """GCRA rate limiter in Redis with a per-worker pre-filter for high limits.
+
+    With a limit of at least `2 / RATE_LIMIT_LEASE_FRACTION` per period, a worker does not call
+    Redis for every request: it takes a chunk of `limit * RATE_LIMIT_LEASE_FRACTION` cells (at most
+    `RATE_LIMIT_LEASE_MAX`) from the GCRA key in one script call and spends it in memory for up to
+    `RATE_LIMIT_LEASE_TTL` seconds. Redis stays the authority: the next chunk is only granted if the
+    quota allows it, and each grant refreshes the worker's view of the remaining quota. A rejection
+    is also remembered locally until the retry time (capped at the lease TTL), so a client that is
+    over its limit does not cost a round trip per request either.
+
+    Trade-offs, per key:
+    - Overshoot: cells are charged when leased but may be spent up to one lease TTL later, so in
+      any window of `period` seconds at most `limit + workers * chunk` requests are admitted.
+    - Undershoot: cells left in an expired lease are not returned, and cells leased by one worker
+      cannot be used by another, so a client may be rejected slightly before its limit.
+    Lower limits always go to Redis, where the check is exact.
+    """
+
     _instance: Optional["RateLimiter"] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._leases = LocalCache(max_size=settings.RATE_LIMIT_LEASE_CACHE_SIZE)
+            cls._instance._pending = {}
         return cls._instance
 
     async def health_check(self) -> bool:
         """Kiểm tra kết nối Redis."""
-        return await redis.health_check()
-
-    async def is_rate_limited(self, db: AsyncSession, user_id: int, path: str, limit: int, period: int) -> bool:
-        """Kiểm tra rate limit cho user."""
-        if not redis.is_available():
+        return await redis_rate_limit.health_check()
+
+    @staticmethod
+    def _lease_size(limit: int) -> int:
+        return min(int(limit * settings.RATE_LIMIT_LEASE_FRACTION), settings.RATE_LIMIT_LEASE_MAX)
+
+    def _spend_lease(self, key: str, limit: int) -> RateLimitResult | None:
+        lease = self._leases.get(key)
+        if lease is None:
+            return None
+        reset = max(math.ceil(lease.reset_at - time.monotonic()), 0)
+        if lease.limited:
+            return RateLimitResult(limited=True, limit=limit, remaining=0, reset=reset, retry_after=lease.retry_after)
+        if lease.tokens <= 0:
+            return None
+        lease.tokens -= 1
+        return RateLimitResult(limited=False, limit=limit, remaining=lease.remaining + lease.tokens, reset=reset)
+
+    async def hit(self, user_id: int | str, path: str, limit: int, period: int) -> RateLimitResult | None:
+        """Đếm một request của user trên path và trả về kết quả, hoặc None nếu Redis không khả dụng."""
+        sanitized_path = sanitize_path(path)
+        key = f"ratelimit:{user_id}:{sanitized_path}"
+
+        lease_size = self._lease_size(limit)
+        if lease_size <= 1:
+            return await self._take(key, limit, period, 1)
+
+        while True:
+            result = self._spend_lease(key, limit)
+            if result is not None:
+                return result
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            # Another request of this worker is already leasing for this key; share its lease
+            await asyncio.shield(pending)
+
+        pending = self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            return await self._take(key, limit, period, lease_size)
+        finally:
+            del self._pending[key]
+            pending.set_result(None)
+
+    async def _take(self, key: str, limit: int, period: int, cells: int) -> RateLimitResult | None:
+        """Take up to `cells` from the GCRA key, spend one and keep the rest as this worker's lease."""
+        if not redis_rate_limit.is_available():
             logger.warning("Redis is not available, rate limiting is disabled")
-            return False
+            return None
 
-        client = redis.get_client()
+        client = redis_rate_limit.get_client()
         if not client:
             logger.warning("Redis client is not available, rate limiting is disabled")
-            return False
-
-        current_timestamp = int(datetime.now(UTC).timestamp())
-        window_start = current_timestamp - (current_timestamp % period)
-
-        sanitized_path = sanitize_path(path)
-        key = f"ratelimit:{user_id}:{sanitized_path}:{window_start}"
+            return None
 
         try:
-            current_count = await client.incr(key)
-            if current_count == 1:
-                await client.expire(key, period)
-
-            if current_count > limit:
-                logger.info(f"Rate limit exceeded for user {user_id} on path {path}")
-                return True
-
+            granted, remaining, reset_after, retry_after = await client.eval(GCRA_SCRIPT, 1, key, limit, period, cells)
         except Exception as e:
             error_msg = str(e).replace("Error ", "")
-            logger.error(f"Error checking rate limit for user {user_id} on path {path}: {error_msg}")
+            logger.error(f"Error checking rate limit for {key}: {error_msg}")
             # Trong trường hợp lỗi, cho phép request đi qua
-            return False
-
-        return False
+            return None
+
+        granted, remaining = int(granted), int(remaining)
+        reset_after, retry_after = int(reset_after) / 1_000_000, int(retry_after) / 1_000_000
+        if cells > 1:
+            lease_ttl = min(settings.RATE_LIMIT_LEASE_TTL, period)
+            lease = _Lease(
+                tokens=max(granted - 1, 0),
+                remaining=remaining,
+                reset_at=time.monotonic() + reset_after,
+                limited=not granted,
+                retry_after=math.ceil(retry_after),
+            )
+            self._leases.set(key, lease, ttl=lease_ttl if granted else min(retry_after, lease_ttl))
+
+        result = RateLimitResult(
+            limited=not granted,
+            limit=limit,
+            remaining=remaining + max(granted - 1, 0),
+            reset=math.ceil(reset_after),
+            retry_after=math.ceil(retry_after),
+        )
+        if result.limited:
+            logger.info(f"Rate limit exceeded for {key}")
+        return result
+
+    async def is_rate_limited(self, db: AsyncSession, user_id: int | str, path: str, limit: int, period: int) -> bool:
+        """Kiểm tra rate limit cho user."""
+        result = await self.hit(user_id=user_id, path=path, limit=limit, period=period)
+        return result is not None and result.limited
 
 # Singleton instance
 rate_limiter = RateLimiter()
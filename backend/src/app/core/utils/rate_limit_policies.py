@@ -0,0 +1,146 @@
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from ...models.rate_limit import RateLimit
+from ...models.tier import Tier
+from ...schemas.rate_limit import sanitize_path
+from ..config import settings
+from ..db.database import local_session
+from ..db.redis import redis_rate_limit
+from .path_trie import PathTrie
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitPolicyTable:
+    """In-process copy of every tier x path -> (limit, period) rate limit policy.
+
+    The `tier` and `rate_limit` tables are compiled into a dict of tiers and one path trie per
+    tier, so resolving the policy of a request takes no query. Policy paths are matched against the
+    request's route template (`/api/v1/documents/{document_uuid}`) and may end with a wildcard
+    (`/api/v1/admin/*`) to cover a whole family of routes; see `PathTrie` for the precedence.
+    Older policies stored in the sanitized form (`api_v1_tasks`) still match exactly.
+
+    Each worker loads the table at startup and reloads it when a change is published on
+    `RATE_LIMIT_POLICY_CHANNEL` (the admin tier and rate limit endpoints publish after every
+    write), when the subscription is (re)established, and every
+    `RATE_LIMIT_POLICY_REFRESH_INTERVAL` seconds as a safety net for a missed message.
+    """
+
+    _instance: "RateLimitPolicyTable | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._tiers = {}
+            cls._instance._tries = {}
+            cls._instance._legacy_policies = {}
+            cls._instance._is_loaded = False
+            cls._instance._load_lock = asyncio.Lock()
+            cls._instance._listener = None
+        return cls._instance
+
+    async def load(self) -> None:
+        """Compile the policies from the database and swap them in at once."""
+        async with local_session() as db:
+            tiers = await db.execute(select(Tier.id, Tier.name))
+            rate_limits = await db.execute(
+                select(RateLimit.tier_id, RateLimit.path, RateLimit.limit, RateLimit.period).where(
+                    RateLimit.is_deleted.is_(False)
+                )
+            )
+            compiled_tiers = dict(tiers.all())
+            compiled_tries: dict[int, PathTrie] = {}
+            legacy_policies: dict[tuple[int, str], tuple[int, int]] = {}
+            for tier_id, path, limit, period in rate_limits:
+                if "/" in path:
+                    compiled_tries.setdefault(tier_id, PathTrie()).insert(path, (limit, period))
+                else:
+                    legacy_policies[(tier_id, path)] = (limit, period)
+
+        self._tiers, self._tries, self._legacy_policies = compiled_tiers, compiled_tries, legacy_policies
+        self._is_loaded = True
+        policy_count = sum(trie.count for trie in compiled_tries.values()) + len(legacy_policies)
+        logger.info(f"Rate limit policy table loaded: {len(compiled_tiers)} tiers, {policy_count} policies")
+
+    async def _ensure_loaded(self) -> None:
+        if self._is_loaded:
+            return
+        async with self._load_lock:
+            if not self._is_loaded:
+                await self.load()
+
+    async def get_tier_name(self, tier_id: int) -> str | None:
+        """Name of a tier, or None if it does not exist."""
+        await self._ensure_loaded()
+        return self._tiers.get(tier_id)
+
+    async def get_policy(self, tier_id: int, path: str) -> tuple[int, int] | None:
+        """`(limit, period)` of a tier on a route path, or None when the tier has no policy for it."""
+        await self._ensure_loaded()
+        trie = self._tries.get(tier_id)
+        match = trie.match(path) if trie is not None else None
+        if match is not None and match[1]:
+            return match[0]
+
+        legacy = self._legacy_policies.get((tier_id, sanitize_path(path)))
+        if legacy is not None:
+            return legacy
+        return match[0] if match is not None else None
+
+    async def publish_change(self) -> None:
+        """Tell every worker (this one included) to reload the table after a policy was written."""
+        client = redis_rate_limit.get_client()
+        if client is None:
+            await self.load()
+            return
+        try:
+            await client.publish(settings.RATE_LIMIT_POLICY_CHANNEL, "reload")
+        except Exception as e:
+            logger.error(f"Error publishing rate limit policy change: {e}")
+            await self.load()
+
+    async def _listen(self) -> None:
+        retry_delay = 1.0
+        while True:
+            client = redis_rate_limit.get_client()
+            if client is None:
+                await asyncio.sleep(retry_delay)
+                continue
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.RATE_LIMIT_POLICY_CHANNEL)
+                    # Changes published while we were not subscribed are only in the database
+                    await self.load()
+                    retry_delay = 1.0
+                    while True:
+                        message = await pubsub.get_message(timeout=settings.RATE_LIMIT_POLICY_REFRESH_INTERVAL)
+                        # None means nothing was published during the interval; reload anyway
+                        if message is None or message["type"] == "message":
+                            await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Rate limit policy listener error: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30.0)
+
+    def start(self) -> None:
+        """Start the per-worker task that loads and refreshes the table."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+
+# Singleton instance
+rate_limit_policies = RateLimitPolicyTable()
@@ -0,0 +1,190 @@
+import logging
+import uuid
+
+from fastapi import status
+
+from ..config import settings
+from ..exceptions.http_exceptions import CustomException
+from ..db.redis import redis_session
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY_PREFIX = "auth:gen"
+REFRESH_FAMILY_KEY_PREFIX = "auth:refresh"
+
+# Value kept in place of a family's jti once it was revoked (reuse detected or logout), so that a
+# later refresh of the family is refused instead of being taken for a family Redis never stored
+REVOKED_FAMILY = "revoked"
+
+ROTATE_REUSED = 0
+ROTATE_ROTATED = 1
+ROTATE_RESEEDED = 2
+
+# Swap the family's latest jti if the presented one is current, revoke the family if it is not.
+# A missing key was never stored (Redis was down at login) or lost, so the family is re-seeded.
+ROTATE_REFRESH_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current == false then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 2
+end
+if current == ARGV[1] then
+    redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+    return 1
+end
+redis.call("SET", KEYS[1], ARGV[4], "EX", ARGV[3])
+return 0
+"""
+
+
+class SessionRegistry:
+    """Per-user session generations and refresh-token families in Redis.
+
+    - Every token carries the user's session generation (`gen` claim). `revoke_all` is a single
+      INCR of `auth:gen:<sub>`, after which every token issued before it is rejected ("log out
+      everywhere"). Workers cache generations in the cache decorator's L1 for
+      `SESSION_GENERATION_LOCAL_EXPIRE` seconds and evict them through its pub/sub channel.
+    - A refresh token carries a family id (`fid`) and its own id (`jti`). `auth:refresh:<fid>` holds
+      the jti of the only refresh token of the family that may still be used. Rotating it makes
+      the previous one unusable; presenting an already rotated token means it was stolen or
+      replayed, so the whole family is revoked (the key keeps a tombstone until it expires).
+      Both are O(1).
+
+    The keys live on the session Redis role, which must run with `maxmemory-policy noeviction`:
+    generation keys have no TTL, and an evicted tombstone would let a revoked family back in.
+    When Redis is unreachable the checks are skipped (fail open) and per-token revocation still
+    applies. A family whose key is missing when it is next refreshed (Redis was down at login) is
+    re-seeded, and a refresh during an outage keeps the presented jti, so the family still
+    matches once Redis is back.
+    """
+
+    _instance: "SessionRegistry | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @staticmethod
+    def _generation_key(subject: str) -> str:
+        return f"{GENERATION_KEY_PREFIX}:{subject}"
+
+    @staticmethod
+    def _family_key(family_id: str) -> str:
+        return f"{REFRESH_FAMILY_KEY_PREFIX}:{family_id}"
+
+    async def get_generation(self, subject: str) -> int | None:
+        """Current session generation of a subject, or None if Redis is unavailable."""
+        key = self._generation_key(subject)
+        generation = cache.local_cache.get(key)
+        if generation is not None:
+            return generation
+
+        client = redis_session.get_client()
+        if client is None:
+            return None
+        try:
+            generation = int(await client.get(key) or 0)
+        except Exception as e:
+            logger.warning(f"Error reading session generation of {subject}: {e}")
+            return None
+        cache.local_cache.set(key, generation, ttl=settings.SESSION_GENERATION_LOCAL_EXPIRE)
+        return generation
+
+    async def is_current(self, subject: str, generation: int | None) -> bool:
+        """False if the token's generation was revoked; tokens without the claim count as generation 0."""
+        current = await self.get_generation(subject)
+        return current is None or (generation or 0) >= current
+
+    async def revoke_all(self, subject: str) -> None:
+        """Invalidate every access and refresh token issued so far to a subject.
+
+        Fails closed: raises a 503 CustomException when the generation cannot be bumped, so callers
+        should revoke before writing the change that requires it (password reset, user deletion).
+        """
+        key = self._generation_key(subject)
+        client = redis_session.get_client()
+        if client is None:
+            logger.error(f"Cannot revoke sessions of {subject}: Redis is not available")
+            raise self._revocation_unavailable()
+        try:
+            await client.incr(key)
+        except Exception as e:
+            logger.error(f"Error revoking sessions of {subject}: {e}")
+            raise self._revocation_unavailable()
+        try:
+            await cache._publish_invalidation([key], [])
+        except Exception as e:
+            # Other workers pick up the new generation when their L1 entry expires
+            logger.warning(f"Error publishing session revocation of {subject}: {e}")
+
+    @staticmethod
+    def _revocation_unavailable() -> CustomException:
+        return CustomException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sessions cannot be revoked right now. Please try again later.",
+        )
+
+    async def start_refresh_family(self) -> tuple[str, str]:
+        """Register a new refresh token family (at login) and return its `(fid, jti)`."""
+        family_id, token_id = uuid.uuid4().hex, uuid.uuid4().hex
+        client = redis_session.get_client()
+        if client is not None:
+            try:
+                await client.set(self._family_key(family_id), token_id, ex=self._refresh_lifetime())
+            except Exception as e:
+                logger.warning(f"Error registering refresh token family {family_id}: {e}")
+        return family_id, token_id
+
+    async def rotate_refresh_token(self, family_id: str, token_id: str | None) -> str | None:
+        """Atomically replace the latest refresh token of a family and return the new jti.
+
+        Returns None when `token_id` is not the latest one: the token was already rotated (replayed
+        or stolen) or the family was ended by a logout, and the family is revoked. When Redis is
+        unreachable the presented jti is returned unchanged, since a new one could not be stored.
+        """
+        client = redis_session.get_client()
+        if client is None:
+            return token_id or uuid.uuid4().hex
+
+        new_token_id = uuid.uuid4().hex
+        try:
+            result = await client.eval(
+                ROTATE_REFRESH_SCRIPT,
+                1,
+                self._family_key(family_id),
+                token_id or "",
+                new_token_id,
+                self._refresh_lifetime(),
+                REVOKED_FAMILY,
+            )
+        except Exception as e:
+            logger.warning(f"Error rotating refresh token family {family_id}: {e}")
+            return token_id or new_token_id
+        if int(result) == ROTATE_REUSED:
+            logger.warning(f"Refresh token reuse detected, family {family_id} revoked")
+            return None
+        if int(result) == ROTATE_RESEEDED:
+            logger.info(f"Refresh token family {family_id} was not in Redis, registered it again")
+        return new_token_id
+
+    @staticmethod
+    def _refresh_lifetime() -> int:
+        return settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+
+    async def end_refresh_family(self, family_id: str | None) -> None:
+        if family_id is None:
+            return
+        client = redis_session.get_client()
+        if client is None:
+            return
+        try:
+            # Tombstone rather than DEL: a missing family is re-seeded on its next refresh
+            await client.set(self._family_key(family_id), REVOKED_FAMILY, ex=self._refresh_lifetime())
+        except Exception as e:
+            logger.warning(f"Error ending refresh token family {family_id}: {e}")
+
+
+# Singleton instance
+session_registry = SessionRegistry()
@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..db.crud_token_blacklist import crud_token_blacklist
+from ..db.database import local_session
+from ..db.redis import redis
+from ..db.token_blacklist import TokenBlacklist
+from .bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "revoked"
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenRevocationStore:
+    """Revoked token lookups without a database round trip on the hot path.
+
+    - Redis holds `revoked:<sha256(token)>` with a TTL equal to the token's remaining lifetime.
+    - Each worker keeps a Bloom filter of revoked digests, so a token that was never revoked
+      (nearly every request) is answered from memory. It is rebuilt from the `token_blacklist`
+      table at startup and whenever the pub/sub subscription is (re)established, and kept current
+      by revocations published on `TOKEN_REVOCATION_CHANNEL`.
+    - `token_blacklist` stays the durable audit log. It is the fallback when the Bloom filter is
+      not loaded yet, when Redis is unavailable, and when the filter says "maybe" but Redis has no
+      key (Redis may have evicted or lost it).
+    """
+
+    _instance: "TokenRevocationStore | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._bloom = cls._instance._new_bloom()
+            cls._instance._is_loaded = False
+            cls._instance._listener = None
+        return cls._instance
+
+    @staticmethod
+    def _new_bloom() -> BloomFilter:
+        return BloomFilter(
+            capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY, error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+        )
+
+    @staticmethod
+    def _key(digest: str) -> str:
+        return f"{KEY_PREFIX}:{digest}"
+
+    async def revoke(self, token: str, expires_at: datetime) -> None:
+        """Mark a token revoked until it expires (the caller writes the audit row)."""
+        digest = token_digest(token)
+        self._bloom.add(digest)
+        remaining = int(expires_at.timestamp() - datetime.now().timestamp())
+        if remaining <= 0:
+            return
+
+        client = redis.get_client()
+        if client is None:
+            return
+        try:
+            await client.set(self._key(digest), 1, ex=remaining)
+            await client.publish(settings.TOKEN_REVOCATION_CHANNEL, digest)
+        except Exception as e:
+            logger.error(f"Error storing token revocation in Redis: {e}")
+
+    async def is_revoked(self, token: str, db: AsyncSession, digest: str | None = None) -> bool:
+        digest = digest or token_digest(token)
+        if self._is_loaded and digest not in self._bloom:
+            return False
+
+        client = redis.get_client()
+        if client is not None:
+            try:
+                if await client.exists(self._key(digest)):
+                    return True
+            except Exception as e:
+                logger.warning(f"Error checking token revocation in Redis: {e}")
+
+        return bool(await crud_token_blacklist.exists(db, token=token))
+
+    async def load(self) -> None:
+        """Rebuild this worker's Bloom filter from the unexpired rows of `token_blacklist`."""
+        bloom = self._new_bloom()
+        async with local_session() as db:
+            result = await db.stream_scalars(
+                select(TokenBlacklist.token).where(TokenBlacklist.expires_at > datetime.now())
+            )
+            async for token in result:
+                bloom.add(token_digest(token))
+        self._bloom = bloom
+        self._is_loaded = True
+        logger.info(f"Token revocation filter loaded with {bloom.count} revoked tokens")
+
+    async def _listen(self) -> None:
+        retry_delay = 1.0
+        while True:
+            client = redis.get_pubsub_client()
+            if client is None:
+                await asyncio.sleep(retry_delay)
+                continue
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.TOKEN_REVOCATION_CHANNEL)
+                    # Revocations published while we were not subscribed are only in the database
+                    await self.load()
+                    retry_delay = 1.0
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._bloom.add(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._is_loaded = False
+                logger.error(f"Token revocation listener error: {e}")
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30.0)
+
+    def start(self) -> None:
+        """Start the per-worker task that loads and maintains the Bloom filter."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._is_loaded = False
+
+
+# Singleton instance
+token_revocation = TokenRevocationStore()
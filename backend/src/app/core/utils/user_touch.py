@@ -0,0 +1,82 @@
+import logging
+from datetime import UTC, datetime
+
+import redis.asyncio as redis_async
+from redis.exceptions import ResponseError
+from sqlalchemy import DateTime, Integer, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...crud.crud_users import crud_users
+from ...models.user import User
+from ..db.redis import redis
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "user_touch:last_login"
+# Batch taken by the flush in progress; left behind by a crashed flush, it is retried first
+FLUSHING_KEY = "user_touch:last_login:flushing"
+FLUSH_BATCH_SIZE = 1000
+
+
+class UserTouchBuffer:
+    """Write-behind buffer for `user.last_login`.
+
+    A login records `user_id -> epoch` in a Redis hash (one HSET, repeated logins of the same user
+    collapse into one field), and the worker periodically writes the whole hash back with one
+    `UPDATE ... FROM (VALUES ...)` per `FLUSH_BATCH_SIZE` users. `last_login` may therefore lag by
+    up to the flush interval. If Redis is unavailable the login falls back to a direct UPDATE.
+    """
+
+    _instance: "UserTouchBuffer | None" = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def touch_last_login(self, db: AsyncSession, user_id: int) -> None:
+        now = datetime.now(UTC)
+        client = redis.get_client()
+        if client is not None:
+            try:
+                await client.hset(PENDING_KEY, str(user_id), now.timestamp())
+                return
+            except Exception as e:
+                logger.warning(f"Error buffering last_login of user {user_id}, writing it directly: {e}")
+        await crud_users.update(db=db, object={"last_login": now}, id=user_id)
+
+    async def flush(self, client: redis_async.Redis, db: AsyncSession) -> int:
+        """Write the buffered touches to the database and return the number of users updated.
+
+        The pending hash is renamed before it is read, so touches recorded during the flush go
+        to a fresh hash and are picked up by the next run.
+        """
+        if not await client.exists(FLUSHING_KEY):
+            try:
+                await client.rename(PENDING_KEY, FLUSHING_KEY)
+            except ResponseError:
+                # Nothing buffered
+                return 0
+
+        touches = await client.hgetall(FLUSHING_KEY)
+        rows = [
+            (int(user_id), datetime.fromtimestamp(float(timestamp), UTC))
+            for user_id, timestamp in touches.items()
+        ]
+        for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+            batch = values(column("id", Integer), column("last_login", DateTime(timezone=True)), name="touches").data(
+                rows[start : start + FLUSH_BATCH_SIZE]
+            )
+            await db.execute(
+                update(User)
+                .where(User.id == batch.c.id)
+                .values(last_login=batch.c.last_login)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+        await client.delete(FLUSHING_KEY)
+        return len(rows)
+
+
+# Singleton instance
+user_touch_buffer = UserTouchBuffer()
@@ -3,7 +3,13 @@ import logging
 from typing import Any
 
 from celery import Task
-from ..db.redis import redis
+from redis.asyncio import Redis
+
+from ..config import settings
+from ..db.database import async_engine, local_session
+from ..db.redis import RedisRole, create_pool, redis
+from ..utils.user_touch import user_touch_buffer
+from .maintenance import purge_expired_token_blacklist
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +19,37 @@ async def sample_background_task(name: str) -> str:
     await asyncio.sleep(5)
     return f"Task {name} is complete!"
 
+async def flush_user_touches() -> int:
+    """Ghi các last_login đang buffer trong Redis xuống database bằng một UPDATE theo lô.
+
+    Each run happens in its own event loop (asyncio.run), so it opens its own Redis client and
+    disposes the engine's pooled connections before the loop closes.
+    """
+    client = Redis.from_pool(create_pool(RedisRole.CACHE, decode_responses=True))
+    try:
+        async with local_session() as db:
+            flushed = await user_touch_buffer.flush(client, db)
+        if flushed:
+            logger.info(f"Flushed last_login of {flushed} users")
+        return flushed
+    finally:
+        await client.aclose()
+        await async_engine.dispose()
+
+async def purge_token_blacklist() -> dict[str, Any]:
+    """Xóa các token blacklist đã hết hạn theo từng lô và trả về báo cáo (số dòng, thời gian chạy)."""
+    try:
+        async with local_session() as db:
+            report = await purge_expired_token_blacklist(
+                db,
+                batch_size=settings.TOKEN_BLACKLIST_PURGE_BATCH_SIZE,
+                pause=settings.TOKEN_BLACKLIST_PURGE_PAUSE,
+                max_duration=settings.TOKEN_BLACKLIST_PURGE_MAX_DURATION,
+            )
+        return report.as_dict()
+    finally:
+        await async_engine.dispose()
+
 # -------- base functions --------
 async def startup() -> None:
     """Khởi tạo worker."""
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.token_blacklist import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeReport:
+    """Result of one maintenance run."""
+
+    table: str
+    rows_removed: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+async def purge_expired_token_blacklist(
+    db: AsyncSession, batch_size: int = 5000, pause: float = 0.0, max_duration: float | None = None
+) -> PurgeReport:
+    """Delete expired rows of `token_blacklist` in bounded batches.
+
+    Each batch deletes at most `batch_size` rows picked through the `expires_at` index and commits
+    on its own, so locks are short and a concurrent logout never waits behind one huge DELETE.
+    Rows locked by another purge are skipped (`SKIP LOCKED`).
+
+    Parameters
+    ----------
+    db: AsyncSession
+        Session used for the batches; committed after each one.
+    batch_size: int
+        Maximum number of rows deleted per statement.
+    pause: float
+        Seconds to sleep between batches, to leave room for foreground traffic.
+    max_duration: float | None
+        Stop starting new batches after this many seconds; the rest is left for the next run.
+
+    Returns
+    -------
+    PurgeReport
+        Rows removed, number of batches and run time in seconds.
+    """
+    report = PurgeReport(table=TokenBlacklist.__tablename__)
+    started_at = time.perf_counter()
+    # expires_at is stored naive in server local time (see security.blacklist_token)
+    now = datetime.now()
+
+    while True:
+        expired_ids = (
+            select(TokenBlacklist.id)
+            .where(TokenBlacklist.expires_at < now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(TokenBlacklist)
+            .where(TokenBlacklist.id.in_(expired_ids))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        report.batches += 1
+        report.rows_removed += result.rowcount
+        if result.rowcount < batch_size:
+            break
+        if max_duration is not None and time.perf_counter() - started_at >= max_duration:
+            logger.info(f"Purge of {report.table} stopped after {max_duration}s, continuing next run")
+            break
+        if pause:
+            await asyncio.sleep(pause)
+
+    report.duration = time.perf_counter() - started_at
+    logger.info(
+        f"Purged {report.rows_removed} expired rows from {report.table} "
+        f"in {report.batches} batches ({report.duration:.2f}s)"
+    )
+    return report
@@ -1,6 +1,6 @@
 from celery import Celery
 from ..config import settings
-from .functions import sample_background_task, startup, shutdown
+from .functions import flush_user_touches, purge_token_blacklist, sample_background_task, startup, shutdown
 import asyncio
 
 # -------- Celery settings --------
@@ -27,11 +27,24 @@ celery_app.conf.update(
 # Đăng ký các task
 celery_app.task(name='sample_background_task')(sample_background_task)
 
+
+@celery_app.task(name='flush_user_touches')
+def flush_user_touches_task() -> int:
+    return asyncio.run(flush_user_touches())
+
+
+@celery_app.task(name='purge_token_blacklist')
+def purge_token_blacklist_task() -> dict:
+    return asyncio.run(purge_token_blacklist())
+
 # Event handlers
 @celery_app.on_after_configure.connect  # type: ignore
 def setup_periodic_tasks(sender, **kwargs):
     """Cấu hình các task định kỳ."""
-    pass
+    sender.add_periodic_task(settings.USER_TOUCH_FLUSH_INTERVAL, flush_user_touches_task.s(), name='flush_user_touches')
+    sender.add_periodic_task(
+        settings.TOKEN_BLACKLIST_PURGE_INTERVAL, purge_token_blacklist_task.s(), name='purge_token_blacklist'
+    )
 
 @celery_app.on_after_finalize.connect  # type: ignore
 def setup_startup(sender, **kwargs):
@@ -0,0 +1,147 @@
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from fastcrud.crud.helper import _extract_matching_columns_from_schema
+from pydantic import BaseModel
+from sqlalchemy import and_, exists, false, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.db.database import Base
+from ..models.access_control import AccessControl, PermissionType, ResourceType
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+# Permissions that may modify or delete a resource; reads accept any permission (`permissions=None`)
+WRITE_PERMISSIONS = (PermissionType.OWNER, PermissionType.COLLABORATOR)
+
+
+class ACLScopedCRUD(Generic[ModelType]):
+    """Data access for one resource type, scoped to what a user may access.
+
+    Every method resolves the caller's `access_control` row and touches the resource in the same
+    statement: `get` joins the ACL row and returns the resource together with the permission,
+    `update` and `delete` run a single `UPDATE ... FROM access_control`. Deleted resources and
+    deleted ACL rows never match.
+
+    Parameters
+    ----------
+    model: type[ModelType]
+        Resource model; it must have `uuid` and `is_deleted` columns.
+    resource_type: ResourceType
+        Value of `access_control.resource_type` for this model.
+    """
+
+    def __init__(self, model: type[ModelType], resource_type: ResourceType) -> None:
+        self.model = model
+        self.resource_type = resource_type
+
+    def _acl_condition(self, user_id: int, permissions: Iterable[PermissionType] | None) -> Any:
+        conditions = [
+            AccessControl.resource_uuid == self.model.uuid,
+            AccessControl.resource_type == self.resource_type,
+            AccessControl.user_id == user_id,
+            # `= false` (not `IS false`) so the partial ACL indexes match
+            AccessControl.is_deleted == false(),
+        ]
+        if permissions is not None:
+            conditions.append(AccessControl.permission.in_(list(permissions)))
+        return and_(*conditions)
+
+    def _resource_condition(self, resource_uuid: UUID) -> Any:
+        return and_(self.model.uuid == resource_uuid, self.model.is_deleted == false())
+
+    async def get(
+        self,
+        db: AsyncSession,
+        resource_uuid: UUID,
+        user_id: int,
+        schema_to_select: type[BaseModel] | None = None,
+        permissions: Iterable[PermissionType] | None = None,
+    ) -> dict[str, Any] | None:
+        """Load a resource if the user holds one of `permissions` (any permission if None).
+
+        Returns the selected columns plus a `permission` key, or None when the resource does not
+        exist, is deleted, or the user has no access to it.
+        """
+        columns = _extract_matching_columns_from_schema(self.model, schema_to_select)
+        stmt = (
+            select(*columns, AccessControl.permission)
+            .join(AccessControl, self._acl_condition(user_id, permissions))
+            .where(self._resource_condition(resource_uuid))
+            .limit(1)
+        )
+        row = (await db.execute(stmt)).mappings().first()
+        return dict(row) if row is not None else None
+
+    async def exists(
+        self,
+        db: AsyncSession,
+        resource_uuid: UUID,
+        user_id: int,
+        permissions: Iterable[PermissionType] | None = None,
+    ) -> bool:
+        stmt = select(
+            exists()
+            .where(self._resource_condition(resource_uuid))
+            .where(self._acl_condition(user_id, permissions))
+        )
+        return bool((await db.execute(stmt)).scalar())
+
+    async def update(
+        self,
+        db: AsyncSession,
+        object: dict[str, Any],
+        resource_uuid: UUID,
+        user_id: int,
+        schema_to_select: type[BaseModel] | None = None,
+        permissions: Iterable[PermissionType] | None = None,
+        commit: bool = True,
+    ) -> dict[str, Any] | None:
+        """Update a resource the user may access, in one statement.
+
+        Returns the selected columns of the updated row, or None when nothing matched (missing,
+        deleted or no access), in which case nothing was written.
+        """
+        values = dict(object)
+        if "updated_at" in self.model.__table__.columns:
+            values["updated_at"] = datetime.now(UTC)
+
+        columns = _extract_matching_columns_from_schema(self.model, schema_to_select)
+        stmt = (
+            update(self.model)
+            .where(self._resource_condition(resource_uuid))
+            .where(self._acl_condition(user_id, permissions))
+            .values(**values)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await db.execute(stmt)).mappings().first()
+        if commit:
+            await db.commit()
+        return dict(row) if row is not None else None
+
+    async def delete(
+        self,
+        db: AsyncSession,
+        resource_uuid: UUID,
+        user_id: int,
+        schema_to_select: type[BaseModel] | None = None,
+        permissions: Iterable[PermissionType] | None = None,
+        commit: bool = True,
+    ) -> dict[str, Any] | None:
+        """Soft delete a resource the user may access.
+
+        Returns the selected columns of the deleted row (e.g. a file path still to clean up), or
+        None when nothing matched.
+        """
+        return await self.update(
+            db,
+            {"is_deleted": True, "deleted_at": datetime.now(UTC)},
+            resource_uuid,
+            user_id,
+            schema_to_select=schema_to_select,
+            permissions=permissions,
+            commit=commit,
+        )
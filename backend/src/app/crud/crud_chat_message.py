@@ -1,7 +1,9 @@
 from fastcrud import FastCRUD
 
 from ..models.chat_message import ChatMessage
+from ..models.access_control import ResourceType
 from ..schemas.chat_message import ChatMessageCreateInternal, ChatMessageUpdate, ChatMessageUpdateInternal,  ChatMessageDeleteInternal,ChatMessageReadInternal
+from .acl_scoped import ACLScopedCRUD
 
 CRUDChatMessage = FastCRUD[ChatMessage,
     ChatMessageCreateInternal,
@@ -10,3 +12,4 @@ CRUDChatMessage = FastCRUD[ChatMessage,
     ChatMessageDeleteInternal,
     ChatMessageReadInternal]
 crud_chatMessages = CRUDChatMessage(ChatMessage)
+acl_chatMessages = ACLScopedCRUD(ChatMessage, ResourceType.CHAT_MESSAGE)
@@ -1,7 +1,9 @@
 from fastcrud import FastCRUD
 
 from ..models.chat_session import ChatSession
+from ..models.access_control import ResourceType
 from ..schemas.chat_session import ChatSessionCreateInternal, ChatSessionUpdate, ChatSessionUpdateInternal, ChatSessionDeleteInternal,ChatSessionReadInternal
+from .acl_scoped import ACLScopedCRUD
 
 CRUDChatSession = FastCRUD[ChatSession, 
     ChatSessionCreateInternal,
@@ -10,3 +12,4 @@ CRUDChatSession = FastCRUD[ChatSession,
     ChatSessionDeleteInternal,
     ChatSessionReadInternal]          
 crud_chatSessions = CRUDChatSession(ChatSession)
+acl_chatSessions = ACLScopedCRUD(ChatSession, ResourceType.CHAT_SESSION)
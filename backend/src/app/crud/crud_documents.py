@@ -1,7 +1,9 @@
 from fastcrud import FastCRUD
 
 from ..models.document import Document
+from ..models.access_control import ResourceType
 from ..schemas.document import DocumentCreateInternal, DocumentUpdateInternal, DocumentDeleteInternal, DocumentReadInternal
+from .acl_scoped import ACLScopedCRUD
 
 CRUDDocument = FastCRUD[Document, 
     DocumentCreateInternal,
@@ -11,3 +13,4 @@ CRUDDocument = FastCRUD[Document,
     DocumentReadInternal]
     
 crud_documents = CRUDDocument(Document)
+acl_documents = ACLScopedCRUD(Document, ResourceType.DOCUMENT)
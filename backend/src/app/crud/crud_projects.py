@@ -1,7 +1,9 @@
 from fastcrud import FastCRUD
 
 from ..models.project import Project
+from ..models.access_control import ResourceType
 from ..schemas.project import ProjectCreateInternal, ProjectDeleteInternal, ProjectUpdateInternal, ProjectReadInternal
+from .acl_scoped import ACLScopedCRUD
 
 CRUDProject = FastCRUD[Project,  
     ProjectCreateInternal,
@@ -10,3 +12,4 @@ CRUDProject = FastCRUD[Project,
     ProjectDeleteInternal,
     ProjectReadInternal]
 crud_projects = CRUDProject(Project)
+acl_projects = ACLScopedCRUD(Project, ResourceType.PROJECT)
@@ -0,0 +1,83 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastcrud.crud.helper import _extract_matching_columns_from_schema
+from pydantic import BaseModel
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.db.database import Base
+from ..core.exceptions.http_exceptions import BadRequestException
+from ..core.utils.cursor import decode_cursor, encode_cursor
+
+MAX_ITEMS_PER_PAGE = 100
+
+
+def _matches_column(value: Any, column: Any) -> bool:
+    """Whether a decoded cursor value can be compared with a key column."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value is not None
+    if isinstance(value, bool) and python_type is not bool:
+        return False
+    if python_type is float:
+        return isinstance(value, int | float)
+    return isinstance(value, python_type)
+
+
+async def get_keyset_page(
+    db: AsyncSession,
+    model: type[Base],
+    keys: Sequence[str],
+    items_per_page: int,
+    cursor: str | None = None,
+    schema_to_select: type[BaseModel] | None = None,
+    include_total: bool = False,
+    **filters: Any,
+) -> dict[str, Any]:
+    """One page of `model` rows matching `filters`, ordered by the unique sort key `keys`.
+
+    Keyset pagination: the page starts after the position in `cursor` with `WHERE (keys) > (...)`
+    instead of an OFFSET, so with an index on the key every page costs the same as the first.
+    The total is only counted (a full `COUNT(*)` of the filtered rows) when `include_total` is set.
+
+    Raises BadRequestException when `items_per_page` is not between 1 and `MAX_ITEMS_PER_PAGE`
+    or the cursor does not decode to one value of each key column's type.
+
+    Returns `data`, `next_cursor` (None on the last page), `has_more` and `total_count` (None
+    unless requested).
+    """
+    if not 1 <= items_per_page <= MAX_ITEMS_PER_PAGE:
+        raise BadRequestException(f"items_per_page must be between 1 and {MAX_ITEMS_PER_PAGE}")
+
+    key_columns = [getattr(model, key) for key in keys]
+    columns = _extract_matching_columns_from_schema(model, schema_to_select)
+    selected = {column.key for column in columns}
+    extra_columns = [column for column in key_columns if column.key not in selected]
+    conditions = [getattr(model, name) == value for name, value in filters.items()]
+
+    stmt = select(*columns, *extra_columns).where(*conditions)
+    if cursor is not None:
+        try:
+            position = decode_cursor(cursor, len(keys))
+        except ValueError:
+            raise BadRequestException("Invalid pagination cursor")
+        if not all(_matches_column(value, column) for value, column in zip(position, key_columns)):
+            raise BadRequestException("Invalid pagination cursor")
+        stmt = stmt.where(tuple_(*key_columns) > tuple_(*position))
+    stmt = stmt.order_by(*key_columns).limit(items_per_page + 1)
+
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    has_more = len(rows) > items_per_page
+    rows = rows[:items_per_page]
+    next_cursor = encode_cursor([rows[-1][key] for key in keys]) if has_more else None
+    for row in rows:
+        for column in extra_columns:
+            row.pop(column.key, None)
+
+    total_count = None
+    if include_total:
+        total_count = (await db.execute(select(func.count()).select_from(model).where(*conditions))).scalar()
+
+    return {"data": rows, "next_cursor": next_cursor, "has_more": has_more, "total_count": total_count}
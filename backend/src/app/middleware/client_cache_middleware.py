@@ -52,7 +52,9 @@ class ClientCacheMiddleware(BaseHTTPMiddleware):
         Note
         ----
             - This method is automatically called by Starlette for processing the request-response cycle.
+            - A `Cache-Control` header already set by the endpoint (e.g. for private documents) is kept.
         """
         response: Response = await call_next(request)
-        response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
+        if "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = f"public, max-age={self.max_age}"
         return response
@@ -0,0 +1,23 @@
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+
+class RateLimitHeadersMiddleware(BaseHTTPMiddleware):
+    """Middleware to add the `X-RateLimit-*` headers computed by `rate_limiter_dependency`.
+
+    The dependency stores the headers in `request.state.rate_limit_headers` rather than on the
+    injected `Response`, whose headers are dropped when an endpoint returns its own response
+    (e.g. a `StreamingResponse`). Setting them here covers every kind of response.
+
+    Methods
+    -------
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        Process the request and copy the rate limit headers to the response.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response: Response = await call_next(request)
+        headers = getattr(request.state, "rate_limit_headers", None)
+        if headers:
+            response.headers.update(headers)
+        return response
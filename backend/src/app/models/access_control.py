@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import Integer, ForeignKey, String, Enum as SQLEnum
+from sqlalchemy import Index, Integer, ForeignKey, String, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from ..core.db.database import Base
@@ -19,9 +19,25 @@ class PermissionType(str, Enum):
 
 class AccessControl(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "access_control"
+    __table_args__ = (
+        Index(
+            "ix_access_control_resource_lookup",
+            "resource_uuid", "resource_type", "user_id",
+            postgresql_include=["permission", "resource_id"],
+            postgresql_where=text("is_deleted = false"),
+        ),
+        Index(
+            "ix_access_control_user_resources",
+            "user_id", "resource_type", "resource_id",
+            postgresql_include=["resource_uuid", "permission"],
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True,nullable=False, unique=True, init=False)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
     resource_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     resource_uuid: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False, index=True)
-    resource_type: Mapped[ResourceType] = mapped_column(SQLEnum(ResourceType, native_enum=True), nullable=False, index=True)
-    permission: Mapped[PermissionType] = mapped_column(SQLEnum(PermissionType, native_enum=True), nullable=False, index=True, default=PermissionType.OWNER)
+    resource_type: Mapped[ResourceType] = mapped_column(SQLEnum(ResourceType, native_enum=True), nullable=False)
+    permission: Mapped[PermissionType] = mapped_column(
+        SQLEnum(PermissionType, native_enum=True), nullable=False, default=PermissionType.OWNER
+    )
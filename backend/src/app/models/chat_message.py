@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Integer, Enum as SQLEnum, Text
+from sqlalchemy import Index, String, ForeignKey, Integer, Enum as SQLEnum, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db.database import Base
@@ -20,6 +20,14 @@ class Role(str, Enum):
 
 class ChatMessage(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "chat_message"
+    __table_args__ = (
+        Index("ix_chat_message_created_at_id", "created_at", "id"),
+        Index(
+            "ix_chat_message_session_sequence",
+            "chat_session_id", "sequence_number", "id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
@@ -1,6 +1,6 @@
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Text
+from sqlalchemy import Index, String, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db.database import Base
@@ -13,6 +13,9 @@ if TYPE_CHECKING:
 
 class ChatSession(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "chat_session"
+    __table_args__ = (
+        Index("ix_chat_session_created_at_id", "created_at", "id"),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Integer, Enum as SQLEnum, Text
+from sqlalchemy import Index, String, ForeignKey, Integer, Enum as SQLEnum, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db.database import Base
@@ -15,6 +15,14 @@ if TYPE_CHECKING:
 
 class Document(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "document"
+    __table_args__ = (
+        Index("ix_document_created_at_id", "created_at", "id"),
+        Index(
+            "ix_document_project_created_at_id",
+            "project_id", "created_at", "id",
+            postgresql_where=text("is_deleted = false"),
+        ),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
@@ -1,6 +1,6 @@
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Text
+from sqlalchemy import Index, String, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db.database import Base
@@ -14,6 +14,9 @@ if TYPE_CHECKING:
 
 class Project(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "project"
+    __table_args__ = (
+        Index("ix_project_created_at_id", "created_at", "id"),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
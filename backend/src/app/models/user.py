@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, Boolean,Enum as SQLEnum
+from sqlalchemy import Index, DateTime, ForeignKey, String, Boolean,Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.db.database import Base
@@ -20,6 +20,9 @@ class AuthProvider(str, Enum):
 
 class User(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "user"
+    __table_args__ = (
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
     
     # Primary key
     id: Mapped[int] = mapped_column("id", autoincrement=True, nullable=False, unique=True, primary_key=True, init=False)
@@ -63,6 +63,10 @@ class DocumentRead(BaseModel):
     file_size: int | None = None
     page_count: int | None = None
     meta_info: dict | None = None
+    download_url: Annotated[
+        str | None,
+        Field(examples=["https://storage.example.com/papery-files/doc.pdf?X-Amz-Signature=..."], default=None),
+    ] = None
 
 
 class DocumentCreate(DocumentBase):
@@ -34,5 +34,13 @@ class PaginatedAPIResponse(GenericModel, Generic[T]):
     page: int
     items_per_page: int
 
+class CursorPaginatedAPIResponse(GenericModel, Generic[T]):
+    message: str = Field(..., examples=["Resources retrieved successfully"])
+    data: list[T]
+    items_per_page: int
+    has_more: bool
+    next_cursor: str | None = None
+    total_count: int | None = None
+
 class OnlyID(BaseModel):
     id: int
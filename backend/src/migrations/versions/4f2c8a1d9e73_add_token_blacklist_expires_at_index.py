@@ -0,0 +1,35 @@
+"""add_token_blacklist_expires_at_index
+
+Revision ID: 4f2c8a1d9e73
+Revises: be82e81c7df6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2c8a1d9e73'
+down_revision: Union[str, None] = 'be82e81c7df6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The purge job selects expired rows by expires_at; without this index every batch scans the table.
+    # CONCURRENTLY so logouts are not blocked while the index is built on a large table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_token_blacklist_expires_at'),
+            'token_blacklist',
+            ['expires_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_token_blacklist_expires_at'), table_name='token_blacklist', postgresql_concurrently=True)
@@ -0,0 +1,70 @@
+"""add_access_control_composite_indexes
+
+Revision ID: 7b3e5d2c1a84
+Revises: 4f2c8a1d9e73
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e5d2c1a84'
+down_revision: Union[str, None] = '4f2c8a1d9e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Partial indexes over the live ACL rows, matched to the two hot query shapes so they are
+    # answered by an index only scan instead of a BitmapAnd of the single column indexes:
+    # - "may this user access resource X": resource_uuid + resource_type + user_id (ACL scoped CRUD)
+    # - "resources of this type the user has": user_id + resource_type -> resource_id (listings)
+    # CONCURRENTLY so requests are not blocked while the indexes are built on a large table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_access_control_resource_lookup',
+            'access_control',
+            ['resource_uuid', 'resource_type', 'user_id'],
+            unique=False,
+            postgresql_include=['permission', 'resource_id'],
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_access_control_user_resources',
+            'access_control',
+            ['user_id', 'resource_type', 'resource_id'],
+            unique=False,
+            postgresql_include=['resource_uuid', 'permission'],
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        # A handful of distinct values each: never selective on their own, only cost writes
+        op.drop_index(
+            op.f('ix_access_control_resource_type'), table_name='access_control', postgresql_concurrently=True
+        )
+        op.drop_index(op.f('ix_access_control_permission'), table_name='access_control', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_access_control_permission'),
+            'access_control',
+            ['permission'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_access_control_resource_type'),
+            'access_control',
+            ['resource_type'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_access_control_user_resources', table_name='access_control', postgresql_concurrently=True)
+        op.drop_index('ix_access_control_resource_lookup', table_name='access_control', postgresql_concurrently=True)
@@ -0,0 +1,55 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: c5d1e8f4a290
+Revises: 7b3e5d2c1a84
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d1e8f4a290'
+down_revision: Union[str, None] = '7b3e5d2c1a84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Admin listings page through each table by (created_at, id)
+CREATED_AT_TABLES = ['user', 'project', 'chat_session', 'document', 'chat_message']
+
+
+def upgrade() -> None:
+    # Keyset pagination reads the next page straight from these indexes in sort order, so deep
+    # pages cost the same as the first. CONCURRENTLY so writes are not blocked during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_message_session_sequence',
+            'chat_message',
+            ['chat_session_id', 'sequence_number', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_document_project_created_at_id',
+            'document',
+            ['project_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted = false'),
+            postgresql_concurrently=True,
+        )
+        for table in CREATED_AT_TABLES:
+            op.create_index(
+                f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(CREATED_AT_TABLES):
+            op.drop_index(f'ix_{table}_created_at_id', table_name=table, postgresql_concurrently=True)
+        op.drop_index('ix_document_project_created_at_id', table_name='document', postgresql_concurrently=True)
+        op.drop_index('ix_chat_message_session_sequence', table_name='chat_message', postgresql_concurrently=True)
@@ -0,0 +1,235 @@
+"""Benchmark the access_control lookups before and after the composite partial indexes.
+
+Seeds a copy of `access_control` in a scratch schema (the real table is not touched), then times
+the hot query shapes with the single column indexes of the initial migration and again with the
+indexes of migration 7b3e5d2c1a84, printing p50/p99 latency and the plan chosen for each shape.
+
+Usage (against the database in settings, after `alembic upgrade head`):
+
+    python -m src.scripts.benchmark_acl_indexes --rows 5000000 --queries 2000
+
+The data is deterministic (resource uuid = md5 of the row number) and the sampled keys come from
+a seeded RNG, so runs are comparable.
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+import statistics
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..app.core.db.database import async_engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = "acl_benchmark"
+TABLE = f"{SCHEMA}.access_control"
+
+# Indexes of 91cf26b4fe1a
+BEFORE_INDEXES = [
+    f"CREATE INDEX ON {TABLE} (user_id)",
+    f"CREATE INDEX ON {TABLE} (resource_id)",
+    f"CREATE INDEX ON {TABLE} (resource_uuid)",
+    f"CREATE INDEX ON {TABLE} (resource_type)",
+    f"CREATE INDEX ON {TABLE} (permission)",
+]
+
+# Indexes after 7b3e5d2c1a84, which adds the two partial ones and drops resource_type and permission
+AFTER_INDEXES = [
+    f"CREATE INDEX ON {TABLE} (user_id)",
+    f"CREATE INDEX ON {TABLE} (resource_id)",
+    f"CREATE INDEX ON {TABLE} (resource_uuid)",
+    f"CREATE INDEX ON {TABLE} (resource_uuid, resource_type, user_id) INCLUDE (permission, resource_id) "
+    "WHERE is_deleted = false",
+    f"CREATE INDEX ON {TABLE} (user_id, resource_type, resource_id) INCLUDE (resource_uuid, permission) "
+    "WHERE is_deleted = false",
+]
+
+# The ACL side of the app's queries, as rendered by ACLScopedCRUD and fastcrud
+QUERIES = {
+    "resource_lookup": (
+        f"SELECT permission, resource_id FROM {TABLE} "
+        "WHERE resource_uuid = :resource_uuid AND resource_type = :resource_type AND user_id = :user_id "
+        "AND is_deleted = false LIMIT 1"
+    ),
+    "user_resources": (
+        f"SELECT resource_id FROM {TABLE} "
+        "WHERE user_id = :user_id AND resource_type = :resource_type AND is_deleted = false LIMIT 10"
+    ),
+    "user_resources_count": (
+        f"SELECT count(*) FROM {TABLE} "
+        "WHERE user_id = :user_id AND resource_type = :resource_type AND is_deleted = false"
+    ),
+}
+
+
+@dataclass
+class Result:
+    query: str
+    p50: float
+    p99: float
+    mean: float
+    plan: str
+
+
+def resource_uuid(row: int) -> uuid.UUID:
+    """uuid of a seeded row, the same value as `md5(row::text)::uuid` in Postgres."""
+    return uuid.UUID(hashlib.md5(str(row).encode()).hexdigest())
+
+
+async def column_type(conn: AsyncConnection, column: str) -> str:
+    """Type of a column of the real table, e.g. the enum `resourcetype`."""
+    result = await conn.execute(
+        text(
+            "SELECT format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = 'public.access_control'::regclass AND attname = :column"
+        ),
+        {"column": column},
+    )
+    return result.scalar_one()
+
+
+async def seed(conn: AsyncConnection, rows: int, users: int) -> list[str]:
+    """Create and fill the scratch table; returns the resource type labels in enum order."""
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text(f"CREATE TABLE {TABLE} (LIKE public.access_control INCLUDING DEFAULTS)"))
+
+    resource_type = await column_type(conn, "resource_type")
+    permission = await column_type(conn, "permission")
+    labels = (await conn.execute(text(f"SELECT enum_range(NULL::{resource_type})::text[]"))).scalar_one()
+
+    logger.info(f"Seeding {rows} ACL rows for {users} users")
+    started_at = time.perf_counter()
+    # Row g is resource g owned by user g % users + 1; types cycle and 5% of the rows are soft deleted
+    await conn.execute(
+        text(
+            f"INSERT INTO {TABLE} (id, user_id, resource_id, resource_uuid, resource_type, permission, "
+            "created_at, updated_at, deleted_at, is_deleted) "
+            f"SELECT g, (g % :users) + 1, g, md5(g::text)::uuid, "
+            f"(enum_range(NULL::{resource_type}))[1 + g % 4], "
+            f"(enum_range(NULL::{permission}))[1 + (g / 7) % 3], "
+            "now(), now(), NULL, g % 20 = 0 "
+            "FROM generate_series(1, :rows) AS g"
+        ),
+        {"rows": rows, "users": users},
+    )
+    logger.info(f"Seeded in {time.perf_counter() - started_at:.1f}s")
+    return list(labels)
+
+
+async def apply_indexes(conn: AsyncConnection, statements: list[str]) -> None:
+    """Replace the scratch table's indexes, then vacuum so index only scans can skip the heap."""
+    existing = await conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema"), {"schema": SCHEMA}
+    )
+    for name in existing.scalars().all():
+        await conn.execute(text(f"DROP INDEX {SCHEMA}.{name}"))
+
+    started_at = time.perf_counter()
+    for statement in statements:
+        await conn.execute(text(statement))
+    await conn.execute(text(f"VACUUM ANALYZE {TABLE}"))
+    logger.info(f"Built {len(statements)} indexes in {time.perf_counter() - started_at:.1f}s")
+
+
+def sample_params(rng: random.Random, rows: int, users: int, labels: list[str]) -> dict[str, Any]:
+    row = rng.randint(1, rows)
+    return {
+        "resource_uuid": resource_uuid(row),
+        "resource_type": labels[row % 4],
+        "user_id": row % users + 1,
+    }
+
+
+async def run_query(
+    conn: AsyncConnection, name: str, sql: str, rows: int, users: int, labels: list[str], queries: int
+) -> Result:
+    rng = random.Random(name)
+    statement = text(sql)
+
+    explain = text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")
+    plan = (await conn.execute(explain, sample_params(rng, rows, users, labels))).scalars().all()
+
+    # Warm up the cache and the prepared statement before measuring
+    for _ in range(min(queries // 10, 200)):
+        await conn.execute(statement, sample_params(rng, rows, users, labels))
+
+    timings = []
+    for _ in range(queries):
+        params = sample_params(rng, rows, users, labels)
+        started_at = time.perf_counter()
+        await conn.execute(statement, params)
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    timings.sort()
+    return Result(
+        query=name,
+        p50=statistics.median(timings),
+        p99=timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        mean=statistics.fmean(timings),
+        plan="\n".join(plan),
+    )
+
+
+async def run_phase(
+    conn: AsyncConnection, indexes: list[str], rows: int, users: int, labels: list[str], queries: int
+) -> dict[str, Result]:
+    await apply_indexes(conn, indexes)
+    return {
+        name: await run_query(conn, name, sql, rows, users, labels, queries)
+        for name, sql in QUERIES.items()
+    }
+
+
+def report(before: dict[str, Result], after: dict[str, Result], show_plans: bool) -> None:
+    print(
+        f"\n{'query':<22} {'p50 before':>11} {'p50 after':>10} "
+        f"{'p99 before':>11} {'p99 after':>10} {'p99 speedup':>12}"
+    )
+    for name in QUERIES:
+        b, a = before[name], after[name]
+        speedup = b.p99 / a.p99 if a.p99 else float("inf")
+        print(f"{name:<22} {b.p50:>9.3f}ms {a.p50:>8.3f}ms {b.p99:>9.3f}ms {a.p99:>8.3f}ms {speedup:>11.1f}x")
+
+    if show_plans:
+        for name in QUERIES:
+            print(f"\n== {name} (before) ==\n{before[name].plan}\n\n== {name} (after) ==\n{after[name].plan}")
+
+
+async def main(rows: int, users: int, queries: int, keep: bool, show_plans: bool) -> None:
+    # Autocommit: VACUUM cannot run in a transaction, and every timed query is its own round trip
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        labels = await seed(conn, rows, users)
+        try:
+            logger.info("Measuring with the single column indexes")
+            before = await run_phase(conn, BEFORE_INDEXES, rows, users, labels, queries)
+            logger.info("Measuring with the composite partial indexes")
+            after = await run_phase(conn, AFTER_INDEXES, rows, users, labels, queries)
+        finally:
+            if not keep:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    report(before, after, show_plans)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000, help="ACL rows to seed")
+    parser.add_argument("--users", type=int, default=None, help="distinct users (default: rows / 20)")
+    parser.add_argument("--queries", type=int, default=2000, help="timed executions per query shape")
+    parser.add_argument("--keep", action="store_true", help=f"keep the {SCHEMA} schema afterwards")
+    parser.add_argument("--plans", action="store_true", help="print EXPLAIN ANALYZE of each query shape")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.users or max(args.rows // 20, 1), args.queries, args.keep, args.plans))
@@ -7,7 +7,7 @@ from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, MetaData,
 from sqlalchemy.dialects.postgresql import UUID
 
 from ..app.core.config import settings
-from ..app.core.db.database import AsyncSession, async_engine, async_get_db
+from ..app.core.db.database import AsyncSession, async_engine, local_session
 from ..app.core.security import get_password_hash
 from ..app.models.user import User
 
@@ -65,7 +65,7 @@ async def create_first_user(session: AsyncSession) -> None:
 
 async def main():
     logger.info("Creating first superuser")
-    async for session in async_get_db():
+    async with local_session() as session:
         await create_first_user(session)
     logger.info("Finished creating first superuser")
 
@@ -0,0 +1,69 @@
+import asyncio
+import re
+import uuid
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from src.app.crud.acl_scoped import WRITE_PERMISSIONS
+from src.app.crud.crud_projects import acl_projects
+from src.app.schemas.project import ProjectRead
+
+
+class _Result:
+    def mappings(self) -> "_Result":
+        return self
+
+    def first(self) -> None:
+        return None
+
+
+class _RecordingSession:
+    """Records the statements ACLScopedCRUD executes instead of running them."""
+
+    def __init__(self) -> None:
+        self.statements: list[Any] = []
+
+    async def execute(self, statement: Any) -> _Result:
+        self.statements.append(statement)
+        return _Result()
+
+    async def commit(self) -> None:
+        pass
+
+
+def _compile(statement: Any) -> str:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}))
+    return re.sub(r"\s+", " ", sql)
+
+
+def test_get_joins_acl_in_one_query() -> None:
+    db = _RecordingSession()
+    asyncio.run(acl_projects.get(db, uuid.uuid4(), 7, schema_to_select=ProjectRead))
+
+    assert len(db.statements) == 1
+    sql = _compile(db.statements[0])
+    assert "FROM project JOIN access_control ON access_control.resource_uuid = project.uuid" in sql
+    assert "access_control.user_id = %(user_id_1)s" in sql
+    # `= false` so the partial ACL indexes can be used
+    assert "access_control.is_deleted = false" in sql
+    assert "project.is_deleted = false" in sql
+    assert "access_control.permission" in sql.split("FROM")[0]
+
+
+def test_update_is_scoped_by_acl_and_permissions() -> None:
+    db = _RecordingSession()
+    update = acl_projects.update(
+        db, {"name": "renamed"}, uuid.uuid4(), 7, schema_to_select=ProjectRead, permissions=WRITE_PERMISSIONS
+    )
+    asyncio.run(update)
+
+    assert len(db.statements) == 1
+    sql = _compile(db.statements[0])
+    assert sql.startswith("UPDATE project SET")
+    assert "FROM access_control WHERE" in sql
+    assert "access_control.resource_uuid = project.uuid" in sql
+    assert "access_control.user_id = %(user_id_1)s" in sql
+    assert "access_control.is_deleted = false" in sql
+    assert "access_control.permission IN (%(permission_1_1)s, %(permission_1_2)s)" in sql
+    assert "RETURNING project.uuid, project.name, project.description" in sql
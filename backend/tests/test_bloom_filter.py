@@ -0,0 +1,24 @@
+from src.app.core.utils.bloom_filter import BloomFilter
+
+
+def test_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"token-{i}")
+    assert all(f"token-{i}" in bloom for i in range(1000))
+
+
+def test_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"token-{i}")
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_clear() -> None:
+    bloom = BloomFilter(capacity=10)
+    bloom.add("token")
+    bloom.clear()
+    assert "token" not in bloom
+    assert bloom.count == 0
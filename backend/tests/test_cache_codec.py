@@ -0,0 +1,31 @@
+from src.app.core.utils.cache_codec import COMPRESSED_FLAG, CacheCodec
+
+VALUE = {"data": [{"id": i, "name": f"document {i}"} for i in range(100)], "fresh_until": 1700000000.5}
+
+
+def test_round_trip() -> None:
+    for name in ("json", "msgpack"):
+        codec = CacheCodec(codec=name, compress_min_size=0)
+        payload = codec.encode(VALUE)
+        assert not payload[0] & COMPRESSED_FLAG
+        assert CacheCodec.decode(payload) == VALUE
+
+
+def test_compression_threshold() -> None:
+    codec = CacheCodec(compress_min_size=1024)
+    large = codec.encode(VALUE)
+    assert large[0] & COMPRESSED_FLAG
+    assert CacheCodec.decode(large) == VALUE
+    assert not codec.encode({"id": 1})[0] & COMPRESSED_FLAG
+
+
+def test_decode_legacy_json() -> None:
+    assert CacheCodec.decode(b'{"id": 1}') == {"id": 1}
+
+
+def test_entry_is_marked_by_header() -> None:
+    codec = CacheCodec(compress_min_size=1024)
+    assert CacheCodec.decode_entry(codec.encode_entry(VALUE, 1700000000.5)) == (VALUE, 1700000000.5)
+    # Data that happens to look like an entry is still returned as is
+    assert CacheCodec.decode_entry(codec.encode(VALUE)) == (VALUE, float("inf"))
+    assert CacheCodec.decode_entry(b'{"id": 1}') == ({"id": 1}, float("inf"))
@@ -0,0 +1,21 @@
+from src.app.core.utils.client_identity import client_key, client_network, parse_networks, resolve_client_ip
+
+TRUSTED = parse_networks("127.0.0.1, 172.16.0.0/12")
+
+
+def test_forwarded_for_only_from_trusted_proxy() -> None:
+    assert resolve_client_ip("172.18.0.5", "203.0.113.7", TRUSTED) == "203.0.113.7"
+    assert resolve_client_ip("198.51.100.1", "203.0.113.7", TRUSTED) == "198.51.100.1"
+
+
+def test_spoofed_forwarded_for_is_ignored() -> None:
+    # The client sent "1.2.3.4" itself; nginx appended its real address
+    assert resolve_client_ip("172.18.0.5", "1.2.3.4, 203.0.113.7", TRUSTED) == "203.0.113.7"
+
+
+def test_ipv6_aggregated_by_prefix() -> None:
+    first = client_network("2001:db8:1:2::1", ipv6_prefix=64)
+    second = client_network("2001:db8:1:2:ffff::9", ipv6_prefix=64)
+    assert first == second == "2001:db8:1:2::/64"
+    assert client_key(first, "secret") == client_key(second, "secret")
+    assert client_key(first, "secret") != client_key(first, "other")
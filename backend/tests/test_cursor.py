@@ -0,0 +1,47 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from src.app.core.exceptions.http_exceptions import BadRequestException
+from src.app.core.utils.cursor import decode_cursor, encode_cursor
+from src.app.crud.keyset import get_keyset_page
+from src.app.models.chat_message import ChatMessage
+
+
+def test_round_trip_keeps_types() -> None:
+    created_at = datetime(2026, 10, 18, 12, 30, 15, 123456, tzinfo=UTC)
+    cursor = encode_cursor([created_at, 42])
+    assert decode_cursor(cursor, 2) == (created_at, 42)
+
+
+def test_cursor_is_url_safe() -> None:
+    cursor = encode_cursor([datetime(2026, 1, 1, tzinfo=UTC), 2**40])
+    assert all(c.isalnum() or c in "-_" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1]), encode_cursor([{"a": 1}, 2]), "e30"])
+def test_invalid_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+@pytest.mark.parametrize(
+    ("items_per_page", "cursor"),
+    [
+        (0, None),
+        (-1, None),
+        (101, None),
+        (10, encode_cursor([1, "2", 3])),
+        (10, encode_cursor([1, datetime(2026, 1, 1, tzinfo=UTC), 3])),
+        (10, encode_cursor([1, True, 3])),
+        (10, encode_cursor([1, 2, None])),
+    ],
+)
+def test_keyset_page_rejects_bad_input_before_querying(items_per_page: int, cursor: str | None) -> None:
+    with pytest.raises(BadRequestException):
+        asyncio.run(
+            get_keyset_page(
+                None, ChatMessage, ("chat_session_id", "sequence_number", "id"), items_per_page, cursor=cursor
+            )
+        )
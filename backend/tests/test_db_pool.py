@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.app.core.db.pool import InstrumentedQueuePool
+
+
+def test_counts_overflow_and_timeouts() -> None:
+    async def exhaust_pool() -> dict:
+        engine = create_async_engine(
+            "sqlite+aiosqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05
+        )
+        first = await engine.connect()
+        second = await engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect()
+        stats = engine.pool.get_stats()
+        await first.close()
+        await second.close()
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(exhaust_pool())
+    assert stats["checkouts"] == 2
+    assert stats["overflow_connections"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from src.app.core.utils.http_range import ByteRange, etag_matches, parse_range_header
+
+
+def test_parse_range_header() -> None:
+    assert parse_range_header("bytes=0-99", 1000) == ByteRange(0, 99)
+    assert parse_range_header("bytes=900-", 1000) == ByteRange(900, 999)
+    assert parse_range_header("bytes=-100", 1000) == ByteRange(900, 999)
+    assert parse_range_header("bytes=990-5000", 1000) == ByteRange(990, 999)
+    assert parse_range_header("bytes=-5000", 1000) == ByteRange(0, 999)
+
+
+def test_parse_range_header_ignored() -> None:
+    assert parse_range_header(None, 1000) is None
+    assert parse_range_header("items=0-1", 1000) is None
+    assert parse_range_header("bytes=0-1,5-6", 1000) is None
+    assert parse_range_header("bytes=abc-", 1000) is None
+    assert parse_range_header("bytes=10-5", 1000) is None
+
+
+def test_parse_range_header_not_satisfiable() -> None:
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=1000-", 1000)
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=-0", 1000)
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,24 @@
+from src.app.core.utils.path_trie import PathTrie
+
+
+def test_exact_match_wins_over_wildcard() -> None:
+    trie = PathTrie()
+    trie.insert("/api/v1/admin/*", "admin")
+    trie.insert("/api/v1/admin/users", "users")
+    assert trie.match("/api/v1/admin/users") == ("users", True)
+    assert trie.match("/api/v1/admin/tiers/{tier_id}") == ("admin", False)
+
+
+def test_deepest_wildcard_wins() -> None:
+    trie = PathTrie()
+    trie.insert("/api/*", "api")
+    trie.insert("/api/v1/documents/*", "documents")
+    assert trie.match("/api/v1/documents/{document_uuid}") == ("documents", False)
+    assert trie.match("/api/v1/tasks") == ("api", False)
+
+
+def test_wildcard_needs_a_segment_below_it() -> None:
+    trie = PathTrie()
+    trie.insert("/api/v1/admin/*", "admin")
+    assert trie.match("/api/v1/admin") is None
+    assert trie.match("/other") is None